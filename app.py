@@ -1,81 +1,1387 @@
 # app.py
 
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
-from flask import Flask
+from flask import Flask, Response, abort, g, has_request_context, jsonify, request
 from flask_cors import CORS
 
+from scripts._00_data_io import DATE_FORMATS, file_sha256, load_columnar_frame
+from scripts._00_online_stats import BayesianOnlineChangePoint, RollingWindowStats
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow responses are disabled without pyarrow
+    pa = None
+
 app = Flask(__name__)
-CORS(app)
+CORS(
+    app,
+    expose_headers=["ETag", "X-Cache", "X-Next-Cursor", "X-Row-Count", "X-Total-Count"],
+)
+
+app.config.setdefault(
+    "PROCESSED_DIR", os.getenv("PROCESSED_DIR", os.path.join("data", "processed"))
+)
+app.config.setdefault("RAW_DIR", os.getenv("RAW_DIR", os.path.join("data", "raw")))
+app.config.setdefault("STREAM_PATH", os.getenv("STREAM_PATH"))
+app.config.setdefault("STREAM_POLL_SECONDS", 5.0)
+app.config.setdefault("STREAM_HEARTBEAT_SECONDS", 15.0)
+app.config.setdefault("STREAM_ROLLING_WINDOW", 180)
+
+
+class ArtifactCache:
+    """
+    In-memory cache of formatted payloads built from pipeline artifacts.
+
+    Entries are keyed on the artifact path (plus an optional variant) and
+    validated against the file's mtime and size, so a payload is only rebuilt
+    when the pipeline rewrites the file. Hits and misses are counted so the
+    cache can be monitored.
+    """
+
+    def __init__(self, max_entries=64):
+        """
+        Initialises the ArtifactCache class.
+
+        Args:
+            max_entries (int, optional): Maximum number of payloads kept in memory.
+                                        Least recently used entries are evicted.
+                                        Defaults to 64.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(path):
+        """
+        Returns the (mtime, size) signature used to detect rewritten artifacts.
+
+        Args:
+            path (str): Path to the artifact.
+
+        Returns:
+            tuple: Modification time in nanoseconds and size in bytes.
+        """
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def lookup(self, path, builder, variant=None):
+        """
+        Returns the cached payload for an artifact, building it on a miss.
+
+        Args:
+            path (str | tuple): Path to the artifact, or a tuple of paths for
+                                payloads combining several artifacts.
+            builder (callable): Function taking the path and returning the payload.
+            variant (hashable, optional): Distinguishes several payloads built
+                                            from the same artifact. Defaults to None.
+
+        Returns:
+            tuple: The payload and a boolean that is True on a cache hit.
+        """
+        if isinstance(path, tuple):
+            key = (tuple(os.path.abspath(p) for p in path), variant)
+            signature = tuple(self.signature(p) for p in path)
+        else:
+            key = (os.path.abspath(path), variant)
+            signature = self.signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1], True
+            self.misses += 1
+
+        # Build outside the lock so slow artifacts do not block other routes
+        payload = builder(path)
+
+        with self._lock:
+            self._entries[key] = (signature, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload, False
+
+    def clear(self):
+        """
+        Drops every cached payload and resets the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            dict: Hits, misses, hit ratio and number of cached entries.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+artifact_cache = ArtifactCache()
+
+# Content hashes behind the ETags, kept apart so they do not count towards the
+# payload hits and misses reported by /cache-stats
+content_hashes = ArtifactCache()
+
+
+class RequestMetrics:
+    """
+    Per-route request metrics rendered in the Prometheus text format.
+
+    Records request counts, latency and response size histograms, rows served,
+    artifact cache hits and misses, and the time spent in the read, transform
+    and serialize phases of building a payload. Recording is a few dictionary
+    updates under a lock, so the per-request overhead is negligible.
+    """
+
+    LATENCY_BUCKETS = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+    SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+    HELP = {
+        "api_requests_total": ("counter", "Requests served, by route and status."),
+        "api_request_duration_seconds": (
+            "histogram",
+            "Time from request start to response, by route.",
+        ),
+        "api_response_bytes": ("histogram", "Response body size, by route."),
+        "api_rows_served_total": ("counter", "Data rows sent, by route."),
+        "api_cache_requests_total": (
+            "counter",
+            "Artifact cache lookups by route and result.",
+        ),
+        "api_phase_duration_seconds": (
+            "histogram",
+            "Time spent reading, transforming and serialising, by route.",
+        ),
+    }
+
+    def __init__(self):
+        """
+        Initialises the RequestMetrics class.
+        """
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [buckets, [0] * len(buckets), 0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[1][i] += 1
+            histogram[2] += value
+            histogram[3] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = [*labels, *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    def render(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (b, list(c), s, n))
+                for key, (b, c, s, n) in self._histograms.items()
+            )
+
+        lines = []
+        for name, (kind, text) in self.HELP.items():
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, labels), value in counters:
+                if metric == name:
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+            for (metric, labels), (buckets, counts, total, count) in histograms:
+                if metric != name:
+                    continue
+                for bound, bucket_count in zip(buckets, counts):
+                    le = self._labels(labels, [("le", f"{bound:g}")])
+                    lines.append(f"{name}_bucket{le} {bucket_count}")
+                inf = self._labels(labels, [("le", "+Inf")])
+                lines.append(f"{name}_bucket{inf} {count}")
+                lines.append(f"{name}_sum{self._labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{self._labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+@contextmanager
+def phase(name):
+    """
+    Times a payload building phase ('read', 'transform' or 'serialize').
+
+    The elapsed time is added to the current request's phase totals and is
+    reported per route by /metrics.
+
+    Args:
+        name (str): Name of the phase.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            phases = g.setdefault("phases", {})
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def records_json(df):
+    """
+    Serialises a frame as JSON records together with its row count header.
+
+    Args:
+        df (pd.DataFrame): Frame to serialise.
+
+    Returns:
+        tuple: The JSON body and the response headers.
+    """
+    with phase("serialize"):
+        return df.to_json(orient="records"), {"X-Row-Count": str(len(df))}
+
+
+def processed_path(filename):
+    return os.path.join(app.config["PROCESSED_DIR"], filename)
+
+
+def raw_path(filename):
+    return os.path.join(app.config["RAW_DIR"], filename)
+
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+class Payload:
+    """
+    A response body precomputed in every supported content encoding.
+
+    Payloads are built once per artifact version and stored in the artifact
+    cache, so serving a request never re-serialises or re-compresses data.
+    """
+
+    def __init__(self, body, etag, mimetype="application/json", headers=None):
+        """
+        Initialises the Payload class.
+
+        Args:
+            body (str | bytes): Uncompressed response body.
+            etag (str): Strong entity tag of the uncompressed body.
+            mimetype (str, optional): Response mimetype.
+                                        Defaults to "application/json".
+            headers (dict, optional): Extra headers sent with the body.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.etag = etag
+        self.mimetype = mimetype
+        self.headers = headers or {}
+        self.bodies = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.bodies["gzip"] = gzip.compress(body, compresslevel=6)
+            if brotli is not None:
+                self.bodies["br"] = brotli.compress(body)
+
+    def etag_for(self, encoding):
+        # Each encoding is a distinct representation and needs its own strong tag
+        return self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+
+
+def artifact_etag(path, variant=None):
+    """
+    Derives a strong ETag from the artifact content hash and the payload variant.
+
+    Args:
+        path (str | tuple): Path to the source artifact, or a tuple of paths.
+        variant (hashable, optional): Cache variant of the payload.
+
+    Returns:
+        str: The entity tag (unquoted).
+    """
+    paths = path if isinstance(path, tuple) else (path,)
+    content_hash = ":".join(content_hashes.lookup(p, file_sha256)[0] for p in paths)
+    return hashlib.sha256(f"{content_hash}:{variant!r}".encode()).hexdigest()[:32]
+
+
+def send_payload(payload):
+    """
+    Sends a precomputed payload, honouring Accept-Encoding and If-None-Match.
+
+    Args:
+        payload (Payload): The payload to send.
+
+    Returns:
+        Response: The encoded response, or an empty 304 when the client's copy
+                    is still current.
+    """
+    offered = [e for e in ("br", "gzip") if e in payload.bodies]
+    encoding = request.accept_encodings.best_match(offered) or "identity"
+    etag = payload.etag_for(encoding)
+
+    # Only the tag of the representation being served validates the client copy
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload.bodies[encoding], mimetype=payload.mimetype)
+        response.headers.update(payload.headers)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def cached_payload(path, builder, variant=None, mimetype="application/json"):
+    """
+    Returns the encoded payload built from an artifact, using the artifact cache.
+
+    Args:
+        path (str | tuple): Path to the source artifact, or a tuple of paths.
+        builder (callable): Function taking the path and returning the body, or
+                            a (body, headers) tuple.
+        variant (hashable, optional): Cache variant for the payload. Defaults to None.
+        mimetype (str, optional): Response mimetype. Defaults to "application/json".
+
+    Returns:
+        tuple: The Payload and a boolean that is True on a cache hit.
+    """
+
+    def build(path):
+        result = builder(path)
+        body, headers = result if isinstance(result, tuple) else (result, None)
+        etag = artifact_etag(path, variant)
+        with phase("serialize"):
+            return Payload(body, etag, mimetype, headers)
+
+    return artifact_cache.lookup(path, build, variant)
+
+
+def cached_response(path, builder, variant=None, mimetype="application/json"):
+    """
+    Serves a payload built from an artifact through the artifact cache.
+
+    Args:
+        path (str | tuple): Path to the source artifact, or a tuple of paths.
+        builder (callable): Function taking the path and returning the body, or
+                            a (body, headers) tuple.
+        variant (hashable, optional): Cache variant for the payload. Defaults to None.
+        mimetype (str, optional): Response mimetype. Defaults to "application/json".
+
+    Returns:
+        Response: The response for the current request.
+    """
+    payload, hit = cached_payload(path, builder, variant, mimetype)
+    g.cache_status = "HIT" if hit else "MISS"
+    return send_payload(payload)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    if "cache_status" in g:
+        response.headers["X-Cache"] = g.cache_status
+    if "request_start" not in g:
+        return response
+
+    route = (("route", request.url_rule.rule if request.url_rule else "unmatched"),)
+    request_metrics.inc(
+        "api_requests_total", route + (("status", str(response.status_code)),)
+    )
+    request_metrics.observe(
+        "api_request_duration_seconds",
+        route,
+        time.perf_counter() - g.request_start,
+        RequestMetrics.LATENCY_BUCKETS,
+    )
+    # Streamed bodies are never buffered just to be measured
+    size = None if response.is_streamed else response.calculate_content_length()
+    if size is not None:
+        request_metrics.observe(
+            "api_response_bytes", route, size, RequestMetrics.SIZE_BUCKETS
+        )
+    if response.status_code == 200 and "X-Row-Count" in response.headers:
+        rows = int(response.headers["X-Row-Count"])
+        request_metrics.inc("api_rows_served_total", route, rows)
+    if "cache_status" in g:
+        result = (("result", g.cache_status.lower()),)
+        request_metrics.inc("api_cache_requests_total", route + result)
+    for name, seconds in g.get("phases", {}).items():
+        request_metrics.observe(
+            "api_phase_duration_seconds",
+            route + (("phase", name),),
+            seconds,
+            RequestMetrics.LATENCY_BUCKETS,
+        )
+    return response
+
+
+PRICE_COLUMNS = ["Price", "RollingMean", "RollingStd", "LogReturn", "Year"]
+FULL_PRICE_QUERY = {
+    "start": None,
+    "end": None,
+    "columns": tuple(PRICE_COLUMNS),
+    "cursor": 0,
+    "limit": None,
+    "max_points": None,
+}
+RESPONSE_FORMATS = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "npz": "application/x-npz",
+}
+
+
+def load_price_frame(path):
+    """
+    Loads the enriched price series as numeric columns and a date index.
+
+    The memory-mapped columnar copy of the CSV is used when it is current, so
+    every worker reads the same page-cache copy instead of parsing text. Its
+    columns are not copied: the leading rows without rolling statistics are
+    sliced off, and rows are only filtered or sorted when the file needs it.
+    Display dates and 'Year' are derived for the rows a response emits, see
+    `price_rows`.
+
+    Args:
+        path (str): Path to 'BrentOilPrices_Log.csv'.
+
+    Returns:
+        tuple: The numeric price columns and their sorted datetime64 dates.
+    """
+    with phase("read"):
+        df = load_columnar_frame(path)
+        if df is None:
+            df = pd.read_csv(path)
+    with phase("transform"):
+        dates = pd.to_datetime(df.pop("Date")).to_numpy(dtype="datetime64[ns]")
+        valid = df.notna().all(axis=1).to_numpy() & ~np.isnat(dates)
+        first = int(valid.argmax()) if valid.any() else len(valid)
+        if valid[first:].all():
+            df, dates = df.iloc[first:], dates[first:]
+        else:
+            df, dates = df[valid], dates[valid]
+        if (dates[1:] < dates[:-1]).any():
+            order = np.argsort(dates, kind="stable")
+            df, dates = df.iloc[order], dates[order]
+        return df.reset_index(drop=True), dates
+
+
+def price_rows(df, dates, rows, columns):
+    """
+    Selects rows of the price frame with their display dates.
+
+    Only the selected rows are copied and have their dates formatted.
+
+    Args:
+        df (pd.DataFrame): Numeric price columns from `load_price_frame`.
+        dates (np.ndarray): Their sorted datetime64 dates.
+        rows (slice | np.ndarray): Row positions.
+        columns (list): Columns after 'Date'; 'Year' is derived from the dates.
+
+    Returns:
+        pd.DataFrame: 'Date' as 'dd/mm/yyyy' and the columns, indexed by row
+                        position.
+    """
+    page = df.iloc[rows][[c for c in columns if c != "Year"]]
+    page_dates = pd.DatetimeIndex(dates[rows])
+    page.insert(0, "Date", page_dates.strftime("%d/%m/%Y"))
+    if "Year" in columns:
+        page["Year"] = page_dates.year
+    return page[["Date", *columns]]
+
+
+def build_price_data(path):
+    df, dates = artifact_cache.lookup(path, load_price_frame, "frame")[0]
+    with phase("transform"):
+        df = price_rows(df, dates, slice(None), [*df.columns, "Year"])
+    return records_json(df)
+
+
+def parse_date_arg(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        date = pd.Timestamp(value)
+    except ValueError:
+        date = pd.NaT
+    if pd.isna(date):
+        abort(400, description=f"Invalid '{name}' date: {value!r}")
+    return np.datetime64(date, "ns")
+
+
+def parse_int_arg(name, default=None, minimum=0):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = minimum - 1
+    if number < minimum:
+        abort(400, description=f"'{name}' must be an integer >= {minimum}")
+    return number
+
+
+def parse_price_query():
+    """
+    Reads the date range, column projection and pagination arguments.
+
+    Returns:
+        dict: Normalised query, or None when the full series is requested.
+    """
+    if not set(request.args) - {"format"}:
+        return None
+
+    columns = request.args.get("columns")
+    if columns is None:
+        columns = tuple(PRICE_COLUMNS)
+    else:
+        columns = tuple(c.strip() for c in columns.split(",") if c.strip())
+        unknown = sorted(set(columns) - set(PRICE_COLUMNS))
+        if unknown:
+            abort(400, description=f"Unknown columns: {', '.join(unknown)}")
+
+    return {
+        "start": parse_date_arg("start"),
+        "end": parse_date_arg("end"),
+        "columns": columns,
+        "cursor": parse_int_arg("cursor", default=0),
+        "limit": parse_int_arg("limit", minimum=1),
+        "max_points": parse_int_arg("max_points", minimum=2),
+    }
+
+
+def parse_format():
+    """
+    Negotiates the response format from '?format=' or the Accept header.
+
+    Returns:
+        str: One of the keys of RESPONSE_FORMATS. JSON is the default.
+    """
+    fmt = request.args.get("format")
+    if fmt is None:
+        best = request.accept_mimetypes.best_match(
+            list(RESPONSE_FORMATS.values()), default="application/json"
+        )
+        fmt = next(k for k, v in RESPONSE_FORMATS.items() if v == best)
+    if fmt not in RESPONSE_FORMATS:
+        abort(400, description=f"Unknown format: {fmt!r}")
+    if fmt == "arrow" and pa is None:
+        abort(406, description="Arrow responses require pyarrow.")
+    return fmt
+
+
+def encode_columns(page, dates, fmt):
+    """
+    Encodes a page of the price frame as contiguous typed column buffers.
+
+    Dates are sent as millisecond timestamps and every other column keeps its
+    native dtype, so clients read the buffers directly instead of parsing text.
+
+    Args:
+        page (pd.DataFrame): Rows of the price frame (index = row positions).
+        dates (np.ndarray): Sorted datetime64 date index of the full frame.
+        fmt (str): "arrow" for an Arrow IPC stream or "npz" for a NumPy archive
+                    holding one .npy array per column.
+
+    Returns:
+        bytes: The encoded body.
+    """
+    columns = {"Date": dates[page.index.to_numpy()].astype("datetime64[ms]")}
+    columns.update(
+        {c: np.ascontiguousarray(page[c].to_numpy()) for c in page if c != "Date"}
+    )
+
+    if fmt == "arrow":
+        table = pa.table(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **columns)
+    return buffer.getvalue()
+
+
+def minmax_downsample(values, max_points):
+    """
+    Selects row positions that keep the visual envelope of every column.
+
+    The rows are split into equal buckets and, for each column, the positions of
+    the bucket minimum and maximum are kept together with the first and last
+    rows. Unlike plain striding this preserves isolated spikes (e.g. in
+    'LogReturn' or 'RollingStd') at any zoom level. The whole selection is
+    vectorised over buckets with NumPy.
+
+    Args:
+        values (np.ndarray): 2-D array of shape (rows, columns).
+        max_points (int): Upper bound on the number of rows returned. The
+                            budget is shared between the columns; when it
+                            cannot hold the end points plus a minimum and a
+                            maximum per column, evenly spaced rows are
+                            returned instead.
+
+    Returns:
+        np.ndarray: Sorted, unique row positions.
+    """
+    n_rows, n_cols = values.shape
+    if n_rows <= max_points:
+        return np.arange(n_rows)
+    n_buckets = (max_points - 2) // (2 * n_cols) if n_cols else 0
+    if n_buckets == 0:
+        return np.unique(np.linspace(0, n_rows - 1, max_points).astype(np.int64))
+
+    interior = values[1:-1]
+    width = -(-len(interior) // n_buckets)
+    n_buckets = -(-len(interior) // width)
+    pad = n_buckets * width - len(interior)
+
+    positions = [np.array([0, n_rows - 1])]
+    offsets = np.arange(n_buckets) * width + 1
+    for j in range(n_cols):
+        column = interior[:, j]
+        nan = np.isnan(column)
+        for fill, pick in ((np.inf, np.argmin), (-np.inf, np.argmax)):
+            buckets = np.append(np.where(nan, fill, column), np.full(pad, fill))
+            positions.append(pick(buckets.reshape(n_buckets, width), axis=1) + offsets)
+    return np.unique(np.concatenate(positions))
+
+
+def downsampled_rows(path, start, end, columns, max_points):
+    """
+    Returns the cached downsampled row positions for a date range.
+
+    Args:
+        path (str): Path to 'BrentOilPrices_Log.csv'.
+        start (np.datetime64): Start of the range, or None.
+        end (np.datetime64): End of the range, or None.
+        columns (tuple): Columns whose extremes must be preserved.
+        max_points (int): Upper bound on the number of rows.
+
+    Returns:
+        np.ndarray: Row positions in the price frame.
+    """
+
+    def build(path):
+        df, dates = artifact_cache.lookup(path, load_price_frame, "frame")[0]
+        lo, hi = date_bounds(dates, start, end)
+        numeric = [c for c in columns if c != "Year"]
+        values = df[numeric].to_numpy(dtype=float)[lo:hi]
+        return lo + minmax_downsample(values, max_points)
+
+    variant = ("downsample", start, end, columns, max_points)
+    return artifact_cache.lookup(path, build, variant)[0]
+
+
+def date_bounds(dates, start, end):
+    lo = 0 if start is None else np.searchsorted(dates, start)
+    hi = len(dates) if end is None else np.searchsorted(dates, end, side="right")
+    return lo, max(lo, hi)
+
+
+def slice_price_frame(path, query):
+    """
+    Selects the requested date range, columns and page of the price frame.
+
+    The range is located with a binary search on the sorted date index, so the
+    cost depends on the size of the page rather than the full history. When
+    'max_points' is given the range is downsampled before paging.
+
+    Args:
+        path (str): Path to 'BrentOilPrices_Log.csv'.
+        query (dict): Query returned by `parse_price_query`.
+
+    Returns:
+        tuple: The selected DataFrame, the total number of rows in the date
+                range and the cursor of the next page (None on the last page).
+    """
+    df, dates = artifact_cache.lookup(path, load_price_frame, "frame")[0]
+    lo, hi = date_bounds(dates, query["start"], query["end"])
+
+    if query["max_points"] is None:
+        rows = slice(lo, hi)
+        total = hi - lo
+    else:
+        rows = downsampled_rows(
+            path, query["start"], query["end"], query["columns"], query["max_points"]
+        )
+        total = len(rows)
+
+    first = min(query["cursor"], total)
+    last = total if query["limit"] is None else min(first + query["limit"], total)
+    next_cursor = last if last < total else None
+
+    if isinstance(rows, slice):
+        rows = slice(lo + first, lo + last)
+    else:
+        rows = rows[first:last]
+    return price_rows(df, dates, rows, query["columns"]), total, next_cursor
+
+
+def event_log_returns(path, events_path, max_points):
+    """
+    Downsamples the log returns for the dashboard's event overlay chart.
+
+    The chart places event lines on exact dates, so the rows of matched
+    event dates are kept next to the minimum and maximum of every bucket.
+
+    Args:
+        path (str): Path to 'BrentOilPrices_Log.csv'.
+        events_path (str): Path to 'matched_events.csv', or None.
+        max_points (int): Upper bound on the number of rows besides the
+                            event dates.
+
+    Returns:
+        pd.DataFrame: 'Date' and 'LogReturn' of the selected rows.
+    """
+    df, dates = artifact_cache.lookup(path, load_price_frame, "frame")[0]
+    rows = downsampled_rows(path, None, None, ("LogReturn",), max_points)
+    if events_path is not None:
+        event_dates = pd.to_datetime(pd.read_csv(events_path)["Date"]).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        found = np.searchsorted(dates, event_dates)
+        inside = found < len(dates)
+        found = found[inside][dates[found[inside]] == event_dates[inside]]
+        rows = np.union1d(rows, found)
+    return price_rows(df, dates, rows, ["LogReturn"])
+
+
+def build_matched_events(path):
+    with phase("read"):
+        df = pd.read_csv(path)
+    with phase("transform"):
+        df["Date"] = pd.to_datetime(df["Date"])
+        df["Year"] = df["Date"].dt.year
+        df["Date"] = df["Date"].dt.strftime("%d/%m/%Y")
+    return records_json(df)
+
+
+def build_event_overlay(path):
+    with phase("read"):
+        df = pd.read_csv(path)
+
+    with phase("transform"):
+        # Format date
+        df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%d/%m/%Y")
+
+        # Calculate event type percentages
+        type_counts = df["Event Type"].value_counts()
+        total = type_counts.sum()
+        type_percentages = (type_counts / total * 100).round(2)
+
+        # Format for frontend
+        formatted = [
+            {"type": event_type, "percentage": pct}
+            for event_type, pct in type_percentages.items()
+        ]
+
+    return records_json(pd.DataFrame(formatted))
+
+
+# Regime labels of volatility summaries written without regime start dates
+LEGACY_REGIME_LABELS = {
+    "Before τ₁": "Before 2011",
+    "Between τ₁–τ₂": "2011–2020",
+    "After τ₂": "After 2020",
+}
+
+
+def regime_period_labels(starts):
+    """
+    Labels regimes by the years of the change points between them.
+
+    Args:
+        starts (pd.Series): First date of each regime, in order.
+
+    Returns:
+        list: e.g. ['Before 2011', '2011–2020', 'After 2020'] for three.
+    """
+    years = [str(date.year) for date in starts.iloc[1:]]
+    if not years:
+        return ["Whole series"]
+    between = [f"{a}–{b}" for a, b in zip(years[:-1], years[1:])]
+    return [f"Before {years[0]}", *between, f"After {years[-1]}"]
+
+
+def build_regime_volatility(path):
+    with phase("read"):
+        df = pd.read_csv(path)
+    with phase("transform"):
+        # Rename regime labels, for however many regimes were fitted
+        if "Start" in df:
+            df["Regime"] = regime_period_labels(pd.to_datetime(df.pop("Start")))
+        else:
+            df["Regime"] = df["Regime"].replace(LEGACY_REGIME_LABELS)
+    return records_json(df)
+
+
+def build_change_points(path):
+    with phase("read"):
+        df = pd.read_csv(path)
+    with phase("transform"):
+        df = df.rename(columns={"date": "Date"})
+        df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%d/%m/%Y")
+    return records_json(df)
+
+
+def build_posterior_summary(path):
+    with phase("read"):
+        df = pd.read_csv(path)
+    with phase("transform"):
+        df = df.rename(columns={"Unnamed: 0": "parameter"})
+    return records_json(df)
+
+
+def price_payload(path, fmt="json", query=None):
+    """
+    Returns the cached payload of the price series for a format and query.
+
+    Args:
+        path (str): Path to 'BrentOilPrices_Log.csv'.
+        fmt (str, optional): Key of RESPONSE_FORMATS. Defaults to "json".
+        query (dict, optional): Query returned by `parse_price_query`.
+                                Defaults to the full series.
+
+    Returns:
+        tuple: The Payload and a boolean that is True on a cache hit.
+    """
+    if query is None and fmt == "json":
+        return cached_payload(path, build_price_data)
+
+    query = query or FULL_PRICE_QUERY
+
+    def build_slice(path):
+        # Parse outside the transform phase so read time is not counted twice
+        _, dates = artifact_cache.lookup(path, load_price_frame, "frame")[0]
+        with phase("transform"):
+            page, total, next_cursor = slice_price_frame(path, query)
+        headers = {"X-Total-Count": str(total), "X-Row-Count": str(len(page))}
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = str(next_cursor)
+        with phase("serialize"):
+            if fmt == "json":
+                return page.to_json(orient="records"), headers
+            return encode_columns(page, dates, fmt), headers
+
+    variant = (fmt, tuple(sorted(query.items())))
+    return cached_payload(path, build_slice, variant, RESPONSE_FORMATS[fmt])
 
 
 @app.route("/price-data")
 def price_data():
-    df = pd.read_csv("data/processed/BrentOilPrices_Log.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Year"] = df["Date"].dt.year
-    df["Date"] = df["Date"].dt.strftime("%d/%m/%Y")
-    df = df.dropna()
-    return df.to_json(orient="records")
+    """
+    Serves the enriched price series.
+
+    Optional query arguments:
+        start, end: Inclusive date range (e.g. 2011-01-01).
+        columns: Comma-separated subset of Price, RollingMean, RollingStd,
+                    LogReturn and Year. Date is always included.
+        cursor, limit: Row offset within the range and page size. The cursor of
+                    the next page is returned in the 'X-Next-Cursor' header.
+        max_points: Downsamples the range for plotting, keeping the minimum and
+                    maximum of every requested column in each bucket.
+        format: json (default), arrow or npz. Also negotiated through the Accept
+                    header (application/vnd.apache.arrow.stream, application/x-npz).
+    """
+    path = processed_path("BrentOilPrices_Log.csv")
+    payload, hit = price_payload(path, parse_format(), parse_price_query())
+    g.cache_status = "HIT" if hit else "MISS"
+    response = send_payload(payload)
+    response.vary.add("Accept")
+    return response
 
 
 @app.route("/matched-events")
 def matched_events():
-    df = pd.read_csv("data/processed/matched_events.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Year"] = df["Date"].dt.year
-    df["Date"] = df["Date"].dt.strftime("%d/%m/%Y")
-    return df.to_json(orient="records")
+    return cached_response(processed_path("matched_events.csv"), build_matched_events)
 
 
 @app.route("/event-overlay")
 def event_overlay():
-    import pandas as pd
-
-    df = pd.read_csv("data/raw/Events.csv")
-
-    # Format date
-    df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%d/%m/%Y")
-
-    # Calculate event type percentages
-    type_counts = df["Event Type"].value_counts()
-    total = type_counts.sum()
-    type_percentages = (type_counts / total * 100).round(2)
-
-    # Format for frontend
-    formatted = [
-        {"type": event_type, "percentage": pct}
-        for event_type, pct in type_percentages.items()
-    ]
-
-    return pd.DataFrame(formatted).to_json(orient="records")
+    return cached_response(raw_path("Events.csv"), build_event_overlay)
 
 
 @app.route("/regime-volatility")
 def regime_volatility():
-    df = pd.read_csv("data/processed/volatility_by_regime.csv")
-    # Rename regime labels
-    regime_map = {
-        "Before τ₁": "Before 2011",
-        "Between τ₁–τ₂": "2011–2020",
-        "After τ₂": "After 2020",
-    }
-    df["Regime"] = df["Regime"].replace(regime_map)
-    return df.to_json(orient="records")
+    return cached_response(
+        processed_path("volatility_by_regime.csv"), build_regime_volatility
+    )
 
 
 @app.route("/change-points")
 def change_points():
-    df = pd.read_csv("data/processed/change_points.csv")
-    df = df.rename(columns={"date": "Date"})
-    df["Date"] = pd.to_datetime(df["Date"]).dt.strftime("%d/%m/%Y")
-    return df.to_json(orient="records")
+    return cached_response(processed_path("change_points.csv"), build_change_points)
 
 
 @app.route("/posterior-summary")
 def posterior_summary():
-    df = pd.read_csv("data/processed/posterior_summary.csv")
-    df = df.rename(columns={"Unnamed: 0": "parameter"})
-    return df.to_json(orient="records")
+    return cached_response(
+        processed_path("posterior_summary.csv"), build_posterior_summary
+    )
+
+
+def dashboard_sources():
+    return {
+        "price_data": (processed_path("BrentOilPrices_Log.csv"), build_price_data),
+        "matched_events": (processed_path("matched_events.csv"), build_matched_events),
+        "event_types": (raw_path("Events.csv"), build_event_overlay),
+        "regime_volatility": (
+            processed_path("volatility_by_regime.csv"),
+            build_regime_volatility,
+        ),
+        "change_points": (processed_path("change_points.csv"), build_change_points),
+        "posterior_summary": (
+            processed_path("posterior_summary.csv"),
+            build_posterior_summary,
+        ),
+    }
+
+
+@app.route("/dashboard")
+def dashboard():
+    """
+    Serves every dashboard dataset in a single response.
+
+    The bundle is assembled from the cached JSON payloads of the individual
+    routes, so each artifact is parsed once and shared between the bundle and
+    the per-dataset endpoints. Sections whose artifact has not been produced
+    yet are null.
+
+    Optional query arguments:
+        max_points: Downsamples 'price_data' as in /price-data, and adds
+                    'log_returns': Date and LogReturn downsampled to the same
+                    budget, plus the rows of the matched event dates the log
+                    return chart draws its event lines on.
+    """
+    max_points = parse_int_arg("max_points", minimum=2)
+    sources = {
+        name: source
+        for name, source in dashboard_sources().items()
+        if os.path.exists(source[0])
+    }
+    paths = tuple(path for path, _ in sources.values())
+
+    def build(paths):
+        sections = []
+        rows = 0
+        for name in dashboard_sources():
+            if name not in sources:
+                sections.append(b'"' + name.encode() + b'":null')
+                continue
+            if name == "price_data" and max_points is not None:
+                query = {**FULL_PRICE_QUERY, "max_points": max_points}
+                payload = price_payload(sources[name][0], "json", query)[0]
+            else:
+                payload = cached_payload(*sources[name])[0]
+            sections.append(b'"' + name.encode() + b'":' + payload.bodies["identity"])
+            rows += int(payload.headers.get("X-Row-Count", 0))
+        if "price_data" in sources and max_points is not None:
+            events_path = sources.get("matched_events", (None,))[0]
+            # Parse outside the transform phase so read time is not counted twice
+            artifact_cache.lookup(sources["price_data"][0], load_price_frame, "frame")
+            with phase("transform"):
+                page = event_log_returns(
+                    sources["price_data"][0], events_path, max_points
+                )
+            with phase("serialize"):
+                sections.append(
+                    b'"log_returns":' + page.to_json(orient="records").encode()
+                )
+            rows += len(page)
+        return b"{" + b",".join(sections) + b"}", {"X-Row-Count": str(rows)}
+
+    return cached_response(paths, build, ("dashboard", tuple(sources), max_points))
+
+
+def parse_csv_line(line):
+    # Quoted fields such as "Apr 22, 2020" hold commas, so split with csv
+    return [field.strip() for field in next(csv.reader([line.decode()]), [])]
+
+
+def parse_stream_date(value):
+    """
+    Parses one date of the raw price file with the loader's formats.
+
+    Args:
+        value (str): Date string, e.g. '20-May-87' or 'Apr 22, 2020'.
+
+    Returns:
+        pd.Timestamp: The date, or None when no format matches.
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return pd.Timestamp(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    date = pd.to_datetime(value, format="mixed", errors="coerce")
+    return None if pd.isna(date) else date
+
+
+class PriceStream:
+    """
+    Tails a price CSV and broadcasts appended rows as Server-Sent Events.
+
+    A single poller thread reads only the bytes appended since the last poll
+    and updates the log return, rolling statistics and an online change point
+    posterior incrementally, in O(1) and O(max_run_length) per row. Each
+    update is published once to the queues of all subscribers, so an idle
+    client costs one blocked queue read and no polling of its own. The
+    poller exits once the last subscriber leaves and the next `subscribe`
+    starts it again.
+    """
+
+    def __init__(self, path, rolling_window=180, poll_seconds=5.0, history=256):
+        """
+        Initialises the PriceStream class.
+
+        Args:
+            path (str): CSV with 'Date' and 'Price' columns that grows by appends.
+            rolling_window (int, optional): Window of the rolling statistics.
+                                            Defaults to 180.
+            poll_seconds (float, optional): Interval between polls. Defaults to 5.
+            history (int, optional): Events kept for clients that reconnect with
+                                        'Last-Event-ID'. Defaults to 256.
+        """
+        self.path = path
+        self.rolling_window = rolling_window
+        self.poll_seconds = poll_seconds
+        self.events = deque(maxlen=history)
+        self.next_id = 1
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.reset()
+
+    def reset(self):
+        """
+        Re-seeds the running state from the whole file.
+
+        Only the trailing rows that influence the current state are replayed
+        through the online estimators.
+        """
+        self.rolling = RollingWindowStats(self.rolling_window)
+        self.detector = BayesianOnlineChangePoint()
+        self.last_price = None
+        self.latest = None
+        self.offset = 0
+        self.header = None
+        self.prefix = b""
+
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        self.prefix = data[:4096]
+        self.offset = end
+        lines = data[:end].splitlines()
+        if not lines:
+            return
+        self.header = parse_csv_line(lines[0])
+        seed = lines[1:][-self.detector.max_run_length - self.rolling_window :]
+        for line in seed:
+            self.update(line)
+
+    def update(self, line):
+        """
+        Folds one CSV row into the running state.
+
+        Args:
+            line (bytes): A data row of the CSV.
+
+        Returns:
+            dict: The streamed record, or None for rows without a valid price.
+        """
+        fields = dict(zip(self.header, parse_csv_line(line)))
+        try:
+            price = float(fields["Price"])
+            date = parse_stream_date(fields["Date"])
+        except (KeyError, ValueError):
+            return None
+        if date is None:
+            return None
+
+        log_return = np.nan
+        if self.last_price is not None and self.last_price > 0 and price > 0:
+            log_return = float(np.log(price) - np.log(self.last_price))
+        self.last_price = price
+        rolling_mean, rolling_std = self.rolling.push(price)
+        change = self.detector.update(log_return)
+
+        self.latest = {
+            "Date": date.strftime("%d/%m/%Y"),
+            "Price": price,
+            "LogReturn": None if np.isnan(log_return) else log_return,
+            "RollingMean": None if np.isnan(rolling_mean) else rolling_mean,
+            "RollingStd": None if np.isnan(rolling_std) else rolling_std,
+            "ChangeProbability": round(change["change_probability"], 6),
+            "RunLength": change["run_length"],
+        }
+        return self.latest
+
+    def poll(self):
+        """
+        Reads the rows appended since the last poll and publishes them.
+
+        A file that shrank or whose beginning changed has been rewritten rather
+        than appended to, so the state is re-seeded and a snapshot is published.
+
+        Returns:
+            int: Number of rows published.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            head = f.read(len(self.prefix))
+            size = f.seek(0, os.SEEK_END)
+            if size < self.offset or head != self.prefix or self.header is None:
+                self.reset()
+                self.publish("snapshot", self.latest)
+                return 0
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        if len(self.prefix) < 4096:
+            with open(self.path, "rb") as f:
+                self.prefix = f.read(4096)
+
+        published = 0
+        for line in data[:end].splitlines():
+            record = self.update(line)
+            if record is not None:
+                self.publish("price", record)
+                published += 1
+        return published
+
+    def publish(self, kind, record):
+        with self.lock:
+            event = (self.next_id, kind, record)
+            self.next_id += 1
+            self.events.append(event)
+            for subscriber in self.subscribers:
+                try:
+                    subscriber.put_nowait(event)
+                except queue.Full:
+                    # Slow clients lose the oldest update rather than block others
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Registers a client and queues the events it has to receive first.
+
+        Args:
+            last_event_id (str, optional): 'Last-Event-ID' sent by a reconnecting
+                                            client. Missed events are replayed.
+
+        Returns:
+            queue.Queue: The client's event queue.
+        """
+        subscriber = queue.Queue(maxsize=self.events.maxlen)
+        try:
+            last_id = int(last_event_id)
+        except (TypeError, ValueError):
+            last_id = None
+        with self.lock:
+            if last_id is not None and self.events and self.events[0][0] <= last_id + 1:
+                for event in self.events:
+                    if event[0] > last_id:
+                        subscriber.put_nowait(event)
+            else:
+                # New client, or too far behind to replay: start from a snapshot
+                subscriber.put_nowait((None, "snapshot", self.latest))
+            self.subscribers.add(subscriber)
+        self.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def start(self):
+        """
+        Starts the shared poller thread if it is not running yet.
+        """
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            with self.lock:
+                if not self.subscribers:
+                    # Checked under the lock, so `start` sees the thread gone
+                    self.thread = None
+                    return
+            try:
+                self.poll()
+            except (OSError, UnicodeDecodeError) as exc:
+                app.logger.warning("Price stream poll failed: %s", exc)
+
+
+price_stream = None
+price_stream_lock = threading.Lock()
+
+
+def get_price_stream():
+    global price_stream
+    path = app.config["STREAM_PATH"] or raw_path("BrentOilPrices.csv")
+    with price_stream_lock:
+        if price_stream is None or price_stream.path != path:
+            price_stream = PriceStream(
+                path,
+                rolling_window=app.config["STREAM_ROLLING_WINDOW"],
+                poll_seconds=app.config["STREAM_POLL_SECONDS"],
+            )
+        return price_stream
+
+
+def format_event(event_id, kind, record):
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {kind}", f"data: {json.dumps(record)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+@app.route("/stream")
+def stream():
+    """
+    Streams appended prices as Server-Sent Events.
+
+    Every connection starts with a 'snapshot' event holding the latest state.
+    Each appended row then produces a 'price' event with its log return,
+    rolling mean and standard deviation, and the online change point
+    probability. A reconnecting client sending 'Last-Event-ID' gets the events
+    it missed. Comment lines are sent as heartbeats while nothing changes.
+
+    Each open connection holds a server thread blocked on its own queue; the
+    file is polled by one shared thread, which stops while nobody listens.
+    """
+    hub = get_price_stream()
+    subscriber = hub.subscribe(request.headers.get("Last-Event-ID"))
+    heartbeat = app.config["STREAM_HEARTBEAT_SECONDS"]
+
+    def events():
+        try:
+            yield f"retry: {int(hub.poll_seconds * 1000)}\n\n"
+            while True:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(*event)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@app.route("/cache-stats")
+def cache_stats():
+    return jsonify(artifact_cache.stats())
+
+
+@app.route("/metrics")
+def metrics():
+    """
+    Exposes per-route request metrics in the Prometheus text format.
+    """
+    stats = artifact_cache.stats()
+    lines = [
+        "# HELP api_artifact_cache_entries Payloads held by the artifact cache.",
+        "# TYPE api_artifact_cache_entries gauge",
+        f"api_artifact_cache_entries {stats['entries']}",
+    ]
+    body = request_metrics.render() + "\n".join(lines) + "\n"
+    return Response(body, mimetype="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
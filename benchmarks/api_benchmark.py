@@ -0,0 +1,324 @@
+# api_benchmark.py
+"""
+Load-test benchmark for the Flask API.
+
+Drives every route of `app.py` through the Flask test client against synthetic
+processed artifacts and writes throughput, p50/p99 latency and peak RSS per
+route to a JSON file that can be diffed between versions.
+
+Usage:
+    python benchmarks/api_benchmark.py --sizes 10000 1000000 10000000
+    python benchmarks/api_benchmark.py --baseline old.json --output new.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Append project root for app and script imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._00_data_io import columnar_store_path, write_columnar_store
+
+# Every route of app.py but /stream, a Server-Sent Events connection that
+# stays open and so has no per-request latency to measure
+ROUTES = [
+    "/price-data",
+    "/price-data?start=1987-06-01&end=1987-06-30&columns=Price,LogReturn",
+    "/price-data?max_points=1500",
+    "/price-data?format=npz",
+    "/matched-events",
+    "/event-overlay",
+    "/regime-volatility",
+    "/change-points",
+    "/posterior-summary",
+    "/dashboard",
+    "/cache-stats",
+    "/metrics",
+]
+
+
+def make_synthetic_artifacts(rows, root, columnar=True, seed=42):
+    """
+    Writes synthetic processed and raw artifacts with the pipeline's layout.
+
+    Daily dates are used while they fit in the pandas timestamp range; larger
+    sizes switch to minute bars, as tick-level inputs would.
+
+    Args:
+        rows (int): Number of rows in the price series.
+        root (str): Directory receiving 'processed/' and 'raw/'.
+        columnar (bool, optional): Also write the columnar store, as
+                                    `get_processed_data` does. Defaults to True.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        tuple: Paths of the processed and raw directories.
+    """
+    processed_dir = os.path.join(root, "processed")
+    raw_dir = os.path.join(root, "raw")
+    os.makedirs(processed_dir, exist_ok=True)
+    os.makedirs(raw_dir, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    freq = "D" if rows <= 50_000 else "min"
+    dates = pd.date_range("1987-05-20", periods=rows, freq=freq)
+    log_returns = rng.normal(0, 0.02, size=rows)
+    log_returns[0] = np.nan
+    price = 20 * np.exp(np.nancumsum(log_returns))
+    window = 180
+    df = pd.DataFrame({"Date": dates, "Price": price})
+    rolling = df["Price"].rolling(window)
+    df["RollingMean"] = rolling.mean()
+    df["RollingStd"] = rolling.std()
+    df["LogReturn"] = log_returns
+
+    price_path = os.path.join(processed_dir, "BrentOilPrices_Log.csv")
+    df.to_csv(price_path, index=False)
+    if columnar:
+        write_columnar_store(df, columnar_store_path(price_path), price_path)
+
+    picks = dates[rng.choice(rows, size=min(rows, 20), replace=False)]
+    event_types = ["Geopolitical", "Economic Shock", "OPEC Decision", "Sanctions"]
+    events = pd.DataFrame(
+        {
+            "Date": picks.strftime("%Y-%m-%d"),
+            "Event Name": [f"Event {i}" for i in range(len(picks))],
+            "Event Type": [event_types[i % 4] for i in range(len(picks))],
+        }
+    )
+    events.to_csv(os.path.join(raw_dir, "Events.csv"), index=False)
+    events.assign(MatchedTo="τ₁", VolatilityBefore=0.02, VolatilityAfter=0.03).to_csv(
+        os.path.join(processed_dir, "matched_events.csv"), index=False
+    )
+    pd.DataFrame(
+        {
+            "Regime": ["Before τ₁", "Between τ₁–τ₂", "After τ₂"],
+            "Volatility": [0.02, 0.03, 0.025],
+        }
+    ).to_csv(os.path.join(processed_dir, "volatility_by_regime.csv"), index=False)
+    pd.DataFrame({"date": dates[[rows // 3, 2 * rows // 3]]}).to_csv(
+        os.path.join(processed_dir, "change_points.csv"), index=False
+    )
+    pd.DataFrame(
+        {"mean": [0.0, 0.02, 0.03], "sd": [0.001, 0.001, 0.001]},
+        index=["mu_log_return", "sigma_1", "sigma_2"],
+    ).to_csv(os.path.join(processed_dir, "posterior_summary.csv"))
+    return processed_dir, raw_dir
+
+
+def peak_rss_mb():
+    """
+    Returns the peak resident set size of the current process in MiB.
+
+    Returns:
+        float: Peak RSS, or None when it cannot be measured on this platform.
+    """
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        return peak / (1024**2 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024**2
+    except ImportError:
+        return None
+
+
+def latency_summary(latencies, elapsed):
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "requests": len(latencies_ms),
+        "throughput_rps": round(len(latencies_ms) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+    }
+
+
+def run_route(route, processed_dir, raw_dir, requests, concurrency, max_seconds):
+    """
+    Benchmarks one route in the current process.
+
+    Runs in a fresh child process per route so the peak RSS belongs to that
+    route alone. The first (cold) request is timed separately.
+
+    Args:
+        route (str): Route and query string.
+        processed_dir (str): Directory with the processed artifacts.
+        raw_dir (str): Directory with the raw artifacts.
+        requests (int): Requests per mode.
+        concurrency (int): Worker threads in the concurrent mode.
+        max_seconds (float): Time budget per mode; fewer requests are sent when
+                                the route is too slow to finish in time.
+
+    Returns:
+        dict: Cold latency, sequential and concurrent results and peak RSS.
+    """
+    from app import app
+
+    app.config.update(PROCESSED_DIR=processed_dir, RAW_DIR=raw_dir)
+    client = app.test_client()
+
+    start = time.perf_counter()
+    status = client.get(route).status_code
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    def timed_requests(client, count, deadline):
+        latencies = []
+        for _ in range(count):
+            if latencies and time.perf_counter() > deadline:
+                break
+            start = time.perf_counter()
+            client.get(route).close()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    latencies = timed_requests(client, requests, start + max_seconds)
+    sequential = latency_summary(latencies, time.perf_counter() - start)
+
+    per_worker = max(1, requests // concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [
+            pool.submit(
+                timed_requests, app.test_client(), per_worker, start + max_seconds
+            )
+            for _ in range(concurrency)
+        ]
+        latencies = [t for future in futures for t in future.result()]
+    concurrent = latency_summary(latencies, time.perf_counter() - start)
+
+    return {
+        "status": status,
+        "cold_ms": round(cold_ms, 3),
+        "sequential": sequential,
+        "concurrent": dict(concurrent, threads=concurrency),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmark(sizes, requests=50, concurrency=8, max_seconds=30.0, routes=None):
+    """
+    Benchmarks every route for every artifact size.
+
+    Args:
+        sizes (list): Numbers of price rows to generate.
+        requests (int, optional): Requests per route and mode. Defaults to 50.
+        concurrency (int, optional): Threads in the concurrent mode. Defaults to 8.
+        max_seconds (float, optional): Time budget per route and mode.
+                                        Defaults to 30.
+        routes (list, optional): Routes to drive. Defaults to ROUTES.
+
+    Returns:
+        dict: Environment metadata and one result per (size, route).
+    """
+    context = mp.get_context("spawn")
+    results = []
+    for rows in sizes:
+        root = tempfile.mkdtemp(prefix=f"api_bench_{rows}_")
+        try:
+            print(f"Generating {rows:,} synthetic rows ...")
+            processed_dir, raw_dir = make_synthetic_artifacts(rows, root)
+            for route in routes or ROUTES:
+                with context.Pool(1) as pool:
+                    result = pool.apply(
+                        run_route,
+                        (route, processed_dir, raw_dir, requests, concurrency),
+                        {"max_seconds": max_seconds},
+                    )
+                results.append({"rows": rows, "route": route, **result})
+                print(
+                    f"  {route:<70} p50 {result['sequential']['p50_ms']:>10.2f} ms  "
+                    f"{result['concurrent']['throughput_rps']:>9.1f} req/s"
+                )
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "requests": requests,
+            "concurrency": concurrency,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.2):
+    """
+    Lists routes whose sequential p50 regressed against a baseline report.
+
+    Args:
+        report (dict): Report returned by `run_benchmark`.
+        baseline (dict): Earlier report.
+        threshold (float, optional): Relative slowdown that counts as a
+                                        regression. Defaults to 0.2.
+
+    Returns:
+        list: (rows, route, baseline p50, new p50) for every regression.
+    """
+    previous = {(r["rows"], r["route"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["rows"], result["route"]))
+        if old is None:
+            continue
+        old_p50 = old["sequential"]["p50_ms"]
+        new_p50 = result["sequential"]["p50_ms"]
+        if new_p50 > old_p50 * (1 + threshold):
+            regressions.append((result["rows"], result["route"], old_p50, new_p50))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-seconds", type=float, default=30.0)
+    parser.add_argument("--routes", nargs="+", default=None)
+    parser.add_argument("--output", default="api_benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.sizes, args.requests, args.concurrency, args.max_seconds, args.routes
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f))
+        for rows, route, old_p50, new_p50 in regressions:
+            print(f"⚠️ {route} @ {rows:,} rows: p50 {old_p50:.2f} → {new_p50:.2f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# sampler_benchmark.py
+"""
+Sampling benchmark for the volatility change point model's NUTS backends.
+
+Fits the marginalised volatility model, the one every backend can sample, to
+the same log returns with each backend and writes wall time, bulk ESS per
+second, worst R-hat and divergences per backend to a JSON file. Backends whose
+packages are not installed are reported as unavailable.
+
+Usage:
+    python benchmarks/sampler_benchmark.py --backends pymc nutpie numpyro
+    python benchmarks/sampler_benchmark.py --data data/processed/BrentOilPrices_Log.csv
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Append project root for script imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._02_bayesian_model import SAMPLER_BACKENDS
+
+# Continuous parameters of the marginalised model
+PARAMETERS = ["mu_log_return", "sigma_1", "sigma_2", "sigma_3"]
+
+
+def make_synthetic_returns(rows, seed=42):
+    """
+    Generates log returns with volatility shifts at 45% and 85% of the series.
+
+    Args:
+        rows (int): Number of log returns.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        np.ndarray: The log returns.
+    """
+    rng = np.random.default_rng(seed)
+    edges = [0, int(rows * 0.45), int(rows * 0.85), rows]
+    return np.concatenate(
+        [
+            rng.normal(0.0, sigma, stop - start)
+            for sigma, start, stop in zip((0.01, 0.03, 0.015), edges[:-1], edges[1:])
+        ]
+    )
+
+
+def load_log_returns(path):
+    """
+    Reads the 'LogReturn' column of a processed CSV, without missing values.
+
+    Args:
+        path (str): Path to the CSV.
+
+    Returns:
+        np.ndarray: The log returns.
+    """
+    return pd.read_csv(path, usecols=["LogReturn"])["LogReturn"].dropna().to_numpy()
+
+
+def default_bounds(rows):
+    # tau_1 in the second quarter of the series, tau_2 anywhere after it
+    return ((rows // 4, rows // 2), (rows // 2, rows))
+
+
+def run_backend(data, tau_bounds, backend, draws, tune, chains, cores, seed):
+    """
+    Samples the marginalised model with one backend in the current process.
+
+    Runs in a fresh child process per backend so compiled code and JAX state
+    do not carry over. Wall time includes model compilation, which each
+    backend pays once per fit.
+
+    Args:
+        data (np.ndarray): Log returns.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        backend (str): One of SAMPLER_BACKENDS.
+        draws (int): Draws per chain.
+        tune (int): Tuning steps per chain.
+        chains (int): Number of chains.
+        cores (int): Chains run in parallel.
+        seed (int): Random seed.
+
+    Returns:
+        dict: Status, and for completed runs the timing and convergence results.
+    """
+    import arviz as az
+
+    from scripts._02_bayesian_model import (
+        build_marginalized_volatility_model,
+        sample_volatility_model,
+    )
+
+    model = build_marginalized_volatility_model(data, tau_bounds)
+    start = time.perf_counter()
+    try:
+        trace = sample_volatility_model(
+            model,
+            backend,
+            draws=draws,
+            tune=tune,
+            chains=chains,
+            cores=cores,
+            random_seed=seed,
+            progressbar=False,
+        )
+    except ImportError as error:
+        return {"status": "unavailable", "error": str(error)}
+    wall_s = time.perf_counter() - start
+
+    summary = az.summary(trace, var_names=PARAMETERS, kind="diagnostics")
+    ess_bulk = float(summary["ess_bulk"].min())
+    diverging = trace.sample_stats.get("diverging")
+    return {
+        "status": "ok",
+        "wall_s": round(wall_s, 3),
+        "ess_bulk_min": round(ess_bulk, 1),
+        "ess_per_s": round(ess_bulk / wall_s, 2),
+        "r_hat_max": float(summary["r_hat"].max()),
+        "divergences": int(diverging.sum()) if diverging is not None else None,
+    }
+
+
+def run_benchmark(
+    data, backends=None, draws=2000, tune=1000, chains=4, cores=4, seed=42
+):
+    """
+    Benchmarks every backend on the same log returns.
+
+    Args:
+        data (np.ndarray): Log returns.
+        backends (list, optional): Backends to run. Defaults to SAMPLER_BACKENDS.
+        draws (int, optional): Draws per chain. Defaults to 2000.
+        tune (int, optional): Tuning steps per chain. Defaults to 1000.
+        chains (int, optional): Number of chains. Defaults to 4.
+        cores (int, optional): Chains run in parallel. Defaults to 4.
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        dict: Environment metadata and one result per backend.
+    """
+    context = mp.get_context("spawn")
+    tau_bounds = default_bounds(len(data))
+    results = []
+    for backend in backends or SAMPLER_BACKENDS:
+        print(f"Sampling with {backend} ...")
+        with context.Pool(1) as pool:
+            result = pool.apply(
+                run_backend,
+                (data, tau_bounds, backend, draws, tune, chains, cores, seed),
+            )
+        results.append({"backend": backend, **result})
+        if result["status"] == "ok":
+            print(
+                f"  {backend:<10} {result['wall_s']:>8.1f} s  "
+                f"{result['ess_per_s']:>8.1f} ESS/s  R-hat {result['r_hat_max']:.3f}"
+            )
+        else:
+            print(f"  {backend:<10} unavailable: {result['error']}")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rows": len(data),
+            "draws": draws,
+            "tune": tune,
+            "chains": chains,
+            "cores": cores,
+        },
+        "results": results,
+    }
+
+
+def fastest_converged(report, r_hat=1.01):
+    """
+    Picks the backend with the highest ESS per second among those converged.
+
+    Args:
+        report (dict): Output of `run_benchmark`.
+        r_hat (float, optional): Largest R-hat accepted. Defaults to 1.01.
+
+    Returns:
+        str: The backend, or None when none converged.
+    """
+    converged = [
+        result
+        for result in report["results"]
+        if result["status"] == "ok"
+        and result["r_hat_max"] <= r_hat
+        and not result["divergences"]
+    ]
+    if not converged:
+        return None
+    return max(converged, key=lambda result: result["ess_per_s"])["backend"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", default=None)
+    parser.add_argument("--data", default=None, help="CSV with a LogReturn column")
+    parser.add_argument("--rows", type=int, default=3400)
+    parser.add_argument("--draws", type=int, default=2000)
+    parser.add_argument("--tune", type=int, default=1000)
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--output", default="sampler_benchmark.json")
+    args = parser.parse_args(argv)
+
+    data = (
+        load_log_returns(args.data) if args.data else make_synthetic_returns(args.rows)
+    )
+    report = run_benchmark(
+        data, args.backends, args.draws, args.tune, args.chains, args.cores
+    )
+    report["fastest_converged"] = fastest_converged(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Fastest converged backend: {report['fastest_converged']}")
+    print(f"Results saved to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 /*App.js*/
 
-import React from "react";
+import React, { useEffect, useState } from "react";
 import './App.css';
 import EventTypeDonutChart from "./components/EventTypeDonutChart";
 import LogReturnChart from"./components/LogReturnChart";
@@ -9,30 +9,43 @@ import RegimeBarChart from "./components/RegimeBarChart";
 import RollingStdChart from "./components/RollingStdChart"
 
 function App() {
+  const [dashboard, setDashboard] = useState({});
+
+  // One round trip for every chart; the API bundles all datasets, with the
+  // price series downsampled for the price and volatility charts
+  useEffect(() => {
+    fetch("http://localhost:5000/dashboard?max_points=1500")
+      .then((res) => res.json())
+      .then((json) => setDashboard(json));
+  }, []);
+
+  const priceData = dashboard.price_data || [];
+  const logReturns = dashboard.log_returns || priceData;
+
   return (
     <div className="App">
       <h1>Brent Oil Dashboard: Price, Volatility & Events</h1>
 
       <div className="dashboard-layout">
         <div className="chart-container">
-          <PriceChart />
+          <PriceChart data={priceData} />
         </div>
 
         <div className="chart-row">
           <div className="chart-container">
-            <LogReturnChart />
+            <LogReturnChart priceData={logReturns} events={dashboard.matched_events || []} />
           </div>
           <div className="chart-container">
-            <RollingStdChart />
+            <RollingStdChart data={priceData} />
           </div>
         </div>
 
         <div className="chart-row">
           <div className="chart-container">
-            <RegimeBarChart />
+            <RegimeBarChart data={dashboard.regime_volatility || []} />
           </div>
           <div className="chart-container">
-            <EventTypeDonutChart />
+            <EventTypeDonutChart data={dashboard.event_types || []} />
           </div>
         </div>
       </div>
@@ -1,6 +1,6 @@
 /* EventTypeDonutChart */
 
-import React, { useEffect, useState } from "react";
+import React from "react";
 import {
   PieChart,
   Pie,
@@ -9,14 +9,7 @@ import {
   Cell,
 } from "recharts";
 
-function EventTypeDonutChart() {
-  const [data, setData] = useState([]);
-
-  useEffect(() => {
-    fetch("http://localhost:5000/event-overlay")
-      .then((res) => res.json())
-      .then((json) => setData(json));
-  }, []);
+function EventTypeDonutChart({ data }) {
 
   const COLORS = ["#0064d6ff", "#D0021B", "#e08a00ff", "#6bcf00ff", "#7000d2ff", "#00cea2ff"];
 
@@ -1,11 +1,9 @@
 /*LogReturnChart.js*/
 
-import React, { useEffect, useState } from "react";
+import React from "react";
 import {LineChart, Line, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid, ReferenceLine, Label} from "recharts";
 
-function LogReturnChart() {
-  const [priceData, setPriceData] = useState([]);
-  const [events, setEvents] = useState([]);
+function LogReturnChart({ priceData, events }) {
   const eventColors = {
     'Economic Shock': '#4c00ffff',
     'Geopolitical': '#ff0800ff',
@@ -17,16 +15,6 @@ function LogReturnChart() {
     const positions = ["top", "middle", "bottom"];
     return positions[index % positions.length];
   };
-  
-  useEffect(() => {
-    fetch("http://localhost:5000/price-data")
-      .then((res) => res.json())
-      .then((json) => setPriceData(json));
-
-    fetch("http://localhost:5000/matched-events")
-      .then((res) => res.json())
-      .then((json) => setEvents(json));
-  }, []);
 
   
   return (
@@ -1,16 +1,9 @@
 /*PriceChart.js*/
 
-import React, { useEffect, useState } from "react";
+import React from "react";
 import { LineChart, Line, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid, Legend } from "recharts";
 
-function PriceChart() {
-  const [data, setData] = useState([]);
-
-  useEffect(() => {
-    fetch("http://localhost:5000/price-data")
-      .then((res) => res.json())
-      .then((json) => setData(json));
-  }, []);
+function PriceChart({ data }) {
 
   return (
     <div>
@@ -1,7 +1,7 @@
 /*RegimeBarChart*/
 
 
-import React, { useEffect, useState } from "react";
+import React from "react";
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid, Cell } from "recharts";
 
 
@@ -19,14 +19,7 @@ function getColor(volatility) {
   return `rgb(${r}, ${g}, ${b})`;
 }
 
-function RegimeBarChart() {
-  const [data, setData] = useState([]);
-
-  useEffect(() => {
-    fetch("http://localhost:5000/regime-volatility")
-      .then((res) => res.json())
-      .then((json) => setData(json));
-  }, []);
+function RegimeBarChart({ data }) {
 
   return (
     <div>
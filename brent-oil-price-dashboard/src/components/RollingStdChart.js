@@ -1,16 +1,9 @@
 /*RollingStdChart.js*/
 
-import React, { useEffect, useState } from "react";
+import React from "react";
 import { LineChart, Line, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid } from "recharts";
 
-function RollingStdChart() {
-  const [data, setData] = useState([]);
-
-  useEffect(() => {
-    fetch("http://localhost:5000/price-data")
-      .then((res) => res.json())
-      .then((json) => setData(json));
-  }, []);
+function RollingStdChart({ data }) {
 
   return (
     <div>
@@ -0,0 +1,426 @@
+# _00_data_io.py
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+
+# Date layouts seen in the raw and processed price files, tried in order
+DATE_FORMATS = ("%Y-%m-%d", "%d-%b-%y", "%b %d, %Y", "%d/%m/%Y")
+
+PRICE_DTYPES = {
+    "Price": "float64",
+    "RollingMean": "float64",
+    "RollingStd": "float64",
+    "LogReturn": "float64",
+}
+
+# Files above this size are parsed in chunks of CHUNK_ROWS rows
+CHUNK_THRESHOLD = 256 * 1024**2
+CHUNK_ROWS = 1_000_000
+
+# File extension of every format `export_frame` writes
+EXPORT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+
+def columnar_store_path(csv_path, cache_dir=None):
+    """
+    Returns the columnar store directory that shadows a CSV artifact.
+
+    Args:
+        csv_path (str): Path to the CSV artifact.
+        cache_dir (str, optional): Directory holding the store. Defaults to
+                                    the directory of the CSV.
+
+    Returns:
+        str: Path of the store directory, e.g. 'BrentOilPrices_Log.columns'.
+    """
+    store_name = os.path.splitext(os.path.basename(csv_path))[0] + ".columns"
+    return os.path.join(cache_dir or os.path.dirname(csv_path), store_name)
+
+
+def file_signature(path):
+    """
+    Returns the (mtime, size) signature of a file.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        list: Modification time in nanoseconds and size in bytes.
+    """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_columnar_store(df, store_dir, source_path=None):
+    """
+    Writes a DataFrame as a memory-mappable columnar store.
+
+    Every column is saved as its own '.npy' file inside a fresh version
+    directory, and 'manifest.json' is then switched atomically to point at it.
+    Readers that already mapped the previous version keep a consistent view,
+    and a half-written store is never visible.
+
+    Args:
+        df (pd.DataFrame): Frame to store. The index is not stored; reset it
+                            first to keep it as a column.
+        store_dir (str): Store directory.
+        source_path (str, optional): CSV the store shadows. Its signature and
+                                        SHA-256 are recorded so stale stores
+                                        can be detected.
+
+    Returns:
+        str: Path of the manifest.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    version = f"v{time.time_ns()}"
+    version_dir = os.path.join(store_dir, version)
+    os.makedirs(version_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = df[name].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        file_name = f"{i:03d}.npy"
+        np.save(os.path.join(version_dir, file_name), np.ascontiguousarray(values))
+        columns.append(
+            {"name": str(name), "file": file_name, "dtype": str(values.dtype)}
+        )
+
+    manifest = {
+        "version": version,
+        "rows": len(df),
+        "columns": columns,
+        "source": file_signature(source_path) if source_path else None,
+        "sha256": file_sha256(source_path) if source_path else None,
+    }
+    manifest_path = write_manifest(store_dir, manifest)
+
+    # Drop superseded versions; mapped files stay readable on POSIX and are
+    # skipped on Windows until no reader holds them
+    for entry in os.listdir(store_dir):
+        if entry.startswith("v") and entry != version:
+            shutil.rmtree(os.path.join(store_dir, entry), ignore_errors=True)
+    return manifest_path
+
+
+def write_manifest(store_dir, manifest):
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def read_manifest(store_dir):
+    with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def read_columnar_store(store_dir, columns=None):
+    """
+    Opens the columns of a store as read-only memory maps.
+
+    No data is copied: every process mapping the same store shares one copy of
+    the pages in the OS page cache.
+
+    Args:
+        store_dir (str): Store directory.
+        columns (list, optional): Columns to open. Defaults to all columns.
+
+    Returns:
+        dict: Column name to read-only np.memmap, in stored order.
+    """
+    manifest = read_manifest(store_dir)
+    version_dir = os.path.join(store_dir, manifest["version"])
+    wanted = None if columns is None else set(columns)
+    return {
+        column["name"]: np.load(
+            os.path.join(version_dir, column["file"]), mmap_mode="r"
+        )
+        for column in manifest["columns"]
+        if wanted is None or column["name"] in wanted
+    }
+
+
+def load_columnar_frame(csv_path, index_col=None, columns=None, cache_dir=None):
+    """
+    Loads the columnar store shadowing a CSV, if it is present and current.
+
+    The returned DataFrame wraps the memory-mapped columns without copying
+    them. When the CSV signature no longer matches the one recorded, the CSV
+    is hashed: a touched but unchanged file keeps the store, any other change
+    makes it stale.
+
+    Args:
+        csv_path (str): Path to the CSV artifact.
+        index_col (str, optional): Column to use as the index.
+        columns (list, optional): Columns to load. Defaults to all columns.
+        cache_dir (str, optional): Directory holding the store, see
+                                    `columnar_store_path`.
+
+    Returns:
+        pd.DataFrame: The frame, or None when there is no usable store.
+    """
+    store_dir = columnar_store_path(csv_path, cache_dir)
+    try:
+        manifest = read_manifest(store_dir)
+    except (OSError, ValueError):
+        return None
+    if (
+        manifest["source"] is not None
+        and os.path.exists(csv_path)
+        and file_signature(csv_path) != manifest["source"]
+    ):
+        if manifest.get("sha256") != file_sha256(csv_path):
+            return None
+        manifest["source"] = file_signature(csv_path)
+        try:
+            write_manifest(store_dir, manifest)
+        except OSError:
+            # A read-only store stays usable; the file is hashed again next time
+            pass
+
+    if columns is not None and index_col is not None:
+        columns = [index_col, *columns]
+    try:
+        arrays = read_columnar_store(store_dir, columns)
+    except OSError:
+        return None
+    index = None
+    if index_col is not None:
+        index = pd.Index(arrays.pop(index_col), name=index_col)
+    return pd.DataFrame(arrays, index=index, copy=False)
+
+
+def parse_dates(values, formats=DATE_FORMATS):
+    """
+    Parses date strings against a list of known formats.
+
+    Each format is applied in one vectorised pass to the values not parsed
+    yet, so files mixing a few layouts (the raw Brent file switches from
+    '20-May-87' to 'Apr 22, 2020') avoid per-element format inference. Only
+    values matching none of the formats fall back to pandas' mixed parser.
+
+    Args:
+        values (pd.Series): Date strings.
+        formats (tuple, optional): strftime formats to try. Defaults to
+                                    DATE_FORMATS.
+
+    Returns:
+        pd.Series: datetime64[ns] values, NaT where a value cannot be parsed.
+    """
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    pending = values.notna().to_numpy()
+    for fmt in formats:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(values[pending], format=fmt, errors="coerce")
+        pending = pending & parsed.isna().to_numpy()
+    if pending.any():
+        parsed[pending] = pd.to_datetime(
+            values[pending], format="mixed", errors="coerce"
+        )
+    return parsed
+
+
+def load_csv_frame(
+    csv_path,
+    date_column="Date",
+    dtypes=PRICE_DTYPES,
+    chunksize=None,
+    cache=True,
+    columns=None,
+    cache_dir=None,
+):
+    """
+    Loads a dated CSV with explicit dtypes, indexed by its date column.
+
+    A current columnar store of the CSV is mapped without parsing any text.
+    Otherwise the CSV is parsed and, given a `cache_dir`, saved there as a
+    columnar store keyed on the file's SHA-256 for later loads; source
+    directories such as 'data/raw' are never written to. When the store
+    cannot be written the parsed frame is returned as it is. Large files are
+    parsed in chunks so only one chunk of raw date strings is held in memory
+    at a time.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        date_column (str, optional): Column parsed as dates and used as the
+                                        index. Defaults to 'Date'.
+        dtypes (dict, optional): dtypes of the columns; names missing from the
+                                    file are ignored. Defaults to PRICE_DTYPES.
+        chunksize (int, optional): Rows per chunk. Defaults to CHUNK_ROWS for
+                                    files above CHUNK_THRESHOLD bytes, else the
+                                    file is parsed in one pass.
+        cache (bool, optional): Read and write the columnar store.
+                                Defaults to True.
+        columns (list, optional): Columns to return besides the dates; only
+                                    these are mapped from the store.
+                                    Defaults to all columns.
+        cache_dir (str, optional): Directory the store is read from and
+                                    written to, e.g. the processed data
+                                    directory. Defaults to reading the store
+                                    next to the CSV, as `export_frame` callers
+                                    write it, without writing one.
+
+    Returns:
+        pd.DataFrame: The frame, indexed by the parsed dates.
+    """
+    if cache:
+        df = load_columnar_frame(
+            csv_path, index_col=date_column, columns=columns, cache_dir=cache_dir
+        )
+        if df is not None:
+            return df
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtype = {name: dtypes[name] for name in header if name in (dtypes or {})}
+    dtype[date_column] = str
+    if chunksize is None and os.path.getsize(csv_path) > CHUNK_THRESHOLD:
+        chunksize = CHUNK_ROWS
+
+    chunks = pd.read_csv(csv_path, dtype=dtype, chunksize=chunksize)
+    frames = []
+    for chunk in [chunks] if chunksize is None else chunks:
+        chunk[date_column] = parse_dates(chunk[date_column])
+        frames.append(chunk)
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    if cache and cache_dir is not None:
+        # The store always holds every column, whatever this caller needs
+        try:
+            write_columnar_store(df, columnar_store_path(csv_path, cache_dir), csv_path)
+        except OSError as error:
+            logging.warning(f"Columnar store not written: {error}")
+        else:
+            stored = load_columnar_frame(
+                csv_path, index_col=date_column, columns=columns, cache_dir=cache_dir
+            )
+            if stored is not None:
+                return stored
+    df = df.set_index(date_column)
+    return df if columns is None else df[list(columns)]
+
+
+def compact_frame(df):
+    """
+    Returns a copy of a frame with float64 columns stored as float32.
+
+    Halves the memory of price frames. float32 keeps about seven significant
+    digits, ample for prices and log returns; statistics over long windows
+    should still be accumulated in float64.
+
+    Args:
+        df (pd.DataFrame): Frame to compact.
+
+    Returns:
+        pd.DataFrame: The compacted frame.
+    """
+    wide = [name for name, dtype in df.dtypes.items() if dtype == np.float64]
+    return df.astype(dict.fromkeys(wide, np.float32))
+
+
+def frame_memory_mb(df):
+    """
+    Returns the memory held by a frame's values and index in MiB.
+
+    Args:
+        df (pd.DataFrame): Frame to measure.
+
+    Returns:
+        float: Memory in MiB, strings included.
+    """
+    return float(df.memory_usage(index=True, deep=True).sum()) / 1024**2
+
+
+def _write_file(df, path, fmt):
+    # Written next to the target and renamed, so readers never see half a file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == "csv":
+        df.to_csv(tmp_path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_feather(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_year_partitions(df, path, fmt, date_column):
+    # One file per year in hive layout ('Year=2008/part-0.parquet'), which
+    # `pd.read_parquet(path)` and pyarrow datasets read back as one table
+    tmp_dir = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    years = df[date_column].dt.year.to_numpy()
+    for year in np.unique(years):
+        part_dir = os.path.join(tmp_dir, f"Year={year}")
+        os.makedirs(part_dir)
+        part = df[years == year].reset_index(drop=True)
+        _write_file(part, os.path.join(part_dir, f"part-0{EXPORT_FORMATS[fmt]}"), fmt)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    os.replace(tmp_dir, path)
+
+
+def export_frame(
+    df, base_path, formats=("csv",), partition_by_year=False, date_column="Date"
+):
+    """
+    Writes a processed frame in one or more file formats.
+
+    The frame is written as it is, without converting any column, so the cost
+    is the serialisation alone. Parquet and Feather keep the dtypes and are
+    read back without parsing; they need pyarrow.
+
+    Args:
+        df (pd.DataFrame): Frame to write. The index is not written.
+        base_path (str): Output path without extension, e.g.
+                            'data/processed/BrentOilPrices_Log'.
+        formats (tuple, optional): Any of 'csv', 'parquet' and 'feather'.
+                                    Defaults to ('csv',).
+        partition_by_year (bool, optional): Write Parquet and Feather as a
+                                            directory with one file per
+                                            calendar year of `date_column`.
+                                            CSV is always one file.
+                                            Defaults to False.
+        date_column (str, optional): Datetime column used for partitioning.
+                                        Defaults to 'Date'.
+
+    Returns:
+        dict: Format to the path written.
+    """
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(
+            f"Unknown export formats {sorted(unknown)}; "
+            f"expected any of {list(EXPORT_FORMATS)}."
+        )
+
+    paths = {}
+    for fmt in formats:
+        path = base_path + EXPORT_FORMATS[fmt]
+        if partition_by_year and fmt != "csv":
+            _write_year_partitions(df, path, fmt, date_column)
+        else:
+            _write_file(df, path, fmt)
+        paths[fmt] = path
+    return paths
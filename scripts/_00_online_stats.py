@@ -0,0 +1,305 @@
+# _00_online_stats.py
+from collections import deque
+
+import numpy as np
+from scipy.special import gammaln, logsumexp
+
+
+class RollingWindowStats:
+    """
+    Running mean and standard deviation over a fixed-size trailing window.
+
+    Values are added and evicted with Welford's update, so each new observation
+    costs O(1). The moments are recomputed exactly from the window buffer once
+    per window length to stop floating-point drift from accumulating. Results
+    match `Series.rolling(window).mean()` / `.std()`: NaN until the window is
+    full, and NaN while the window holds a missing value.
+    """
+
+    def __init__(self, window):
+        """
+        Initialises the RollingWindowStats class.
+
+        Args:
+            window (int): Number of observations in the window.
+        """
+        self.window = window
+        self.buffer = deque()
+        self.count = 0
+        self.nan_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+
+    def _add(self, x):
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x):
+        if self.count == 1:
+            self.count, self._mean, self._m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = x - self._mean
+        self._mean -= delta / self.count
+        self._m2 -= delta * (x - self._mean)
+
+    def _recompute(self):
+        finite = np.array([x for x in self.buffer if not np.isnan(x)])
+        self.count = len(finite)
+        self._mean = float(finite.mean()) if self.count else 0.0
+        self._m2 = float(((finite - self._mean) ** 2).sum()) if self.count else 0.0
+
+    def push(self, x):
+        """
+        Adds an observation and evicts the oldest one once the window is full.
+
+        Args:
+            x (float): The new observation.
+
+        Returns:
+            tuple: The window mean and standard deviation after the update.
+        """
+        x = float(x)
+        self.buffer.append(x)
+        if np.isnan(x):
+            self.nan_count += 1
+        else:
+            self._add(x)
+
+        if len(self.buffer) > self.window:
+            old = self.buffer.popleft()
+            if np.isnan(old):
+                self.nan_count -= 1
+            else:
+                self._remove(old)
+            self._evictions += 1
+            if self._evictions % self.window == 0:
+                self._recompute()
+        return self.mean, self.std
+
+    def extend(self, values):
+        """
+        Pushes several observations.
+
+        Args:
+            values (iterable): Observations in time order.
+
+        Returns:
+            tuple: Arrays with the window mean and standard deviation after each
+                    observation.
+        """
+        stats = np.array([self.push(x) for x in values], dtype=float).reshape(-1, 2)
+        return stats[:, 0], stats[:, 1]
+
+    @property
+    def ready(self):
+        return len(self.buffer) == self.window and self.nan_count == 0
+
+    @property
+    def mean(self):
+        return self._mean if self.ready else np.nan
+
+    @property
+    def std(self):
+        if not self.ready or self.window < 2:
+            return np.nan
+        return float(np.sqrt(max(self._m2, 0.0) / (self.window - 1)))
+
+
+class BayesianOnlineChangePoint:
+    """
+    Bayesian online change point detection (Adams & MacKay, 2007).
+
+    Maintains the posterior over the current run length (observations since the
+    last change point) for a Gaussian series with unknown mean and variance,
+    using a conjugate Normal-Gamma prior per run. Each observation updates the
+    posterior in O(max_run_length), so change point probabilities are refreshed
+    incrementally as data arrives instead of refitting the full model.
+    """
+
+    def __init__(
+        self,
+        hazard=1 / 250,
+        mu0=0.0,
+        kappa0=1.0,
+        alpha0=1.0,
+        beta0=4e-4,
+        max_run_length=1000,
+        recent=5,
+    ):
+        """
+        Initialises the BayesianOnlineChangePoint class.
+
+        Args:
+            hazard (float, optional): Prior probability of a change at each step.
+                                        Defaults to 1/250 (about one per year
+                                        of trading days).
+            mu0 (float, optional): Prior mean of the observations. Defaults to 0.
+            kappa0 (float, optional): Prior pseudo-count for the mean. Defaults to 1.
+            alpha0 (float, optional): Gamma shape of the precision. Defaults to 1.
+            beta0 (float, optional): Gamma rate of the precision. The default
+                                        4e-4 centres the prior on a daily
+                                        log-return volatility of about 2%.
+            max_run_length (int, optional): Run lengths kept in the posterior.
+                                            Defaults to 1000.
+            recent (int, optional): Run lengths counted as a recent change in
+                                    `change_probability`. Defaults to 5.
+        """
+        self.hazard = hazard
+        self.prior = (mu0, kappa0, alpha0, beta0)
+        self.max_run_length = max_run_length
+        self.recent = recent
+        self.log_run_length = np.array([0.0])
+        self.mu = np.array([mu0])
+        self.kappa = np.array([kappa0])
+        self.alpha = np.array([alpha0])
+        self.beta = np.array([beta0])
+        self.steps = 0
+
+    def _log_predictive(self, x):
+        # Student-t posterior predictive of each run length hypothesis
+        nu = 2 * self.alpha
+        scale2 = self.beta * (self.kappa + 1) / (self.alpha * self.kappa)
+        z = (x - self.mu) ** 2 / (nu * scale2)
+        return (
+            gammaln((nu + 1) / 2)
+            - gammaln(nu / 2)
+            - 0.5 * np.log(np.pi * nu * scale2)
+            - (nu + 1) / 2 * np.log1p(z)
+        )
+
+    def update(self, x):
+        """
+        Updates the run length posterior with a new observation.
+
+        Args:
+            x (float): The new observation. NaN values are ignored.
+
+        Returns:
+            dict: 'change_probability' (posterior mass on a change within the
+                    last `recent` observations) and 'run_length' (the most
+                    probable run length).
+        """
+        if np.isnan(x):
+            return self.summary()
+
+        log_pred = self._log_predictive(x)
+        log_joint = self.log_run_length + log_pred
+        log_growth = log_joint + np.log1p(-self.hazard)
+        log_change = logsumexp(log_joint) + np.log(self.hazard)
+        log_run_length = np.append(log_change, log_growth)
+        self.log_run_length = log_run_length - logsumexp(log_run_length)
+
+        mu0, kappa0, alpha0, beta0 = self.prior
+        beta = self.beta + self.kappa * (x - self.mu) ** 2 / (2 * (self.kappa + 1))
+        self.mu = np.append(mu0, (self.kappa * self.mu + x) / (self.kappa + 1))
+        self.kappa = np.append(kappa0, self.kappa + 1)
+        self.alpha = np.append(alpha0, self.alpha + 0.5)
+        self.beta = np.append(beta0, beta)
+
+        if len(self.log_run_length) > self.max_run_length:
+            keep = slice(0, self.max_run_length)
+            self.log_run_length = self.log_run_length[keep]
+            self.log_run_length -= logsumexp(self.log_run_length)
+            self.mu, self.kappa = self.mu[keep], self.kappa[keep]
+            self.alpha, self.beta = self.alpha[keep], self.beta[keep]
+
+        self.steps += 1
+        return self.summary()
+
+    def summary(self):
+        return {
+            "change_probability": float(
+                np.exp(logsumexp(self.log_run_length[: self.recent]))
+            ),
+            "run_length": int(np.argmax(self.log_run_length)),
+        }
+
+
+def _blocked_prefix_sums(values, block):
+    # Running sums down axis 0 restarted every `block` rows, plus each block's
+    # total. Differences of plain prefix sums lose precision as the sums grow
+    # with the series length; restarting keeps every term bounded by one block.
+    n, m = values.shape
+    blocks = np.zeros((n // block + 1, block, m))
+    blocks.reshape(-1, m)[:n] = values
+    running = np.cumsum(blocks, axis=1)
+    prefix = np.concatenate((np.zeros((1, m)), running.reshape(-1, m)[:n]))
+    return prefix, running[:, -1]
+
+
+def _window_sums(prefix, totals, window, block):
+    # prefix[i] sums from the start of the block holding row i - 1, so
+    # windows spanning a block boundary add back the earlier block's total
+    sums = prefix[window:] - prefix[:-window]
+    for b, total in enumerate(totals[:-1]):
+        boundary = (b + 1) * block
+        sums[max(boundary - window + 1, 0) : boundary + 1] += total
+    return sums
+
+
+def rolling_mean_std(values, windows, block=4096):
+    """
+    Trailing-window means and standard deviations for several windows at once.
+
+    Every window is derived from one set of prefix sums and sums of squares,
+    so extra windows cost two vectorised differences each instead of another
+    scan of the data. A 2-D input is processed for all of its columns in the
+    same operations. Values are centred on their mean and the prefix sums
+    restart every `block` values, which keeps the results within floating-point
+    tolerance of `Series.rolling(window).mean()` / `.std()` on long series.
+    Windows holding a missing value, or not yet full, are NaN.
+
+    Args:
+        values (array-like): Observations in time order, one series or one
+                                series per column.
+        windows (list): Window lengths.
+        block (int, optional): Prefix sum restart interval; raised to the
+                                largest window when smaller. Defaults to 4096.
+
+    Returns:
+        tuple: (means, stds), arrays of shape (rows, windows) for a single
+                series and (rows, columns, windows) for a 2-D input.
+    """
+    values = np.asarray(values, dtype=float)
+    single = values.ndim == 1
+    values = values.reshape(len(values), -1)
+    windows = [int(w) for w in np.atleast_1d(windows)]
+    n, m = values.shape
+    block = max(block, *windows)
+
+    missing = np.isnan(values)
+    observed = (~missing).sum(axis=0)
+    shift = np.where(missing, 0.0, values).sum(axis=0) / np.maximum(observed, 1)
+    centred = np.where(missing, 0.0, values - shift)
+    sum1, total1 = _blocked_prefix_sums(centred, block)
+    sum2, total2 = _blocked_prefix_sums(centred**2, block)
+    missing_count = np.concatenate((np.zeros((1, m), dtype=int), missing.cumsum(0)))
+
+    # Filled one window at a time, then returned with the windows last
+    means = np.full((len(windows), n, m), np.nan)
+    stds = np.full((len(windows), n, m), np.nan)
+    for j, window in enumerate(windows):
+        if window > n:
+            continue
+        s1 = _window_sums(sum1, total1, window, block)
+        s2 = _window_sums(sum2, total2, window, block)
+        mean = means[j, window - 1 :]
+        np.divide(s1, window, out=mean)
+        if window > 1:
+            # Sum of squared deviations, computed in place: s2 - s1 * mean
+            s2 -= np.multiply(s1, mean, out=s1)
+            np.maximum(s2, 0.0, out=s2)
+            np.sqrt(s2 / (window - 1), out=stds[j, window - 1 :])
+        mean += shift
+        incomplete = missing_count[window:] != missing_count[:-window]
+        means[j, window - 1 :][incomplete] = np.nan
+        stds[j, window - 1 :][incomplete] = np.nan
+
+    means, stds = np.moveaxis(means, 0, -1), np.moveaxis(stds, 0, -1)
+    if single:
+        return means[:, 0], stds[:, 0]
+    return means, stds
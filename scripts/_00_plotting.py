@@ -0,0 +1,163 @@
+# _00_plotting.py
+import hashlib
+import inspect
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+# PNG text chunk holding the digest of the inputs a figure was drawn from
+DIGEST_KEY = "InputDigest"
+
+# A figure to draw: `draw(data, **params)` onto a new pyplot figure, saved at path
+FigureJob = namedtuple("FigureJob", ["path", "draw", "data", "params"])
+
+
+def _update_digest(digest, data):
+    if isinstance(data, (pd.Series, pd.DataFrame, pd.Index)):
+        labels = data.columns if isinstance(data, pd.DataFrame) else data.name
+        digest.update(repr(labels).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy())
+    elif isinstance(data, np.ndarray):
+        digest.update(f"{data.dtype}{data.shape}".encode())
+        digest.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            _update_digest(digest, item)
+    elif hasattr(data, "groups") and callable(data.groups):
+        # arviz InferenceData: every variable of every group
+        for group in data.groups():
+            dataset = data[group]
+            for name in sorted(dataset.data_vars):
+                digest.update(f"{group}/{name}".encode())
+                _update_digest(digest, dataset[name].to_numpy())
+    else:
+        digest.update(repr(data).encode())
+
+
+def _source(function):
+    # Titles, labels and styles are constants, missing from the bytecode alone
+    try:
+        return inspect.getsource(function)
+    except (OSError, TypeError):
+        code = function.__code__
+        return repr((code.co_code, code.co_consts, code.co_names))
+
+
+def figure_digest(job):
+    """
+    Hashes everything a figure is drawn from.
+
+    Covers the data, the plot parameters, the drawing function's code and the
+    Matplotlib version, so an unchanged digest means an identical image.
+
+    Args:
+        job (FigureJob): The figure.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{job.draw.__module__}.{job.draw.__qualname__}".encode())
+    digest.update(_source(job.draw).encode())
+    digest.update(matplotlib.__version__.encode())
+    digest.update(json.dumps(job.params, sort_keys=True, default=str).encode())
+    _update_digest(digest, job.data)
+    return digest.hexdigest()
+
+
+def png_digest(path):
+    """
+    Reads the input digest stored in a PNG written by `save_figure`.
+
+    Args:
+        path (str): Path to the PNG.
+
+    Returns:
+        str: The digest, or None when the file is missing or has none.
+    """
+    try:
+        with Image.open(path) as image:
+            return image.text.get(DIGEST_KEY)
+    except (OSError, AttributeError):
+        return None
+
+
+def save_figure(job):
+    """
+    Saves the current figure with the digest of its inputs.
+
+    Args:
+        job (FigureJob): The figure that was drawn.
+    """
+    plt.savefig(job.path, metadata={DIGEST_KEY: figure_digest(job)})
+
+
+def draw_figure(job):
+    """
+    Draws a figure and saves it when the job has a path.
+
+    Args:
+        job (FigureJob): The figure to draw.
+    """
+    job.draw(job.data, **job.params)
+    if job.path:
+        save_figure(job)
+
+
+def render_figure(job):
+    # Draws, saves and closes one figure; runs in the pool workers
+    draw_figure(job)
+    plt.close("all")
+    return job.path
+
+
+def use_agg():
+    # Pool initializer: workers render off-screen whatever the parent uses
+    matplotlib.use("Agg")
+
+
+def render_figures(jobs, max_workers=None):
+    """
+    Renders figures headlessly, skipping those whose PNG is up to date.
+
+    A figure is skipped when the digest stored in its PNG matches the digest
+    of its current inputs. The others are drawn with the Agg backend, in a
+    process pool or in this process when only one needs drawing.
+
+    Args:
+        jobs (list): FigureJob entries.
+        max_workers (int, optional): Worker processes. Defaults to the number
+                                        of CPUs.
+
+    Returns:
+        dict: Path of each figure to 'rendered' or 'skipped'.
+    """
+    status = {}
+    stale = []
+    for job in jobs:
+        if png_digest(job.path) == figure_digest(job):
+            status[job.path] = "skipped"
+        else:
+            stale.append(job)
+
+    workers = min(max_workers or os.cpu_count() or 1, len(stale))
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=use_agg) as pool:
+            rendered = list(pool.map(render_figure, stale))
+    else:
+        backend = matplotlib.get_backend()
+        plt.switch_backend("Agg")
+        try:
+            rendered = [render_figure(job) for job in stale]
+        finally:
+            if backend.lower() != "agg":
+                plt.switch_backend(backend)
+    status.update(dict.fromkeys(rendered, "rendered"))
+    return status
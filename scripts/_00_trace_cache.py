@@ -0,0 +1,146 @@
+# _00_trace_cache.py
+import hashlib
+import json
+import os
+
+import arviz as az
+import numpy as np
+
+# Maps each data digest to the key of the trace stored last for that data
+INDEX_FILE = "index.json"
+
+
+def load_trace(path):
+    """
+    Reads a NetCDF trace fully into memory.
+
+    ArviZ opens NetCDF files lazily by default and keeps them open, which
+    stops the same path from being written again, as every pipeline run does.
+
+    Args:
+        path (str): Path to the trace.
+
+    Returns:
+        InferenceData: The trace.
+    """
+    with az.rc_context(rc={"data.load": "eager"}):
+        return az.from_netcdf(path)
+
+
+def data_digest(data):
+    """
+    Hashes the observations a model is fitted to.
+
+    Args:
+        data (array-like): The observations.
+
+    Returns:
+        str: Hex SHA-256 digest of their float64 values.
+    """
+    values = np.ascontiguousarray(data, dtype=np.float64)
+    digest = hashlib.sha256(f"{values.shape}".encode())
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class TraceCache:
+    """
+    Content-addressed store of posterior traces.
+
+    A trace is stored under the hash of the data it was fitted to and of a
+    JSON-serialisable spec of everything else that determines it (model,
+    priors, change point bounds, sampler settings). Re-running with identical
+    inputs loads the stored trace instead of sampling again, and later stages
+    can look up the trace fitted last to their data without knowing the spec.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initialises the TraceCache class.
+
+        Args:
+            cache_dir (str): Directory holding the traces; created when missing.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, data, spec):
+        """
+        Computes the cache key of a fit.
+
+        Args:
+            data (array-like): The observations the model is fitted to.
+            spec (dict): Model and sampler settings.
+
+        Returns:
+            str: Hex SHA-256 digest of the data and the spec.
+        """
+        digest = hashlib.sha256(data_digest(data).encode())
+        digest.update(json.dumps(spec, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.nc")
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key):
+        """
+        Loads a stored trace.
+
+        Args:
+            key (str): Cache key from `key`.
+
+        Returns:
+            InferenceData: The trace, or None on a miss.
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        return load_trace(path)
+
+    def store(self, key, trace, data):
+        """
+        Stores a trace and records it as the latest fit to its data.
+
+        Both files are written next to their targets and renamed, so readers
+        never see half a file.
+
+        Args:
+            key (str): Cache key from `key`.
+            trace (InferenceData): The trace.
+            data (array-like): The observations it was fitted to.
+
+        Returns:
+            str: Path of the stored trace.
+        """
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        az.to_netcdf(trace, tmp_path)
+        os.replace(tmp_path, path)
+
+        index = self._read_index()
+        index[data_digest(data)] = key
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        with open(f"{index_path}.{os.getpid()}.tmp", "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(f"{index_path}.{os.getpid()}.tmp", index_path)
+        return path
+
+    def latest(self, data):
+        """
+        Loads the trace stored last for the given data, whatever its spec.
+
+        Args:
+            data (array-like): The observations.
+
+        Returns:
+            InferenceData: The trace, or None when no fit to this data is stored.
+        """
+        key = self._read_index().get(data_digest(data))
+        return self.load(key) if key else None
@@ -1,6 +1,9 @@
 # _01_eda.py
+import hashlib
 import os
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -9,7 +12,189 @@ from IPython.display import display
 from statsmodels.tools.sm_exceptions import InterpolationWarning
 from statsmodels.tsa.stattools import adfuller, kpss
 
-warnings.filterwarnings("ignore", message="Could not infer format")
+from scripts._00_data_io import (
+    columnar_store_path,
+    compact_frame,
+    export_frame,
+    frame_memory_mb,
+    load_csv_frame,
+    parse_dates,
+    write_columnar_store,
+)
+from scripts._00_online_stats import RollingWindowStats, rolling_mean_std
+from scripts._00_plotting import FigureJob, draw_figure, render_figures
+
+STATIONARITY_TESTS = ("adf", "kpss")
+
+# Results of single stationarity tests, keyed on (values hash, window, test),
+# least recently used first; entries beyond the size are evicted
+STATIONARITY_CACHE_SIZE = 50_000
+stationarity_cache = OrderedDict()
+
+
+def run_stationarity_test(values, test):
+    """
+    Runs one ADF or KPSS test.
+
+    Args:
+        values (np.ndarray): Observations without missing values.
+        test (str): 'adf' or 'kpss'.
+
+    Returns:
+        tuple: Test statistic, p-value and number of lags; NaNs when the test
+                cannot be computed (e.g. a constant window).
+    """
+    try:
+        if test == "adf":
+            result = adfuller(values)
+            return float(result[0]), float(result[1]), int(result[2])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", InterpolationWarning)
+            result = kpss(values, regression="c")
+        return float(result[0]), float(result[1]), int(result[2])
+    except (ValueError, np.linalg.LinAlgError):
+        return np.nan, np.nan, np.nan
+
+
+def run_stationarity_chunk(tasks):
+    # Process pool entry point: one call handles a chunk of (values, test)
+    return [run_stationarity_test(values, test) for values, test in tasks]
+
+
+def stationarity_table(
+    series,
+    label_columns=("Series",),
+    window=None,
+    step=None,
+    tests=STATIONARITY_TESTS,
+    max_workers=None,
+):
+    """
+    Runs ADF and KPSS tests over many series and rolling windows.
+
+    The independent tests are spread in chunks over a process pool, and every
+    result is cached on (hash of the window values, window, test), so
+    overlapping or repeated batches only run the tests they have not seen yet.
+    The cache keeps the STATIONARITY_CACHE_SIZE most recently used results.
+
+    Args:
+        series (dict): Label, or tuple of labels, to pd.Series; missing values
+                        are dropped first.
+        label_columns (tuple, optional): Output columns holding the labels.
+                                            Defaults to ('Series',).
+        window (int, optional): Observations per window. Defaults to the whole
+                                series.
+        step (int, optional): Observations between window starts.
+                                Defaults to `window`.
+        tests (tuple, optional): Tests to run. Defaults to ('adf', 'kpss').
+        max_workers (int, optional): Worker processes; 1 runs the tests in
+                                        this process. Defaults to the number
+                                        of CPUs.
+
+    Returns:
+        pd.DataFrame: One row per (series, window, test) with the label columns,
+                        'Start', 'End', 'Test', 'Statistic', 'PValue' and 'Lags'.
+    """
+    rows, keys, pending, known = [], [], {}, {}
+    for label, values in series.items():
+        labels = label if isinstance(label, tuple) else (label,)
+        values = values.dropna()
+        index = values.index
+        values = values.to_numpy(dtype=float)
+        size = window or len(values)
+        for start in range(0, len(values) - size + 1, step or size):
+            chunk = values[start : start + size]
+            digest = hashlib.sha256(chunk.tobytes()).hexdigest()
+            for test in tests:
+                key = (digest, size, test)
+                if key in stationarity_cache:
+                    stationarity_cache.move_to_end(key)
+                    known[key] = stationarity_cache[key]
+                else:
+                    pending[key] = (chunk, test)
+                rows.append((*labels, index[start], index[start + size - 1]))
+                keys.append(key)
+
+    tasks = list(pending.values())
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        # A few large chunks per worker keep the pickling overhead low
+        chunksize = -(-len(tasks) // (workers * 4))
+        chunks = [tasks[i : i + chunksize] for i in range(0, len(tasks), chunksize)]
+        with ProcessPoolExecutor(workers) as pool:
+            results = [
+                r for chunk in pool.map(run_stationarity_chunk, chunks) for r in chunk
+            ]
+    else:
+        results = run_stationarity_chunk(tasks)
+    known.update(zip(pending, results))
+    stationarity_cache.update(zip(pending, results))
+    while len(stationarity_cache) > STATIONARITY_CACHE_SIZE:
+        stationarity_cache.popitem(last=False)
+
+    return pd.DataFrame(
+        [(*row, key[2], *known[key]) for row, key in zip(rows, keys)],
+        columns=[
+            *label_columns,
+            "Start",
+            "End",
+            "Test",
+            "Statistic",
+            "PValue",
+            "Lags",
+        ],
+    )
+
+
+def rolling_columns(window, primary_window):
+    """
+    Returns the names of the rolling mean and std columns of a window.
+
+    Args:
+        window (int): Window size.
+        primary_window (int): Window whose columns are not suffixed.
+
+    Returns:
+        tuple: 'RollingMean' and 'RollingStd' for the primary window,
+                suffixed with the window size (e.g. 'RollingStd_60') for
+                the others.
+    """
+    if window == primary_window:
+        return "RollingMean", "RollingStd"
+    return f"RollingMean_{window}", f"RollingStd_{window}"
+
+
+def draw_raw_prices(price):
+    price.plot(title="Brent Oil Prices Over Time", figsize=(12, 4))
+    plt.ylabel("USD/barrel")
+    plt.grid()
+    plt.tight_layout()
+
+
+def draw_rolling_mean(frame):
+    frame.plot(title="Rolling Mean Overlay", figsize=(12, 4))
+    plt.ylabel("USD/barrel")
+    plt.grid()
+    plt.tight_layout()
+
+
+def draw_rolling_std(frame):
+    frame.plot(
+        title="Rolling Volatility (Std Dev)",
+        color="orange" if frame.shape[1] == 1 else None,
+        legend=frame.shape[1] > 1,
+        figsize=(12, 4),
+    )
+    plt.ylabel("USD/barrel")
+    plt.grid()
+    plt.tight_layout()
+
+
+def draw_log_returns(log_return):
+    log_return.plot(title="Log Returns of Brent Prices", figsize=(12, 4))
+    plt.ylabel("Log(P_t / P_t-1)")
+    plt.grid()
+    plt.tight_layout()
 
 
 class BrentOilDiagnostics:
@@ -21,7 +206,15 @@ class BrentOilDiagnostics:
     to visualise the data and analysis results.
     """
 
-    def __init__(self, price_path, plot_dir, processed_dir, rolling_window=180):
+    def __init__(
+        self,
+        price_path,
+        plot_dir,
+        processed_dir,
+        rolling_window=180,
+        headless=False,
+        compact=False,
+    ):
         """
         Initialises the BrentOilDiagnostics class.
 
@@ -29,14 +222,28 @@ class BrentOilDiagnostics:
             price_path (str): Path to the CSV file containing Brent Oil prices.
             plot_dir (str): Directory to save generated plots.
             processed_dir (str): Directory to save processed data.
-            rolling_window (int, optional): Window size for rolling calculations.
-                                            Defaults to 180.
+            rolling_window (int | list, optional): Window size for rolling
+                                                    calculations, or several
+                                                    sizes, the first being the
+                                                    primary one. Defaults to 180.
+            headless (bool, optional): Queue figures for `render_plots` instead
+                                        of showing them. Defaults to False.
+            compact (bool, optional): Hold prices and derived columns as
+                                        float32 to halve memory use.
+                                        Defaults to False.
         """
         self.price_path = price_path
         self.plot_dir = plot_dir
         self.processed_dir = processed_dir
-        self.rolling_window = rolling_window
+        self.rolling_windows = [int(w) for w in np.atleast_1d(rolling_window)]
+        self.rolling_window = self.rolling_windows[0]
+        self.headless = headless
+        self.compact = compact
+        self.float_dtype = np.float32 if compact else np.float64
+        self.figure_jobs = []
         self.df = None
+        self.append_state = None
+        self.memory_usage = {}
 
         # Create output directories if they do not exist
         if not os.path.exists(self.plot_dir):
@@ -70,46 +277,120 @@ class BrentOilDiagnostics:
         Loads the Brent Oil price data from the specified CSV file.
 
         The 'Date' column is converted to datetime objects and set as the index.
+        Parsing uses explicit dtypes and known date formats, and the result is
+        cached as a columnar store in the processed directory for later runs.
         """
-        self.df = pd.read_csv(self.price_path)
-        self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
-        self.df.set_index("Date", inplace=True)
+        self.df = load_csv_frame(self.price_path, cache_dir=self.processed_dir)
+        if self.compact:
+            self.df = compact_frame(self.df)
+        self.record_memory("load_data")
         # Return the DataFrame (optional, but good practice)
         return self.df
 
-    def plot_raw_prices(self):
+    def record_memory(self, stage):
         """
-        Plots the raw Brent Oil prices over time.
+        Records the memory held by the DataFrame after a processing stage.
 
-        Saves the plot to the specified plot directory.
+        Args:
+            stage (str): Name of the stage, the key in `self.memory_usage`.
+
+        Returns:
+            float: Memory in MiB.
         """
-        self.df["Price"].plot(title="Brent Oil Prices Over Time", figsize=(12, 4))
-        plt.ylabel("USD/barrel")
-        plt.grid()
-        plt.tight_layout()
+        self.memory_usage[stage] = frame_memory_mb(self.df)
+        return self.memory_usage[stage]
+
+    def plot_figure(self, file_name, draw, data, **params):
+        """
+        Draws a figure, saves it to the plot directory and shows it.
+
+        In headless mode the figure is only queued for `render_plots`.
 
-        if self.plot_dir:
-            plot_path = os.path.join(self.plot_dir, "brent_oil_prices_over_time.png")
-            plt.savefig(plot_path)
+        Args:
+            file_name (str): PNG file name inside the plot directory.
+            draw (callable): Module-level function drawing `data` with pyplot.
+            data: Data the figure is drawn from.
+            **params: Extra keyword arguments for `draw`.
+        """
+        path = os.path.join(self.plot_dir, file_name) if self.plot_dir else None
+        job = FigureJob(path, draw, data, params)
+        if self.headless:
+            if path:
+                self.figure_jobs.append(job)
+            return
+
+        draw_figure(job)
+        if path:
             # Print relative path for better readability
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
+            print(f"\nPlot saved to {self.safe_relpath(path)}")
 
         plt.show()
         plt.close()
 
+    def render_plots(self, max_workers=None):
+        """
+        Renders the queued figures off-screen in a worker pool.
+
+        Figures whose PNG was drawn from the same data and parameters are
+        skipped, so re-rendering after a no-op run is nearly instant.
+
+        Args:
+            max_workers (int, optional): Worker processes. Defaults to the number
+                                            of CPUs.
+
+        Returns:
+            dict: Path of each figure to 'rendered' or 'skipped'.
+        """
+        status = render_figures(self.figure_jobs, max_workers)
+        self.figure_jobs = []
+        for path, result in status.items():
+            print(f"Plot {result}: {self.safe_relpath(path)}")
+        return status
+
+    def plot_raw_prices(self):
+        """
+        Plots the raw Brent Oil prices over time.
+
+        Saves the plot to the specified plot directory.
+        """
+        self.plot_figure(
+            "brent_oil_prices_over_time.png", draw_raw_prices, self.df["Price"]
+        )
+
+    def rolling_columns(self, window):
+        """
+        Returns the names of the rolling mean and std columns of a window.
+
+        Args:
+            window (int): Window size.
+
+        Returns:
+            tuple: The mean and std column names, see `rolling_columns`.
+        """
+        return rolling_columns(window, self.rolling_window)
+
     def compute_rolling_stats(self):
         """
         Computes rolling mean and standard deviation of the 'Price' column.
 
-        The rolling window size is determined by `self.rolling_window`.
-        Adds 'RollingMean' and 'RollingStd' columns to the DataFrame.
+        Every window in `self.rolling_windows` is computed from one set of
+        cumulative sums, so extra windows add almost no cost. Adds
+        'RollingMean' and 'RollingStd' columns for the primary window and
+        suffixed columns for the others.
+
+        Returns:
+            tuple: Means and standard deviations as arrays of shape
+                    (rows, windows).
         """
-        self.df["RollingMean"] = (
-            self.df["Price"].rolling(window=self.rolling_window).mean()
-        )
-        self.df["RollingStd"] = (
-            self.df["Price"].rolling(window=self.rolling_window).std()
+        means, stds = rolling_mean_std(
+            self.df["Price"].to_numpy(dtype=float), self.rolling_windows
         )
+        for j, window in enumerate(self.rolling_windows):
+            mean_column, std_column = self.rolling_columns(window)
+            self.df[mean_column] = means[:, j].astype(self.float_dtype)
+            self.df[std_column] = stds[:, j].astype(self.float_dtype)
+        self.record_memory("compute_rolling_stats")
+        return means, stds
 
     def plot_rolling_stats(self):
         """
@@ -118,36 +399,17 @@ class BrentOilDiagnostics:
         Saves the plots to the specified plot directory.
         """
         # Plot rolling mean overlay
-        self.df[["Price", "RollingMean"]].plot(
-            title="Rolling Mean Overlay", figsize=(12, 4)
+        self.plot_figure(
+            "rolling_mean_overlay.png",
+            draw_rolling_mean,
+            self.df[["Price", "RollingMean"]],
         )
-        plt.ylabel("USD/barrel")
-        plt.grid()
-        plt.tight_layout()
-
-        if self.plot_dir:
-            plot_path = os.path.join(self.plot_dir, "rolling_mean_overlay.png")
-            plt.savefig(plot_path)
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
-
-        plt.show()
-        plt.close()
 
-        # Plot rolling standard deviation
-        self.df["RollingStd"].plot(
-            title="Rolling Volatility (Std Dev)", color="orange", figsize=(12, 4)
+        # Plot rolling standard deviation of every window
+        std_columns = [self.rolling_columns(w)[1] for w in self.rolling_windows]
+        self.plot_figure(
+            "rolling_volatility_(std_dev).png", draw_rolling_std, self.df[std_columns]
         )
-        plt.ylabel("USD/barrel")
-        plt.grid()
-        plt.tight_layout()
-
-        if self.plot_dir:
-            plot_path = os.path.join(self.plot_dir, "rolling_volatility_(std_dev).png")
-            plt.savefig(plot_path)
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
-
-        plt.show()
-        plt.close()
 
     def run_stationarity_tests(self, series_name):
         """
@@ -173,6 +435,47 @@ class BrentOilDiagnostics:
                 {kpss_result[1]:.4f} → Higher = More stationarity\n"
         )
 
+    def run_stationarity_batch(
+        self,
+        columns=("Price", "LogReturn"),
+        window=None,
+        step=None,
+        tests=STATIONARITY_TESTS,
+        max_workers=None,
+    ):
+        """
+        Runs ADF and KPSS tests over several columns and rolling windows.
+
+        Each column is tested as a whole, or over windows of `window`
+        observations every `step` observations; see `stationarity_table` for
+        the process pool and the result cache.
+
+        Args:
+            columns (list, optional): Columns to test; missing values are
+                                        dropped first. Defaults to 'Price' and
+                                        'LogReturn'.
+            window (int, optional): Observations per window. Defaults to the
+                                    whole series.
+            step (int, optional): Observations between window starts.
+                                    Defaults to `window`.
+            tests (tuple, optional): Tests to run. Defaults to ('adf', 'kpss').
+            max_workers (int, optional): Worker processes; 1 runs the tests in
+                                            this process. Defaults to the number
+                                            of CPUs.
+
+        Returns:
+            pd.DataFrame: One row per (series, window, test) with 'Series',
+                            'Start', 'End', 'Test', 'Statistic', 'PValue' and
+                            'Lags'.
+        """
+        return stationarity_table(
+            {column: self.df[column] for column in columns},
+            window=window,
+            step=step,
+            tests=tests,
+            max_workers=max_workers,
+        )
+
     def compute_log_returns(self):
         """
         Computes the log returns of the 'Price' column.
@@ -180,9 +483,82 @@ class BrentOilDiagnostics:
         Adds a 'LogReturn' column to the DataFrame.
         Log return is calculated as log(P_t) - log(P_t-1).
         """
-        self.df["LogReturn"] = np.log(self.df["Price"]) - np.log(
-            self.df["Price"].shift(1)
+        # Differenced in float64 even in compact mode, so the returns do not
+        # lose their leading digits to the much larger log prices
+        log_price = np.log(self.df["Price"].to_numpy(dtype=float))
+        self.df["LogReturn"] = np.append(np.nan, np.diff(log_price)).astype(
+            self.float_dtype
         )
+        self.record_memory("compute_log_returns")
+
+    def append(self, new_rows):
+        """
+        Appends new prices and extends the derived columns incrementally.
+
+        The rolling windows and the last price are kept as running state between
+        calls, so only the new rows are processed instead of the full history.
+        The rolling and 'LogReturn' columns are extended when they have already
+        been computed, and match `compute_rolling_stats` and
+        `compute_log_returns` to floating-point tolerance.
+
+        Args:
+            new_rows (pd.DataFrame | pd.Series): New prices, as a frame with a
+                                                'Price' column or a series of
+                                                prices, indexed by date or with
+                                                a 'Date' column.
+
+        Returns:
+            pd.DataFrame: The updated DataFrame.
+
+        Raises:
+            ValueError: If the new rows do not start after the current data.
+        """
+        if isinstance(new_rows, pd.Series):
+            new_rows = new_rows.to_frame("Price")
+        if "Date" in new_rows.columns:
+            dates = new_rows["Date"]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = parse_dates(dates.astype(str))
+            new_rows = new_rows.drop(columns="Date").set_index(
+                pd.DatetimeIndex(dates, name="Date")
+            )
+        if new_rows.empty:
+            return self.df
+        if len(self.df) and new_rows.index[0] <= self.df.index[-1]:
+            raise ValueError(
+                f"New rows must start after {self.df.index[-1].date()}, "
+                f"got {new_rows.index[0].date()}"
+            )
+
+        # Seed the running state from the tail of the history, once
+        if self.append_state is None or self.append_state[0] != len(self.df):
+            history = self.df["Price"].to_numpy(dtype=float)
+            rollings = []
+            for window in self.rolling_windows:
+                rollings.append(RollingWindowStats(window))
+                rollings[-1].extend(history[-window:])
+            last_price = history[-1] if len(history) else np.nan
+        else:
+            _, rollings, last_price = self.append_state
+
+        prices = new_rows["Price"].to_numpy(dtype=float)
+        derived = {"LogReturn": np.diff(np.log(np.append(last_price, prices)))}
+        for window, rolling in zip(self.rolling_windows, rollings):
+            mean_column, std_column = self.rolling_columns(window)
+            derived[mean_column], derived[std_column] = rolling.extend(prices)
+        block = {}
+        for name in self.df.columns:
+            if name in derived:
+                block[name] = derived[name]
+            elif name in new_rows.columns:
+                block[name] = new_rows[name].to_numpy()
+            else:
+                block[name] = np.nan
+        block = pd.DataFrame(block, index=new_rows.index).astype(self.df.dtypes)
+        self.df = pd.concat([self.df, block])
+        self.append_state = (len(self.df), rollings, prices[-1])
+        self.record_memory("append")
+        return self.df
 
     def plot_log_returns(self):
         """
@@ -190,18 +566,9 @@ class BrentOilDiagnostics:
 
         Saves the plot to the specified plot directory.
         """
-        self.df["LogReturn"].plot(title="Log Returns of Brent Prices", figsize=(12, 4))
-        plt.ylabel("Log(P_t / P_t-1)")
-        plt.grid()
-        plt.tight_layout()
-
-        if self.plot_dir:
-            plot_path = os.path.join(self.plot_dir, "log_returns_of_brent_prices.png")
-            plt.savefig(plot_path)
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
-
-        plt.show()
-        plt.close()
+        self.plot_figure(
+            "log_returns_of_brent_prices.png", draw_log_returns, self.df["LogReturn"]
+        )
 
     def run_diagnostics(self):
         """
@@ -209,7 +576,8 @@ class BrentOilDiagnostics:
 
         Includes plotting raw prices, computing and plotting rolling statistics,
         running stationarity tests on raw prices, computing and plotting log returns,
-        and running stationarity tests on log returns.
+        and running stationarity tests on log returns. In headless mode the
+        figures are rendered together in a worker pool at the end.
 
         Returns:
             pd.DataFrame: The DataFrame with added rolling statistics and log returns.
@@ -222,36 +590,63 @@ class BrentOilDiagnostics:
         self.compute_log_returns()
         self.plot_log_returns()
         self.run_stationarity_tests("LogReturn")
+        if self.headless:
+            self.render_plots()
         # Return the processed DataFrame
         return self.df
 
-    def get_processed_data(self):
+    def get_processed_data(
+        self, formats=("csv",), partition_by_year=False, summary=True
+    ):
         """
-        Prepares and saves the enriched DataFrame to a CSV file.
+        Saves the enriched DataFrame to the processed data directory.
 
-        Resets the index, formats the 'Date' column, saves the DataFrame
-        to 'BrentOilPrices_Log.csv' in the processed data directory,
-        and displays the head, shape, columns, info, and description
-        of the processed DataFrame.
+        Resets the index so 'Date' is a column again and writes the frame as
+        'BrentOilPrices_Log' in each requested format. The CSV gets a
+        memory-mappable columnar copy ('BrentOilPrices_Log.columns') next to
+        it. The dates are already parsed by `load_data`, so they are written
+        without any conversion.
+
+        Args:
+            formats (tuple, optional): Any of 'csv', 'parquet' and 'feather'.
+                                        Defaults to ('csv',).
+            partition_by_year (bool, optional): Write Parquet and Feather with
+                                                one file per year.
+                                                Defaults to False.
+            summary (bool, optional): Display the head, shape, columns, info
+                                        and description of the frame. Skip it
+                                        for large histories and call
+                                        `summarize` when needed.
+                                        Defaults to True.
 
         Returns:
-            None
+            dict: Format to the path written.
         """
         # Reset the index so Date becomes a column again
         df_out = self.df.reset_index()
-        # Ensure 'Date' is in datetime format, coercing errors
-        df_out["Date"] = pd.to_datetime(df_out["Date"], errors="coerce")
-        # Format the date to YYYY-MM-DD string
-        df_out["Date"] = df_out["Date"].dt.strftime("%Y-%m-%d")
-        # Convert back to datetime objects after formatting
-        df_out["Date"] = pd.to_datetime(df_out["Date"])
-
-        # Save processed data to CSV, without the pandas index
-        df_out.to_csv(
-            os.path.join(self.processed_dir, "BrentOilPrices_Log.csv"), index=False
-        )
+
+        base_path = os.path.join(self.processed_dir, "BrentOilPrices_Log")
+        paths = export_frame(df_out, base_path, formats, partition_by_year)
+        if "csv" in paths:
+            # Columnar copy that downstream stages and the API map without parsing
+            write_columnar_store(
+                df_out, columnar_store_path(paths["csv"]), paths["csv"]
+            )
         print(f"Enriched DataFrame saved to {self.safe_relpath(self.processed_dir)}.")
 
+        if summary:
+            self.summarize(df_out)
+        return paths
+
+    def summarize(self, df=None):
+        """
+        Displays the head, shape, columns, info and description of a frame.
+
+        Args:
+            df (pd.DataFrame, optional): Frame to summarise. Defaults to the
+                                            enriched DataFrame.
+        """
+        df_out = self.df.reset_index() if df is None else df
         print("DataFrame Head:")
         display(df_out.head())
         print(f"\nShape: {df_out.shape}")
@@ -260,3 +655,208 @@ class BrentOilDiagnostics:
         df_out.info()
         print("\nDescribe:")
         display(df_out.describe())
+
+
+class PanelDiagnostics:
+    """
+    Runs the BrentOilDiagnostics computations over many price series at once.
+
+    Prices of every asset (e.g. Brent, WTI, spreads, FX) are held as one
+    dates x assets array, so log returns and rolling statistics are computed
+    for all assets in single 2-D NumPy operations instead of one instance per
+    asset. Dates an asset has no price for are NaN, as in `DataFrame.rolling`
+    over the aligned calendar.
+    """
+
+    def __init__(
+        self,
+        prices,
+        processed_dir,
+        rolling_window=180,
+        asset_column="Asset",
+        price_column="Price",
+    ):
+        """
+        Initialises the PanelDiagnostics class.
+
+        Args:
+            prices (pd.DataFrame | str): Wide frame with one price column per
+                                            asset, or long frame with asset
+                                            and price columns, indexed by
+                                            date or with a 'Date' column; or
+                                            the path of such a CSV.
+            processed_dir (str): Directory to save processed data.
+            rolling_window (int | list, optional): Window size for rolling
+                                                    calculations, or several
+                                                    sizes, the first being the
+                                                    primary one. Defaults to 180.
+            asset_column (str, optional): Asset column of a long frame.
+                                            Defaults to 'Asset'.
+            price_column (str, optional): Price column of a long frame.
+                                            Defaults to 'Price'.
+        """
+        self.processed_dir = processed_dir
+        self.rolling_windows = [int(w) for w in np.atleast_1d(rolling_window)]
+        self.rolling_window = self.rolling_windows[0]
+        self.log_returns = None
+        self.rolling_means = None
+        self.rolling_stds = None
+
+        if not os.path.exists(self.processed_dir):
+            os.makedirs(self.processed_dir)
+
+        if isinstance(prices, str):
+            prices = load_csv_frame(
+                prices,
+                dtypes={price_column: "float64"},
+                cache_dir=self.processed_dir,
+            )
+        if "Date" in prices.columns:
+            prices = prices.set_index("Date")
+        if asset_column in prices.columns:
+            prices = prices.pivot(columns=asset_column, values=price_column)
+        self.prices = prices.sort_index().astype(float)
+        self.prices.columns.name = asset_column
+
+    @property
+    def assets(self):
+        return list(self.prices.columns)
+
+    def compute_log_returns(self):
+        """
+        Computes the log returns of every asset.
+
+        Returns:
+            pd.DataFrame: Dates x assets log returns, NaN on the first date.
+        """
+        log_prices = np.log(self.prices.to_numpy())
+        log_returns = np.full_like(log_prices, np.nan)
+        np.subtract(log_prices[1:], log_prices[:-1], out=log_returns[1:])
+        self.log_returns = pd.DataFrame(
+            log_returns, index=self.prices.index, columns=self.prices.columns
+        )
+        return self.log_returns
+
+    def compute_rolling_stats(self):
+        """
+        Computes rolling means and standard deviations of every asset's prices.
+
+        Returns:
+            tuple: Means and standard deviations as arrays of shape
+                    (dates, assets, windows).
+        """
+        self.rolling_means, self.rolling_stds = rolling_mean_std(
+            self.prices.to_numpy(), self.rolling_windows
+        )
+        return self.rolling_means, self.rolling_stds
+
+    def run_stationarity_batch(
+        self,
+        columns=("Price", "LogReturn"),
+        window=None,
+        step=None,
+        tests=STATIONARITY_TESTS,
+        max_workers=None,
+    ):
+        """
+        Runs ADF and KPSS tests for every asset, as a whole or over rolling
+        windows, in one process pool; see `stationarity_table`.
+
+        Args:
+            columns (list, optional): 'Price' and/or 'LogReturn'. Defaults to
+                                        both.
+            window (int, optional): Observations per window. Defaults to the
+                                    whole series.
+            step (int, optional): Observations between window starts.
+                                    Defaults to `window`.
+            tests (tuple, optional): Tests to run. Defaults to ('adf', 'kpss').
+            max_workers (int, optional): Worker processes. Defaults to the
+                                            number of CPUs.
+
+        Returns:
+            pd.DataFrame: One row per (asset, series, window, test).
+        """
+        if "LogReturn" in columns and self.log_returns is None:
+            self.compute_log_returns()
+        frames = {"Price": self.prices, "LogReturn": self.log_returns}
+        return stationarity_table(
+            {
+                (asset, column): frames[column][asset]
+                for asset in self.assets
+                for column in columns
+            },
+            label_columns=(self.prices.columns.name, "Series"),
+            window=window,
+            step=step,
+            tests=tests,
+            max_workers=max_workers,
+        )
+
+    def run_diagnostics(self):
+        """
+        Computes log returns and rolling statistics for every asset.
+
+        Returns:
+            pd.DataFrame: The consolidated long frame, see `to_frame`.
+        """
+        self.compute_log_returns()
+        self.compute_rolling_stats()
+        return self.to_frame()
+
+    def to_frame(self):
+        """
+        Builds one long frame holding every asset's prices and diagnostics.
+
+        Returns:
+            pd.DataFrame: 'Date', asset, 'Price', 'LogReturn' and the rolling
+                            columns, one row per date an asset has a price for.
+        """
+        n, m = self.prices.shape
+        prices = self.prices.to_numpy()
+        columns = {
+            "Date": np.repeat(self.prices.index.to_numpy(), m),
+            self.prices.columns.name: np.tile(np.asarray(self.assets, dtype=object), n),
+            "Price": prices.ravel(),
+        }
+        if self.log_returns is not None:
+            columns["LogReturn"] = self.log_returns.to_numpy().ravel()
+        if self.rolling_means is not None:
+            for j, window in enumerate(self.rolling_windows):
+                mean_column, std_column = rolling_columns(window, self.rolling_window)
+                columns[mean_column] = self.rolling_means[:, :, j].ravel()
+                columns[std_column] = self.rolling_stds[:, :, j].ravel()
+        frame = pd.DataFrame(columns)
+        return frame[~np.isnan(prices.ravel())].reset_index(drop=True)
+
+    def get_processed_data(
+        self, file_name="panel_diagnostics", formats=("csv",), partition_by_year=False
+    ):
+        """
+        Saves the consolidated frame of every asset as one processed artifact.
+
+        The frame is written as in `BrentOilDiagnostics.get_processed_data`,
+        with a memory-mappable columnar copy next to the CSV.
+
+        Args:
+            file_name (str, optional): File name without extension in the
+                                        processed data directory. Defaults to
+                                        'panel_diagnostics'.
+            formats (tuple, optional): Any of 'csv', 'parquet' and 'feather'.
+                                        Defaults to ('csv',).
+            partition_by_year (bool, optional): Write Parquet and Feather with
+                                                one file per year.
+                                                Defaults to False.
+
+        Returns:
+            dict: Format to the path written.
+        """
+        frame = self.to_frame()
+        base_path = os.path.join(self.processed_dir, file_name)
+        paths = export_frame(frame, base_path, formats, partition_by_year)
+        if "csv" in paths:
+            write_columnar_store(frame, columnar_store_path(paths["csv"]), paths["csv"])
+        print(
+            f"Panel of {len(self.assets)} assets ({len(frame)} rows) saved to "
+            f"{BrentOilDiagnostics.safe_relpath(self.processed_dir)}."
+        )
+        return paths
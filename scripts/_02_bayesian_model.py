@@ -1,6 +1,8 @@
 # _02_bayesian_model.py
 
+import inspect
 import os
+from collections import namedtuple
 
 from dotenv import load_dotenv
 
@@ -13,14 +15,935 @@ import numpy as np
 import pandas as pd
 import pymc as pm
 import pytensor
+import pytensor.tensor as pt
 import ruptures as rpt
 from IPython.display import display
+from pymc.blocking import DictToArrayBijection, RaveledVars
+from pymc.initial_point import make_initial_point_fn
+from pymc.sampling.mcmc import assign_step_methods, instantiate_steppers
+from pymc.step_methods import CompoundStep
+from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+from scipy.optimize import minimize
 from statsmodels.tsa.stattools import adfuller
 
+from scripts._00_change_points import (
+    ExactChangePoints,
+    change_point_label,
+    change_point_names,
+)
+from scripts._00_data_io import (
+    compact_frame,
+    frame_memory_mb,
+    load_csv_frame,
+    write_columnar_store,
+)
+from scripts._00_plotting import FigureJob, draw_figure, render_figures
+from scripts._00_trace_cache import TraceCache, load_trace
+
+try:
+    import pymc_extras as pmx
+except ImportError:  # Pathfinder is optional; ADVI is always available
+    pmx = None
+
 print("PYTENSOR_FLAGS =", os.getenv("PYTENSOR_FLAGS"))
 print("PyTensor Optimizer =", pytensor.config.optimizer)
 print("PyTensor CXX =", pytensor.config.cxx)
 
+# Columns the model reads; compact mode loads only these
+MODEL_COLUMNS = ["Price", "LogReturn"]
+
+# Prior scales shared by the discrete and marginalised volatility models
+VOLATILITY_PRIORS = {"mu_log_return": 0.01, "sigma": 0.1}
+
+# Arguments of the fitting functions that do not change the resulting trace,
+# left out of its cache key; starting points and step methods only change
+# where sampling starts, not the posterior
+UNCACHED_ARGUMENTS = ("model", "start", "cores", "progressbar", "step", "initvals")
+
+# NUTS implementations accepted by `pm.sample`; all but PyMC's own are
+# optional installs and need a model without discrete variables
+SAMPLER_BACKENDS = ("pymc", "nutpie", "numpyro", "blackjax")
+
+# Variational methods of `fit_approximate_volatility_model`
+APPROXIMATION_METHODS = ("advi", "pathfinder")
+
+
+# Volatility model with data containers and its compiled step method
+CompiledModel = namedtuple("CompiledModel", ["model", "step"])
+
+
+class RegimeVolatility:
+    """
+    Log returns [start, stop) between two change points and their volatility.
+
+    Lightweight per-regime result: `__slots__` drops the per-instance dict,
+    the log returns are referenced rather than copied, and the volatility is
+    computed from them on demand.
+    """
+
+    __slots__ = ("label", "start", "stop", "log_returns")
+
+    def __init__(self, label, start, stop, log_returns):
+        """
+        Initialises the RegimeVolatility class.
+
+        Args:
+            label (str): Regime label, e.g. 'Before τ₁'.
+            start (int): Position of the regime's first log return.
+            stop (int): Position after its last log return.
+            log_returns (pd.Series): The whole log return series.
+        """
+        self.label = label
+        self.start = start
+        self.stop = stop
+        self.log_returns = log_returns
+
+    @property
+    def returns(self):
+        # A slice of the series, which pandas returns without copying
+        return self.log_returns.iloc[self.start : self.stop]
+
+    @property
+    def volatility(self):
+        return float(self.returns.std())
+
+
+def draw_price_change_points(data):
+    price, change_dates = data
+    plt.figure(figsize=(18, 8))
+    plt.plot(
+        price.index,
+        price.values,
+        label="Brent Oil Price",
+        color="blue",
+        alpha=0.7,
+    )
+    for i, cp_date in enumerate(change_dates):
+        plt.axvline(
+            x=cp_date,
+            color="red",
+            linestyle="--",
+            linewidth=2,
+            label="Detected Change Point (ruptures)" if i == 0 else "",
+        )
+    plt.title("Frequentist Change Point Detection (ruptures - PELT) on Brent Oil Price")
+    plt.xlabel("Date")
+    plt.ylabel("Price (USD)")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+
+
+def draw_volatility_change_points(data, engine="PyMC"):
+    log_returns, tau_dates, tau_samples = data
+    colors = ["green", "purple", "orange", "brown", "teal", "olive"]
+    plt.figure(figsize=(18, 8))
+    plt.plot(
+        log_returns.index,
+        log_returns.values,
+        label="Log Returns",
+        color="blue",
+        alpha=0.7,
+    )
+    for k, tau_date in enumerate(tau_dates):
+        plt.axvline(
+            x=tau_date,
+            color=colors[k % len(colors)],
+            linestyle="-",
+            linewidth=2,
+            label=f"Change Point {k + 1} ({engine})",
+        )
+    for k, tau_draws in enumerate(tau_samples):
+        plt.hist(
+            tau_draws,
+            bins=50,
+            density=True,
+            alpha=0.3,
+            color=colors[k % len(colors)],
+            label=f"Posterior of {change_point_label(f'tau_{k + 1}')}",
+        )
+    plt.title(f"Bayesian Volatility Change Point Detection ({engine})")
+    plt.xlabel("Date")
+    plt.ylabel("Log Return")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+
+
+def regime_labels(n_change_points):
+    """
+    Labels of the regimes around a number of change points.
+
+    Args:
+        n_change_points (int): Number of change points.
+
+    Returns:
+        list: e.g. ['Before τ₁', 'Between τ₁–τ₂', 'After τ₂'] for two.
+    """
+    taus = [change_point_label(f"tau_{k}") for k in range(1, n_change_points + 1)]
+    if not taus:
+        return ["Whole series"]
+    between = [f"Between {a}–{b}" for a, b in zip(taus[:-1], taus[1:])]
+    return [f"Before {taus[0]}", *between, f"After {taus[-1]}"]
+
+
+def prefix_moments(data):
+    """
+    Counts, sums and sums of squares of every prefix of a series.
+
+    Args:
+        data (np.ndarray): Observations.
+
+    Returns:
+        tuple: Three arrays of length len(data) + 1; entry t covers data[:t].
+    """
+    counts = np.arange(len(data) + 1, dtype=float)
+    sums = np.concatenate(([0.0], np.cumsum(data)))
+    sums_sq = np.concatenate(([0.0], np.cumsum(np.square(data))))
+    return counts, sums, sums_sq
+
+
+def prefix_log_likelihood(moments, mu, sigma, log=np.log):
+    # Normal log-likelihood of data[:t] for every t in the moments, from the
+    # sufficient statistics alone: sum (x - mu)^2 = S2 - 2 mu S1 + t mu^2
+    counts, sums, sums_sq = moments
+    squares = sums_sq - 2 * mu * sums + counts * mu**2
+    return -counts * (log(sigma) + 0.5 * np.log(2 * np.pi)) - squares / (2 * sigma**2)
+
+
+def change_point_logits(moments, mu, sigmas, tau_bounds, log=np.log):
+    """
+    Log-likelihood of the three-regime model for every admissible change point.
+
+    Regime 1 covers [0, tau_1), regime 2 [tau_1, tau_2) and regime 3
+    [tau_2, N). With G_k(t) the log-likelihood of data[:t] under sigma_k,
+    log p(x | tau_1, tau_2) = [G_1 - G_2](tau_1) + [G_2 - G_3](tau_2) + G_3(N).
+    The tau_1 range ends where the tau_2 range starts, so every pair is
+    admissible and the sum over pairs factorises into one sum per change
+    point: O(N) per evaluation instead of a full-length switch. Other bounds
+    are rejected by `check_tau_bounds`.
+
+    Works on NumPy arrays and PyTensor tensors; `mu` and `sigmas` may carry a
+    leading draws axis, e.g. shape (draws, 1).
+
+    Args:
+        moments (tuple): `prefix_moments` of the observations.
+        mu (float | tensor): Mean of the observations.
+        sigmas (tuple): Standard deviations of the three regimes.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        log (callable, optional): Logarithm matching the type of `sigmas`.
+                                    Defaults to np.log.
+
+    Returns:
+        tuple: Logits over the tau_1 range, logits over the tau_2 range and
+                the constant G_3(N).
+    """
+    sigma_1, sigma_2, sigma_3 = sigmas
+    (lower_1, upper_1), (lower_2, upper_2) = tau_bounds
+    range_1 = tuple(m[lower_1 : upper_1 + 1] for m in moments)
+    range_2 = tuple(m[lower_2 : upper_2 + 1] for m in moments)
+    total = tuple(m[-1:] for m in moments)
+    logits_1 = prefix_log_likelihood(range_1, mu, sigma_1, log) - prefix_log_likelihood(
+        range_1, mu, sigma_2, log
+    )
+    logits_2 = prefix_log_likelihood(range_2, mu, sigma_2, log) - prefix_log_likelihood(
+        range_2, mu, sigma_3, log
+    )
+    return logits_1, logits_2, prefix_log_likelihood(total, mu, sigma_3, log)
+
+
+def check_tau_bounds(tau_bounds, n_obs):
+    """
+    Checks that change point bounds suit the marginalised model.
+
+    Args:
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        n_obs (int): Number of observations.
+
+    Raises:
+        ValueError: Unless 0 <= lower_1 <= upper_1 == lower_2 <= upper_2 <=
+                    n_obs; with a gap or an overlap between the ranges the
+                    likelihood no longer factorises per change point.
+    """
+    (lower_1, upper_1), (lower_2, upper_2) = tau_bounds
+    if not 0 <= lower_1 <= upper_1 == lower_2 <= upper_2 <= n_obs:
+        raise ValueError(
+            f"Change point bounds {tau_bounds} must be adjacent ranges within "
+            f"[0, {n_obs}]: the tau_1 range has to end where the tau_2 range "
+            "starts"
+        )
+
+
+def _logsumexp(x):
+    # Shifted by the maximum in the graph itself: pm.math.logsumexp is only
+    # stabilised by a rewrite that leaves its gradient overflowing to NaN
+    top = pt.max(x)
+    return top + pt.log(pt.sum(pt.exp(x - top)))
+
+
+def volatility_data(data, tau_bounds, marginalized=False):
+    """
+    Values of the data containers of a volatility model.
+
+    Args:
+        data (np.ndarray): Log returns.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        marginalized (bool, optional): For the marginalised model, which reads
+                                        the prefix moments instead of the log
+                                        returns. Defaults to False.
+
+    Returns:
+        dict: Container values by name, for `pm.Data` or `pm.set_data`.
+
+    Raises:
+        ValueError: When the bounds do not suit the marginalised model, see
+                    `check_tau_bounds`.
+    """
+    data = np.asarray(data, dtype=float)
+    values = {"tau_bounds": np.asarray(tau_bounds, dtype=np.int64)}
+    if marginalized:
+        check_tau_bounds(tau_bounds, len(data))
+        values["prefix_moments"] = np.stack(prefix_moments(data))
+    else:
+        values["log_returns"] = data
+    return values
+
+
+def _bounds_tensor(bounds):
+    # ((lower_1, upper_1), (lower_2, upper_2)) of a (2, 2) container; the
+    # container has no static shape, so it cannot be unpacked directly
+    return tuple((bounds[k, 0], bounds[k, 1]) for k in range(2))
+
+
+def build_marginalized_volatility_model(data, tau_bounds):
+    """
+    Builds the three-regime volatility model with the change points summed out.
+
+    The priors match `build_volatility_model` with uniform change points, but
+    the likelihood is marginalised over every (tau_1, tau_2) pair with
+    `change_point_logits`. Only continuous parameters remain, so PyMC samples
+    them all with NUTS; the change points are drawn afterwards with
+    `sample_change_points`.
+
+    The prefix moments and the change point bounds are data containers of
+    any length, so other series can be swapped in with `pm.set_data`.
+
+    Args:
+        data (np.ndarray): Log returns.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+
+    Returns:
+        pm.Model: The model.
+    """
+    values = volatility_data(data, tau_bounds, marginalized=True)
+    with pm.Model() as model:
+        moments = pm.Data("prefix_moments", values["prefix_moments"])
+        bounds = _bounds_tensor(pm.Data("tau_bounds", values["tau_bounds"]))
+        (lower_1, upper_1), (lower_2, upper_2) = bounds
+        log_prior = -pt.log(upper_1 - lower_1 + 1) - pt.log(upper_2 - lower_2 + 1)
+
+        sigma_1 = pm.HalfNormal("sigma_1", sigma=VOLATILITY_PRIORS["sigma"])
+        sigma_2 = pm.HalfNormal("sigma_2", sigma=VOLATILITY_PRIORS["sigma"])
+        sigma_3 = pm.HalfNormal("sigma_3", sigma=VOLATILITY_PRIORS["sigma"])
+        mu = pm.Normal("mu_log_return", mu=0, sigma=VOLATILITY_PRIORS["mu_log_return"])
+
+        logits_1, logits_2, total = change_point_logits(
+            (moments[0], moments[1], moments[2]),
+            mu,
+            (sigma_1, sigma_2, sigma_3),
+            bounds,
+            log=pm.math.log,
+        )
+        pm.Potential(
+            "marginal_likelihood",
+            _logsumexp(logits_1) + _logsumexp(logits_2) + total[0] + log_prior,
+        )
+    return model
+
+
+def build_volatility_model(data, tau_bounds):
+    """
+    Builds the three-regime volatility model with discrete change points.
+
+    Regime k of the log returns is normal with volatility sigma_k; tau_1 and
+    tau_2 are uniform within their bounds. The log returns and the bounds are
+    data containers of any length, so other series can be swapped in with
+    `pm.set_data`.
+
+    Args:
+        data (np.ndarray): Log returns.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+
+    Returns:
+        pm.Model: The model.
+    """
+    values = volatility_data(data, tau_bounds)
+    with pm.Model() as model:
+        log_returns = pm.Data("log_returns", values["log_returns"])
+        (lower_1, upper_1), (lower_2, upper_2) = _bounds_tensor(
+            pm.Data("tau_bounds", values["tau_bounds"])
+        )
+        idx = pt.arange(log_returns.shape[0])
+
+        tau_1 = pm.DiscreteUniform("tau_1", lower=lower_1, upper=upper_1)
+        tau_2 = pm.DiscreteUniform("tau_2", lower=lower_2, upper=upper_2)
+
+        sigma_1 = pm.HalfNormal("sigma_1", sigma=VOLATILITY_PRIORS["sigma"])
+        sigma_2 = pm.HalfNormal("sigma_2", sigma=VOLATILITY_PRIORS["sigma"])
+        sigma_3 = pm.HalfNormal("sigma_3", sigma=VOLATILITY_PRIORS["sigma"])
+
+        mu = pm.Normal("mu_log_return", mu=0, sigma=VOLATILITY_PRIORS["mu_log_return"])
+
+        sigma = pm.math.switch(
+            idx < tau_1, sigma_1, pm.math.switch(idx < tau_2, sigma_2, sigma_3)
+        )
+
+        pm.Normal(
+            "obs", mu=mu, sigma=sigma, observed=log_returns, shape=log_returns.shape
+        )
+    return model
+
+
+class VolatilityModelCache:
+    """
+    Volatility models and PyMC step methods compiled once, for many series.
+
+    The first request per model kind builds the model and its step method,
+    whose compiled log density and gradient functions read the data
+    containers. Later requests only swap the data in with `pm.set_data`, so
+    sliding windows and other series skip the PyTensor compilation. The
+    compiled C code does not depend on the series length, so every length
+    shares one compiled model. Each cache holds its own models; nothing is
+    shared with other caches or with `RegimeMixtureModel`.
+    """
+
+    def __init__(self):
+        """
+        Initialises the VolatilityModelCache class.
+        """
+        self.models = {}
+
+    def get(self, data, tau_bounds, marginalized=False):
+        """
+        Returns the compiled model of a kind, holding the given data.
+
+        Pass the step to `sample_volatility_model`; `pm.sample` resets its
+        tuning at the start of every run.
+
+        Args:
+            data (np.ndarray): Log returns.
+            tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and
+                                tau_2.
+            marginalized (bool, optional): Sum the likelihood over the change
+                                            points, see
+                                            `build_marginalized_volatility_model`.
+                                            Defaults to False.
+
+        Returns:
+            CompiledModel: The model, holding the data, and its step method.
+        """
+        key = (marginalized, tuple(sorted(VOLATILITY_PRIORS.items())))
+        compiled = self.models.get(key)
+        if compiled is None:
+            build = (
+                build_marginalized_volatility_model
+                if marginalized
+                else build_volatility_model
+            )
+            model = build(data, tau_bounds)
+            steps, selected_steps = assign_step_methods(model)
+            step = instantiate_steppers(model, steps, selected_steps)
+            if isinstance(step, list):
+                step = CompoundStep(step)
+            compiled = self.models[key] = CompiledModel(model, step)
+        else:
+            values = volatility_data(data, tau_bounds, marginalized)
+            pm.set_data(values, model=compiled.model)
+        return compiled
+
+
+def jittered_starts(start, chains=4, seed=None):
+    """
+    Per-chain starting points scattered around a common start.
+
+    A given step method skips PyMC's jittered initialisation, so the chains
+    are spread out here to keep R-hat informative. As in PyMC, volatilities
+    move by up to ±1 on the log scale; the mean moves by up to one prior
+    standard deviation, where a unit shift would leave its prior.
+
+    Args:
+        start (dict): Values of 'mu_log_return' and 'sigma_1' to 'sigma_3',
+                        see `volatility_start`.
+        chains (int, optional): Number of chains. Defaults to 4.
+        seed (int, optional): Random seed. Defaults to None.
+
+    Returns:
+        list: One dict of initial values per chain.
+    """
+    rng = np.random.default_rng(seed)
+    starts = []
+    for _ in range(chains):
+        jitter = rng.uniform(-1, 1, len(start))
+        starts.append(
+            {
+                name: (
+                    value * np.exp(shift)
+                    if name.startswith("sigma")
+                    else value + shift * VOLATILITY_PRIORS["mu_log_return"]
+                )
+                for (name, value), shift in zip(start.items(), jitter)
+            }
+        )
+    return starts
+
+
+def add_change_points(trace, data, tau_bounds, seed=None):
+    """
+    Adds 'tau_1' and 'tau_2' draws to a trace of the marginalised model.
+
+    Args:
+        trace (az.InferenceData): Trace of the marginalised model.
+        data (np.ndarray): Log returns it was fitted to.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        seed (int, optional): Random seed. Defaults to None.
+
+    Returns:
+        dict: Marginal posterior probability of every position of each change
+                point, as Series indexed by position.
+    """
+    tau_1, tau_2, probs_1, probs_2 = sample_change_points(
+        data, trace.posterior, tau_bounds, seed=seed
+    )
+    trace.posterior["tau_1"] = (("chain", "draw"), tau_1)
+    trace.posterior["tau_2"] = (("chain", "draw"), tau_2)
+    return {
+        name: pd.Series(probs, index=pd.RangeIndex(lower, upper + 1))
+        for name, probs, (lower, upper) in zip(
+            ("tau_1", "tau_2"), (probs_1, probs_2), tau_bounds
+        )
+    }
+
+
+def sample_volatility_windows(
+    series, tau_bounds, marginalized=True, models=None, **kwargs
+):
+    """
+    Samples the volatility model on many series with one compiled model.
+
+    Each series, e.g. one window of a sliding-window backtest or one asset,
+    is swapped into a model from `models` in turn, so the compilation is
+    paid once for all of them. Chains start at jittered points around
+    `volatility_start` in the marginalised model, and the change points of
+    its draws are recovered with `add_change_points`.
+
+    Args:
+        series (iterable): Log return arrays, of any lengths.
+        tau_bounds (tuple | callable): Inclusive (lower, upper) bounds of tau_1
+                                        and tau_2, or a function of the series
+                                        length returning them.
+        marginalized (bool, optional): Sample the marginalised model. Defaults
+                                        to True.
+        models (VolatilityModelCache, optional): Compiled models to reuse,
+                                                    e.g. across calls.
+                                                    Defaults to a new cache.
+        **kwargs: Sampler settings passed to `sample_volatility_model`.
+
+    Returns:
+        list: One trace per series, in order.
+    """
+    models = models or VolatilityModelCache()
+    chains = kwargs.get("chains", 4)
+    seed = kwargs.get("random_seed", 42)
+    traces = []
+    for data in series:
+        data = np.asarray(data, dtype=float)
+        bounds = tau_bounds(len(data)) if callable(tau_bounds) else tau_bounds
+        compiled = models.get(data, bounds, marginalized)
+        initvals = None
+        if marginalized:
+            initvals = jittered_starts(volatility_start(data, bounds), chains, seed)
+        trace = sample_volatility_model(
+            compiled.model, step=compiled.step, initvals=initvals, **kwargs
+        )
+        if marginalized:
+            add_change_points(trace, data, bounds, seed)
+        traces.append(trace)
+    return traces
+
+
+def sample_change_points(data, posterior, tau_bounds, seed=None, chunk=256):
+    """
+    Recovers the change points of a marginalised model's posterior draws.
+
+    For each draw of (mu, sigma_1, sigma_2, sigma_3), tau_1 and tau_2 are drawn
+    from their exact conditional posteriors, which are independent given the
+    continuous parameters. Averaging those conditionals over the draws gives
+    the marginal posterior of each change point without sampling noise.
+
+    Args:
+        data (np.ndarray): Log returns the model was fitted to.
+        posterior (xr.Dataset): Posterior group holding 'mu_log_return' and
+                                'sigma_1' to 'sigma_3'.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+        seed (int, optional): Random seed. Defaults to None.
+        chunk (int, optional): Draws processed at a time, bounding memory to
+                                chunk x N floats. Defaults to 256.
+
+    Returns:
+        tuple: tau_1 and tau_2 draws shaped (chain, draw), and the marginal
+                posterior probabilities of every tau_1 and tau_2 value.
+    """
+    check_tau_bounds(tau_bounds, len(data))
+    rng = np.random.default_rng(seed)
+    moments = prefix_moments(data)
+    names = ("mu_log_return", "sigma_1", "sigma_2", "sigma_3")
+    shape = posterior["mu_log_return"].shape
+    params = [posterior[name].to_numpy().reshape(-1, 1) for name in names]
+
+    taus = [np.empty(len(params[0]), dtype=int), np.empty(len(params[0]), dtype=int)]
+    probabilities = [0.0, 0.0]
+    for start in range(0, len(params[0]), chunk):
+        mu, *sigmas = (p[start : start + chunk] for p in params)
+        logits = change_point_logits(moments, mu, sigmas, tau_bounds)[:2]
+        for k, (lower, _) in enumerate(tau_bounds):
+            weights = np.exp(logits[k] - logits[k].max(axis=1, keepdims=True))
+            weights /= weights.sum(axis=1, keepdims=True)
+            probabilities[k] = probabilities[k] + weights.sum(axis=0)
+            picks = (weights.cumsum(axis=1) < rng.random((len(weights), 1))).sum(1)
+            taus[k][start : start + chunk] = lower + np.minimum(
+                picks, weights.shape[1] - 1
+            )
+    return (
+        taus[0].reshape(shape),
+        taus[1].reshape(shape),
+        probabilities[0] / len(params[0]),
+        probabilities[1] / len(params[0]),
+    )
+
+
+def sample_volatility_model(
+    model,
+    backend="pymc",
+    draws=2000,
+    tune=1000,
+    chains=4,
+    cores=4,
+    random_seed=42,
+    **kwargs,
+):
+    """
+    Samples a volatility model with the chosen NUTS backend.
+
+    'pymc' runs PyMC's sampler on the compiled PyTensor C backend and handles
+    discrete change points with Metropolis steps. 'nutpie' compiles the model
+    with Numba and 'numpyro' / 'blackjax' with JAX on the CPU; they sample
+    every variable with NUTS, so they need the marginalised model.
+
+    Args:
+        model (pm.Model): The model to sample.
+        backend (str, optional): One of SAMPLER_BACKENDS. Defaults to 'pymc'.
+        draws (int, optional): Draws per chain. Defaults to 2000.
+        tune (int, optional): Tuning steps per chain. Defaults to 1000.
+        chains (int, optional): Number of chains. Defaults to 4.
+        cores (int, optional): Chains run in parallel. Defaults to 4.
+        random_seed (int, optional): Random seed. Defaults to 42.
+        **kwargs: Passed on to `pm.sample`.
+
+    Returns:
+        az.InferenceData: The trace.
+    """
+    if backend not in SAMPLER_BACKENDS:
+        raise ValueError(
+            f"Unknown sampler backend '{backend}', expected one of {SAMPLER_BACKENDS}"
+        )
+    if backend != "pymc" and model.discrete_value_vars:
+        raise ValueError(
+            f"The '{backend}' backend cannot sample discrete change points; "
+            "build the model with marginalized=True"
+        )
+    with model:
+        return pm.sample(
+            draws=draws,
+            tune=tune,
+            chains=chains,
+            cores=cores,
+            random_seed=random_seed,
+            nuts_sampler=backend,
+            return_inferencedata=True,
+            **kwargs,
+        )
+
+
+def warm_start_step(model, previous, chains=4, weight=1000):
+    """
+    NUTS step and initial points that continue from a previous posterior.
+
+    Each chain starts at the last draw of a previous chain, the mass matrix
+    adaptation starts from the posterior variances of the continuous
+    variables in the unconstrained space, counted as `weight` draws, and the
+    step size starts at the one tuned last time. After a few new observations
+    the posterior barely moves, so a short tuning phase is enough. Discrete
+    change points are left to the step methods PyMC assigns.
+
+    Args:
+        model (pm.Model): The model to sample, fitted to the extended data.
+        previous (az.InferenceData): Trace of an earlier fit of the same model.
+        chains (int, optional): Number of chains to start. Defaults to 4.
+        weight (int, optional): Draws the previous variances count as in the
+                                mass matrix adaptation. Defaults to 1000.
+
+    Returns:
+        tuple: The NUTS step and one dict of initial values per chain.
+    """
+    posterior = previous.posterior
+    value_vars = model.continuous_value_vars
+    samples = []
+    for value_var in value_vars:
+        rv = model.values_to_rvs[value_var]
+        draws = posterior[rv.name].to_numpy()
+        transform = model.rvs_to_transforms.get(rv)
+        if transform is not None:
+            draws = transform.forward(draws, *rv.owner.inputs).eval()
+        samples.append(draws.reshape(draws.shape[0] * draws.shape[1], -1))
+    samples = np.concatenate(samples, axis=1)
+
+    potential = QuadPotentialDiagAdapt(
+        samples.shape[1], samples.mean(axis=0), samples.var(axis=0), weight
+    )
+    step_scale = 0.25
+    if "sample_stats" in previous.groups() and "step_size" in previous.sample_stats:
+        step_size = float(previous.sample_stats["step_size"].mean())
+        step_scale = step_size * samples.shape[1] ** 0.25
+    step = pm.NUTS(value_vars, potential=potential, step_scale=step_scale, model=model)
+
+    last = posterior.isel(draw=-1)
+    initvals = [
+        {
+            rv.name: last[rv.name].to_numpy()[chain % posterior.sizes["chain"]]
+            for rv in model.free_RVs
+        }
+        for chain in range(chains)
+    ]
+    return step, initvals
+
+
+def fit_settings(function, *args, **kwargs):
+    """
+    Settings a fitting function is called with, for a trace cache key.
+
+    Defaults are filled in, so leaving an argument out and passing its
+    default give the same settings; UNCACHED_ARGUMENTS are dropped.
+
+    Args:
+        function (callable): The fitting function.
+        *args: Its positional arguments.
+        **kwargs: Its keyword arguments.
+
+    Returns:
+        dict: Argument values by name, plus the function's name.
+    """
+    bound = inspect.signature(function).bind(*args, **kwargs)
+    bound.apply_defaults()
+    settings = dict(bound.arguments)
+    settings.update(settings.pop("kwargs", {}))
+    settings["function"] = function.__name__
+    return {
+        name: value
+        for name, value in settings.items()
+        if name not in UNCACHED_ARGUMENTS
+    }
+
+
+def volatility_start(data, tau_bounds):
+    """
+    Starting point for optimising the marginalised volatility model.
+
+    The regimes are split at the middle of each change point's bounds and
+    their standard deviations used as the starting volatilities. Starting the
+    optimiser there avoids local optima in which one volatility absorbs the
+    others.
+
+    Args:
+        data (np.ndarray): Log returns.
+        tau_bounds (tuple): Inclusive (lower, upper) bounds of tau_1 and tau_2.
+
+    Returns:
+        dict: Values of 'mu_log_return' and 'sigma_1' to 'sigma_3'.
+    """
+    edges = [0, *((lower + upper) // 2 for lower, upper in tau_bounds), len(data)]
+    start = {"mu_log_return": float(np.mean(data))}
+    for k, (lower, upper) in enumerate(zip(edges[:-1], edges[1:]), start=1):
+        start[f"sigma_{k}"] = float(np.std(data[lower:upper]))
+    return start
+
+
+def laplace_approximation(model, start=None, eps=1e-5):
+    """
+    Laplace approximation of a continuous model's posterior.
+
+    The mode is found with L-BFGS in the unconstrained space and the Hessian
+    there is taken by central differences of the gradient. One compiled
+    log density and gradient function serves both, where `pm.find_MAP` and
+    a symbolic Hessian would each compile their own graph.
+
+    Args:
+        model (pm.Model): A model without discrete variables.
+        start (dict, optional): Starting values by variable name. Defaults to
+                                the model's initial point.
+        eps (float, optional): Finite difference step. Defaults to 1e-5.
+
+    Returns:
+        tuple: The mode and the posterior standard deviations, each a dict
+                keyed by value variable name.
+    """
+    point = make_initial_point_fn(
+        model=model, overrides=start, jitter_rvs=set(), return_transformed=True
+    )(0)
+    x0 = DictToArrayBijection.map(point)
+    logp_dlogp = model.logp_dlogp_function(ravel_inputs=True)
+    logp_dlogp.set_extra_values({})
+
+    def loss(x):
+        logp, dlogp = logp_dlogp(x)
+        return -logp, -dlogp
+
+    mode = minimize(loss, x0.data, jac=True, method="L-BFGS-B").x
+    hessian = np.empty((len(mode), len(mode)))
+    for j in range(len(mode)):
+        step = np.zeros(len(mode))
+        step[j] = eps
+        hessian[:, j] = (loss(mode + step)[1] - loss(mode - step)[1]) / (2 * eps)
+    covariance = np.linalg.pinv((hessian + hessian.T) / 2)
+    scales = np.sqrt(np.abs(np.diag(covariance)))
+    return (
+        DictToArrayBijection.rmap(RaveledVars(mode, x0.point_map_info)),
+        DictToArrayBijection.rmap(RaveledVars(scales, x0.point_map_info)),
+    )
+
+
+def fit_approximate_volatility_model(
+    model, start=None, method="advi", n=2000, draws=4000, chains=4, random_seed=42
+):
+    """
+    Approximates the posterior of a continuous volatility model.
+
+    'advi' starts the mean-field Gaussian at the Laplace approximation from
+    `start` and refines it with `n` ADVI iterations. Starting at
+    the answer, rather than at ADVI's unit scales, is what makes a few
+    thousand iterations enough. 'pathfinder' runs pymc-extras' Pathfinder,
+    when installed.
+
+    Args:
+        model (pm.Model): A model without discrete variables.
+        start (dict, optional): Starting values by variable name, see
+                                `volatility_start`. Defaults to the model's
+                                initial point.
+        method (str, optional): One of APPROXIMATION_METHODS. Defaults to 'advi'.
+        n (int, optional): ADVI iterations. Defaults to 2000.
+        draws (int, optional): Draws from the approximation. Defaults to 4000.
+        chains (int, optional): Chains the independent draws are split into
+                                for the summary. Defaults to 4.
+        random_seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        az.InferenceData: The draws.
+    """
+    if method not in APPROXIMATION_METHODS:
+        raise ValueError(
+            f"Unknown approximation '{method}', expected one of "
+            f"{APPROXIMATION_METHODS}"
+        )
+    if model.discrete_value_vars:
+        raise ValueError(
+            "Approximate inference needs a continuous model; "
+            "build it with marginalized=True"
+        )
+    if method == "pathfinder":
+        if pmx is None:
+            raise ImportError("Pathfinder needs pymc-extras: pip install pymc-extras")
+        trace = pmx.fit_pathfinder(
+            model=model, num_draws=draws, random_seed=random_seed, progressbar=False
+        )
+    else:
+        mode, scales = laplace_approximation(model, start)
+        with model:
+            approximation = pm.fit(
+                n,
+                method="advi",
+                start=mode,
+                start_sigma=scales,
+                random_seed=random_seed,
+                progressbar=False,
+            )
+            trace = approximation.sample(draws, random_seed=random_seed)
+    draws = trace.posterior.sizes["chain"] * trace.posterior.sizes["draw"]
+    trace = az.from_dict(
+        posterior={
+            name: values.to_numpy()
+            .reshape(draws, *values.shape[2:])[: draws - draws % chains]
+            .reshape(chains, -1, *values.shape[2:])
+            for name, values in trace.posterior.data_vars.items()
+        }
+    )
+    trace.posterior.attrs["inference"] = method
+    return trace
+
+
+def is_mcmc_trace(trace):
+    """
+    Whether a trace holds MCMC draws, and can serve as a reference.
+
+    Approximate and exact fits record their method in the posterior's
+    'inference' attribute; MCMC traces also carry sampler statistics, which
+    traces stored before the attribute existed lack.
+
+    Args:
+        trace (az.InferenceData): The trace.
+
+    Returns:
+        bool: True for MCMC traces.
+    """
+    inference = trace.posterior.attrs.get("inference", "mcmc")
+    return inference == "mcmc" and "sample_stats" in trace.groups()
+
+
+def compare_with_reference(trace, reference, var_names=None):
+    """
+    Compares an approximate posterior with a reference, usually MCMC.
+
+    Args:
+        trace (az.InferenceData): The approximate posterior.
+        reference (az.InferenceData): The reference posterior.
+        var_names (list, optional): Variables to compare. Defaults to those in
+                                    both posteriors.
+
+    Returns:
+        pd.DataFrame: Per variable, both means and standard deviations, the
+                        mean error in reference standard deviations
+                        ('mean_error_sd') and the ratio of the standard
+                        deviations ('sd_ratio').
+    """
+    if var_names is None:
+        var_names = [
+            name
+            for name in trace.posterior.data_vars
+            if name in reference.posterior.data_vars
+        ]
+    rows = {}
+    for name in var_names:
+        approx = trace.posterior[name].to_numpy().ravel()
+        exact = reference.posterior[name].to_numpy().ravel()
+        sd = exact.std()
+        rows[name] = {
+            "mean": approx.mean(),
+            "reference_mean": exact.mean(),
+            "sd": approx.std(),
+            "reference_sd": sd,
+            "mean_error_sd": abs(approx.mean() - exact.mean()) / sd if sd else np.nan,
+            "sd_ratio": approx.std() / sd if sd else np.nan,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
 
 class RegimeMixtureModel:
     """
@@ -30,7 +953,15 @@ class RegimeMixtureModel:
     Bayesian model, and saving the results.
     """
 
-    def __init__(self, log_price_path, processed_dir, plot_dir):
+    def __init__(
+        self,
+        log_price_path,
+        processed_dir,
+        plot_dir,
+        headless=False,
+        compact=False,
+        cache_dir=None,
+    ):
         """
         Initialises the BrentOilDiagnostics class.
 
@@ -38,14 +969,31 @@ class RegimeMixtureModel:
             log_price_path (str): Path to the CSV file containing enriched oil prices.
             plot_dir (str): Directory to save generated plots.
             processed_dir (str): Directory to save processed data.
+            headless (bool, optional): Queue figures for `render_plots` instead
+                                        of showing them. Defaults to False.
+            compact (bool, optional): Load only 'Price' and 'LogReturn', as
+                                        float32. Defaults to False.
+            cache_dir (str, optional): Directory of the trace cache. Defaults
+                                        to 'trace_cache' in `processed_dir`.
         """
         self.log_price_path = log_price_path
         self.processed_dir = processed_dir
         self.plot_dir = plot_dir
+        self.headless = headless
+        self.compact = compact
+        self.figure_jobs = []
+        self.memory_usage = {}
+        self.regimes = []
         self.model = None
         self.trace = None
+        self.marginalized = False
+        self.approximation = None
+        self.tau_bounds = None
+        self.tau_probabilities = None
         self.tau_1_mode = None
         self.tau_2_mode = None
+        self.tau_modes = None
+        self.log_return_index = None
         self.change_date = None
 
         # Create output directories if they do not exist
@@ -53,6 +1001,9 @@ class RegimeMixtureModel:
             os.makedirs(self.plot_dir)
         if not os.path.exists(self.processed_dir):
             os.makedirs(self.processed_dir)
+        self.trace_cache = TraceCache(
+            cache_dir or os.path.join(self.processed_dir, "trace_cache")
+        )
 
         self.load_data()
         print("\nRegimeMixtureModel class is initalised ...")
@@ -75,16 +1026,69 @@ class RegimeMixtureModel:
             # Fallback to absolute path if on different drives
             return path
 
+    def plot_figure(self, file_name, draw, data, **params):
+        """
+        Draws a figure, saves it to the plot directory and shows it.
+
+        In headless mode the figure is only queued for `render_plots`.
+
+        Args:
+            file_name (str): PNG file name inside the plot directory.
+            draw (callable): Module-level function drawing `data` with pyplot.
+            data: Data the figure is drawn from.
+            **params: Extra keyword arguments for `draw`.
+        """
+        path = os.path.join(self.plot_dir, file_name) if self.plot_dir else None
+        job = FigureJob(path, draw, data, params)
+        if self.headless:
+            if path:
+                self.figure_jobs.append(job)
+            return
+
+        draw_figure(job)
+        if path:
+            print(f"\nPlot saved to {self.safe_relpath(path)}")
+        plt.show()
+        plt.close()
+
+    def render_plots(self, max_workers=None):
+        """
+        Renders the queued figures off-screen in a worker pool, skipping those
+        whose PNG was drawn from the same data and parameters.
+
+        Args:
+            max_workers (int, optional): Worker processes. Defaults to the number
+                                            of CPUs.
+
+        Returns:
+            dict: Path of each figure to 'rendered' or 'skipped'.
+        """
+        status = render_figures(self.figure_jobs, max_workers)
+        self.figure_jobs = []
+        for path, result in status.items():
+            print(f"🖼️ Plot {result}: {self.safe_relpath(path)}")
+        return status
+
     def load_data(self):
         """
         Loads the Brent Oil price data from the specified CSV file.
 
         The 'Date' column is converted to datetime objects and set as the index.
+        The memory-mapped columnar copy written by the EDA stage is used when it
+        is current, so no text has to be parsed.
         """
 
-        self.df = pd.read_csv(self.log_price_path)
-        self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
-        self.df.set_index("Date", inplace=True)
+        if self.compact:
+            self.df = compact_frame(
+                load_csv_frame(
+                    self.log_price_path,
+                    columns=MODEL_COLUMNS,
+                    cache_dir=self.processed_dir,
+                )
+            )
+        else:
+            self.df = load_csv_frame(self.log_price_path, cache_dir=self.processed_dir)
+        self.record_memory("load_data")
         print(f"DataFrame loaded from {self.safe_relpath(self.log_price_path)}")
         print(f"📄 Loaded {len(self.df)} rows of Brent oil data.")
         print(
@@ -94,6 +1098,19 @@ class RegimeMixtureModel:
         # Return the DataFrame (optional, but good practice)
         return self.df
 
+    def record_memory(self, stage):
+        """
+        Records the memory held by the DataFrame after a processing stage.
+
+        Args:
+            stage (str): Name of the stage, the key in `self.memory_usage`.
+
+        Returns:
+            float: Memory in MiB.
+        """
+        self.memory_usage[stage] = frame_memory_mb(self.df)
+        return self.memory_usage[stage]
+
     def change_point_detection_with_ruptures(self):
         """
         Performs Frequentist Change Point Detection using ruptures (PELT) on Raw Price.
@@ -127,44 +1144,45 @@ class RegimeMixtureModel:
         # print(f"\n📅 Detected change point dates: {self.change_date.tolist()}")
 
         # Visualisation
-        import matplotlib.pyplot as plt
-
-        plt.figure(figsize=(18, 8))
-        plt.plot(
-            time_series_price.index,
-            time_series_price.values,
-            label="Brent Oil Price",
-            color="blue",
-            alpha=0.7,
-        )
-        for i, cp_date in enumerate(self.change_date):
-            plt.axvline(
-                x=cp_date,
-                color="red",
-                linestyle="--",
-                linewidth=2,
-                label="Detected Change Point (ruptures)" if i == 0 else "",
-            )
-        plt.title(
-            "Frequentist Change Point Detection (ruptures - PELT) on Brent Oil Price"
-        )
-        plt.xlabel("Date")
-        plt.ylabel("Price (USD)")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-
-        if self.plot_dir:
-            plot_path = os.path.join(self.plot_dir, "change_point_detection.png")
-            plt.savefig(plot_path)
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
-        plt.show()
-        plt.close()
+        self.plot_figure(
+            "change_point_detection.png",
+            draw_price_change_points,
+            (time_series_price, self.change_date),
+        )
 
-    def build_volatility_model_with_pymc(self):
+    def default_tau_bounds(self, log_return_index):
+        """
+        Admissible positions of the two change points of the volatility model.
+
+        tau_1 lies between the first observations of 2011 and 2017, and tau_2
+        between the first observation of 2017 and the end of the series.
+
+        Args:
+            log_return_index (pd.DatetimeIndex): Dates of the log returns.
+
+        Returns:
+            tuple: Inclusive (lower, upper) positions of tau_1 and tau_2.
+        """
+        target_years = [2011, 2017]
+        target_indices = [
+            log_return_index.get_loc(log_return_index[log_return_index.year == y][0])
+            for y in target_years
+        ]
+        return (
+            (target_indices[0], target_indices[1]),
+            (target_indices[1], len(log_return_index)),
+        )
+
+    def build_volatility_model_with_pymc(self, marginalized=False):
         """
         Builds a Bayesian model to detect two change points in volatility
         using log returns. This allows for three volatility regimes.
+
+        Args:
+            marginalized (bool, optional): Sum the likelihood over the change
+                                            points instead of sampling them, see
+                                            `build_marginalized_volatility_model`.
+                                            Defaults to False.
         """
 
         print("🔍 Performing Augmented Dickey-Fuller test on log returns...")
@@ -182,63 +1200,164 @@ class RegimeMixtureModel:
             print("⚠️ Log return series is empty. Cannot build volatility model.")
             return
 
-        data = log_returns.values
-        idx = np.arange(len(data))
-
-        log_returns = self.df["LogReturn"].dropna()
-        log_return_index = log_returns.index
-
-        target_years = [2011, 2017]
-        target_indices = [
-            log_return_index.get_loc(log_return_index[log_return_index.year == y][0])
-            for y in target_years
-        ]
-
-        with pm.Model() as model:
-            # tau_1 = pm.DiscreteUniform("tau_1", lower=0, upper=len(data))
-            # tau_2 = pm.DiscreteUniform("tau_2", lower=tau_1, upper=len(data))
-            # tau_3 = pm.DiscreteUniform("tau_3", lower=tau_2, upper=len(data))
-            tau_1 = pm.DiscreteUniform(
-                "tau_1", lower=target_indices[0], upper=target_indices[1]
-            )
-            tau_2 = pm.DiscreteUniform(
-                "tau_2", lower=target_indices[1], upper=len(data)
-            )
-
-            sigma_1 = pm.HalfNormal("sigma_1", sigma=0.1)
-            sigma_2 = pm.HalfNormal("sigma_2", sigma=0.1)
-            sigma_3 = pm.HalfNormal("sigma_3", sigma=0.1)
+        self.tau_bounds = self.default_tau_bounds(log_returns.index)
+        self.marginalized = marginalized
+        self.log_return_index = log_returns.index
+        # Sampled in float64 whatever the frame holds
+        data = log_returns.to_numpy(dtype=float)
+        build = (
+            build_marginalized_volatility_model
+            if marginalized
+            else build_volatility_model
+        )
+        self.model = build(data, self.tau_bounds)
 
-            mu = pm.Normal("mu_log_return", mu=0, sigma=0.01)
+    def cached_trace(self, data, settings, refresh=False):
+        """
+        Looks up the trace of an identical earlier fit of the current model.
 
-            sigma = pm.math.switch(
-                idx < tau_1, sigma_1, pm.math.switch(idx < tau_2, sigma_2, sigma_3)
-            )
+        The cache key covers the log returns, the model (discrete or
+        marginalised, priors, change point bounds), the fit settings and the
+        PyMC version.
 
-            pm.Normal("obs", mu=mu, sigma=sigma, observed=data)
+        Args:
+            data (np.ndarray): Log returns the model is fitted to.
+            settings (dict): Fit settings, see `fit_settings`.
+            refresh (bool, optional): Ignore the cached trace. Defaults to False.
 
-            self.model = model
-            self.log_return_index = log_returns.index
+        Returns:
+            tuple: The cache key, and the cached trace or None on a miss.
+        """
+        spec = {
+            "marginalized": self.marginalized,
+            "tau_bounds": self.tau_bounds,
+            "priors": VOLATILITY_PRIORS,
+            "settings": settings,
+            "pymc": pm.__version__,
+        }
+        key = self.trace_cache.key(data, spec)
+        cached = None if refresh else self.trace_cache.load(key)
+        if cached is not None:
+            print(f"♻️ Inputs unchanged; reusing cached trace {key[:12]}")
+        return key, cached
 
-    def run_volatility_inference(self):
+    def run_volatility_inference(
+        self, backend="pymc", refresh=False, warm_start=None, **kwargs
+    ):
         """
         Runs MCMC sampling for the volatility change point model and saves results.
+
+        Sampling is skipped when the trace cache holds a run with the same
+        data, model and settings.
+
+        Args:
+            backend (str, optional): NUTS implementation, see
+                                        `sample_volatility_model`. Defaults to
+                                        'pymc'.
+            refresh (bool, optional): Sample even on a cache hit. Defaults to
+                                        False.
+            warm_start (InferenceData, optional): Previous trace to continue
+                                                    from with the 'pymc'
+                                                    backend, see
+                                                    `warm_start_step`.
+                                                    Defaults to a cold start.
+            **kwargs: Sampler settings (draws, tune, chains, cores, ...) passed
+                        to `sample_volatility_model`.
         """
         if self.model is None:
             print("⚠️ No model found. Run build_volatility_model_with_pymc() first.")
             return
 
-        print("🚀 Starting PyMC sampling for volatility change point detection...")
-        with self.model:
-            self.trace = pm.sample(
-                draws=2000,
-                tune=1000,
-                chains=4,
-                cores=4,
-                random_seed=42,
-                return_inferencedata=True,
+        data = self.df["LogReturn"].dropna().to_numpy(dtype=float)
+        settings = fit_settings(sample_volatility_model, self.model, backend, **kwargs)
+        settings["warm_start"] = warm_start is not None
+        key, cached = self.cached_trace(data, settings, refresh)
+        self.tau_probabilities = None
+        self.approximation = None
+        if cached is None:
+            if warm_start is not None:
+                kwargs["step"], kwargs["initvals"] = warm_start_step(
+                    self.model, warm_start, settings["chains"]
+                )
+            print(
+                f"🚀 Starting {backend} sampling for volatility change point "
+                "detection..."
             )
+            self.trace = sample_volatility_model(self.model, backend, **kwargs)
+        else:
+            self.trace = cached
+        if self.marginalized:
+            self.recover_change_points()
+        if cached is None:
+            self.trace_cache.store(key, self.trace, data)
+        self.memory_usage["trace"] = self.trace.posterior.nbytes / 1024**2
 
+        self.report_change_points(engine="PyMC" if backend == "pymc" else backend)
+        return self.trace
+
+    def update_volatility_inference(
+        self, previous_trace=None, draws=1000, tune=100, refresh=False, **kwargs
+    ):
+        """
+        Re-runs MCMC after new observations, continuing from the last posterior.
+
+        Chains start where the previous ones ended, with their mass matrix and
+        step size, so a tenth of the cold run's tuning and half its draws are
+        enough after a few appended days. Without a previous trace holding
+        every variable of the model, this falls back to a cold run.
+
+        Args:
+            previous_trace (InferenceData, optional): The last trace. Defaults
+                                                        to `self.trace`, else
+                                                        'model_trace.nc' in the
+                                                        processed directory.
+            draws (int, optional): Draws per chain. Defaults to 1000.
+            tune (int, optional): Tuning steps per chain. Defaults to 100.
+            refresh (bool, optional): Sample even on a cache hit. Defaults to
+                                        False.
+            **kwargs: Further sampler settings passed to
+                        `run_volatility_inference`.
+
+        Returns:
+            InferenceData: The updated trace.
+        """
+        if self.model is None:
+            return self.run_volatility_inference(refresh=refresh, **kwargs)
+
+        path = os.path.join(self.processed_dir, "model_trace.nc")
+        if previous_trace is None and self.trace is not None:
+            previous_trace = self.trace
+        elif previous_trace is None and os.path.exists(path):
+            previous_trace = load_trace(path)
+        if previous_trace is None or any(
+            rv.name not in previous_trace.posterior for rv in self.model.free_RVs
+        ):
+            print("⚠️ No previous trace of this model; sampling from scratch.")
+            return self.run_volatility_inference(refresh=refresh, **kwargs)
+
+        print("🔁 Warm-starting from the previous posterior...")
+        return self.run_volatility_inference(
+            refresh=refresh,
+            warm_start=previous_trace,
+            draws=draws,
+            tune=tune,
+            **kwargs,
+        )
+
+    def report_change_points(self, engine="PyMC", modes=None):
+        """
+        Saves the posterior summary and plots the most probable change points.
+
+        Handles any number of change points ('tau_1', 'tau_2', ...) in the
+        trace. Unless given, their modes are taken from
+        `self.tau_probabilities` when an engine computed it, else from the
+        draws.
+
+        Args:
+            engine (str, optional): Name of the inference engine shown in the
+                                    plot. Defaults to 'PyMC'.
+            modes (list, optional): Most probable change point positions.
+        """
         # Posterior summary
         print("\n📊 Sampling complete. Summary:")
         summary_df = az.summary(self.trace)
@@ -248,78 +1367,246 @@ class RegimeMixtureModel:
         display(summary_df)
 
         # Extract most probable change points
-        tau_1_samples = self.trace.posterior["tau_1"].values.flatten()
-        tau_2_samples = self.trace.posterior["tau_2"].values.flatten()
-
-        self.tau_1_mode = int(pd.Series(tau_1_samples).mode().iloc[0])
-        self.tau_2_mode = int(pd.Series(tau_2_samples).mode().iloc[0])
+        names = change_point_names(self.trace.posterior)
+        samples = [self.trace.posterior[name].values.flatten() for name in names]
+        if modes is not None:
+            modes = list(modes)
+        elif self.tau_probabilities is not None:
+            modes = [int(self.tau_probabilities[name].idxmax()) for name in names]
+        else:
+            modes = [int(pd.Series(draws).mode().iloc[0]) for draws in samples]
+        self.tau_modes = modes
+        self.tau_1_mode, self.tau_2_mode = (modes + [None, None])[:2]
+        dates = tuple(self.log_return_index[mode] for mode in modes)
 
-        tau_1_date = self.log_return_index[self.tau_1_mode]
-        tau_2_date = self.log_return_index[self.tau_2_mode]
+        print(f"\n📍 Most probable change point index: {tuple(modes)}")
+        print(f"📅 Most probable change point date: {dates}")
 
-        print(
-            f"\n📍 Most probable change point index: {self.tau_1_mode, self.tau_2_mode}"
+        # Visualisation
+        self.plot_figure(
+            "volatility_change_point_detection.png",
+            draw_volatility_change_points,
+            (
+                self.df["LogReturn"].dropna(),
+                dates,
+                tuple(self.log_return_index[draws] for draws in samples),
+            ),
+            engine=engine,
         )
-        print(f"📅 Most probable change point date: {tau_1_date, tau_2_date}")
 
-        # Visualisation
+    def run_exact_inference(
+        self,
+        n_segments=3,
+        step=None,
+        draws=4000,
+        chains=4,
+        seed=42,
+        max_candidates=4096,
+    ):
+        """
+        Computes the change point posterior exactly, without MCMC.
+
+        Each regime gets its own mean and volatility under a conjugate prior,
+        and `ExactChangePoints` sums over every segmentation with a
+        forward-backward recursion; the reported change points are the most
+        probable segmentation. With three regimes the change points keep
+        the bounds of `build_volatility_model_with_pymc`. Independent posterior
+        draws are stored as the trace, so the summary, `posterior_summary.csv`
+        and the change point matching work as after `run_volatility_inference`;
+        the trace has no sampler statistics, so no energy plot is drawn. The
+        trace is stored in the trace cache as the latest fit to the data.
+
+        Args:
+            n_segments (int, optional): Number of volatility regimes.
+                                        Defaults to 3.
+            step (int, optional): Spacing of the candidate change point
+                                    positions. Defaults to the smallest step
+                                    giving at most `max_candidates` positions.
+            draws (int, optional): Posterior draws in total. Defaults to 4000.
+            chains (int, optional): Chains the draws are split into for the
+                                    summary. Defaults to 4.
+            seed (int, optional): Random seed. Defaults to 42.
+            max_candidates (int, optional): Candidate positions per change
+                                            point when `step` is not given.
+                                            Defaults to 4096.
+
+        Returns:
+            InferenceData: The posterior draws.
+        """
         log_returns = self.df["LogReturn"].dropna()
-        plt.figure(figsize=(18, 8))
-        plt.plot(
-            log_returns.index,
-            log_returns.values,
-            label="Log Returns",
-            color="blue",
-            alpha=0.7,
-        )
-        plt.axvline(
-            x=tau_1_date,
-            color="green",
-            linestyle="-",
-            linewidth=2,
-            label="Change Point 1 (PyMC)",
-        )
-        plt.axvline(
-            x=tau_2_date,
-            color="purple",
-            linestyle="-",
-            linewidth=2,
-            label="Change Point 2 (PyMC)",
+        data = log_returns.to_numpy(dtype=float)
+        self.log_return_index = log_returns.index
+        bounds = None
+        if n_segments == 3:
+            self.tau_bounds = self.default_tau_bounds(self.log_return_index)
+            bounds = self.tau_bounds
+        step = step or max(1, -(-len(data) // max_candidates))
+
+        print(f"🧮 Computing the exact posterior of {n_segments} regimes...")
+        exact = ExactChangePoints(n_segments, step=step, bounds=bounds).fit(data)
+        self.approximation = None
+        samples = exact.sample(draws - draws % chains, seed=seed)
+        self.trace = az.from_dict(
+            posterior={
+                name: values.reshape(chains, -1) for name, values in samples.items()
+            }
         )
-        plt.hist(
-            self.log_return_index[tau_1_samples],
-            bins=50,
-            density=True,
-            alpha=0.3,
-            color="green",
-            label="Posterior of τ₁",
+        self.trace.posterior.attrs["inference"] = "exact"
+        self.tau_probabilities = {
+            f"tau_{k}": pd.Series(probs, index=positions)
+            for k, (positions, probs) in enumerate(
+                exact.change_point_probabilities(), start=1
+            )
+        }
+        spec = {
+            "inference": "exact",
+            "n_segments": n_segments,
+            "step": step,
+            "bounds": bounds,
+            "draws": draws,
+            "chains": chains,
+            "seed": seed,
+        }
+        self.trace_cache.store(self.trace_cache.key(data, spec), self.trace, data)
+        self.memory_usage["trace"] = self.trace.posterior.nbytes / 1024**2
+        print(f"Log evidence: {exact.log_evidence:.2f}")
+
+        self.report_change_points(engine="exact", modes=exact.map_change_points())
+        return self.trace
+
+    def run_approximate_inference(
+        self,
+        method="advi",
+        n=2000,
+        draws=4000,
+        seed=42,
+        reference_path=None,
+        tolerance=0.5,
+        refresh=False,
+    ):
+        """
+        Approximates the posterior of the marginalised model instead of sampling.
+
+        A refresh takes seconds rather than the minutes of MCMC; the change
+        points are recovered from the approximate draws as after sampling, so
+        the summary, `posterior_summary.csv` and the later stages work
+        unchanged. The trace is saved as 'model_trace_<method>.nc' to keep the
+        full-sampling trace as the reference, which the result is checked
+        against when it exists.
+
+        Args:
+            method (str, optional): 'advi' or 'pathfinder', see
+                                    `fit_approximate_volatility_model`.
+                                    Defaults to 'advi'.
+            n (int, optional): ADVI iterations. Defaults to 2000.
+            draws (int, optional): Draws from the approximation. Defaults to 4000.
+            seed (int, optional): Random seed. Defaults to 42.
+            reference_path (str, optional): NetCDF trace of a full sampling
+                                            run. Defaults to 'model_trace.nc'
+                                            in the processed directory, when
+                                            present.
+            tolerance (float, optional): Largest accepted error of a posterior
+                                            mean, in reference standard
+                                            deviations. Defaults to 0.5.
+            refresh (bool, optional): Fit even when the trace cache holds an
+                                        identical run. Defaults to False.
+
+        Returns:
+            InferenceData: The approximate posterior draws.
+        """
+        if self.model is None or not self.marginalized:
+            print(
+                "⚠️ No marginalised model found. "
+                "Run build_volatility_model_with_pymc(marginalized=True) first."
+            )
+            return
+
+        data = self.df["LogReturn"].dropna().to_numpy(dtype=float)
+        settings = {"method": method, "n": n, "draws": draws, "random_seed": seed}
+        key, cached = self.cached_trace(
+            data,
+            fit_settings(fit_approximate_volatility_model, self.model, **settings),
+            refresh,
         )
-        plt.hist(
-            self.log_return_index[tau_2_samples],
-            bins=50,
-            density=True,
-            alpha=0.3,
-            color="purple",
-            label="Posterior of τ₂",
-        )
-        plt.title("Bayesian Volatility Change Point Detection (PyMC)")
-        plt.xlabel("Date")
-        plt.ylabel("Log Return")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-
-        if self.plot_dir:
-            plot_path = os.path.join(
-                self.plot_dir, "volatility_change_point_detection.png"
+        self.tau_probabilities = None
+        if cached is None:
+            print(f"⚡ Approximating the volatility posterior with {method}...")
+            self.trace = fit_approximate_volatility_model(
+                self.model, volatility_start(data, self.tau_bounds), **settings
             )
-            plt.savefig(plot_path)
-            print(f"\nPlot saved to {self.safe_relpath(plot_path)}")
-        plt.show()
-        plt.close()
+        else:
+            self.trace = cached
+        self.approximation = method
+        self.recover_change_points(seed)
+        if cached is None:
+            self.trace_cache.store(key, self.trace, data)
+        self.memory_usage["trace"] = self.trace.posterior.nbytes / 1024**2
 
+        self.report_change_points(engine=method)
+        reference_path = reference_path or os.path.join(
+            self.processed_dir, "model_trace.nc"
+        )
+        if os.path.exists(reference_path):
+            self.check_approximation(reference_path, tolerance)
         return self.trace
 
+    def check_approximation(self, reference_path, tolerance=0.5):
+        """
+        Compares the approximate posterior with a stored full sampling trace.
+
+        Saves the comparison to 'approximation_check.csv' and warns about the
+        variables whose posterior mean is off by more than `tolerance`
+        reference standard deviations.
+
+        Args:
+            reference_path (str): NetCDF trace of a full sampling run.
+            tolerance (float, optional): Largest accepted error of a posterior
+                                            mean, in reference standard
+                                            deviations. Defaults to 0.5.
+
+        Returns:
+            pd.DataFrame: The comparison, see `compare_with_reference`, or
+                            None when the reference is not an MCMC trace.
+        """
+        reference = load_trace(reference_path)
+        if not is_mcmc_trace(reference):
+            inference = reference.posterior.attrs.get("inference", "unknown")
+            print(
+                f"⚠️ {self.safe_relpath(reference_path)} is not an MCMC trace "
+                f"({inference}); skipping the approximation check."
+            )
+            return
+        check = compare_with_reference(self.trace, reference)
+        output_path = os.path.join(self.processed_dir, "approximation_check.csv")
+        check.to_csv(output_path)
+        print(f"\n💾 Approximation check saved to {self.safe_relpath(output_path)}")
+        display(check)
+
+        off = list(check.index[check["mean_error_sd"] > tolerance])
+        if off:
+            print(
+                f"⚠️ {off} differ from the reference by more than {tolerance} sd; "
+                "run full sampling."
+            )
+        else:
+            print("✅ The approximation agrees with the reference.")
+        return check
+
+    def recover_change_points(self, seed=42):
+        """
+        Adds 'tau_1' and 'tau_2' draws to the trace of the marginalised model.
+
+        The marginal posterior probability of every change point position is
+        kept in `self.tau_probabilities`.
+
+        Args:
+            seed (int, optional): Random seed. Defaults to 42.
+        """
+        data = self.df["LogReturn"].dropna().to_numpy(dtype=float)
+        self.tau_probabilities = add_change_points(
+            self.trace, data, self.tau_bounds, seed
+        )
+
     def quantify_volatility_impact(self):
         """
         Quantifies volatility before, between, and after the detected change points.
@@ -329,44 +1616,84 @@ class RegimeMixtureModel:
             print("⚠️ Trace or index missing. Run inference first.")
             return
 
-        log_returns = self.df["LogReturn"].dropna().copy()
-        regime_1 = log_returns.iloc[: self.tau_1_mode]
-        regime_2 = log_returns.iloc[self.tau_1_mode : self.tau_2_mode]
-        regime_3 = log_returns.iloc[self.tau_2_mode :]
-
-        vol_1 = regime_1.std()
-        vol_2 = regime_2.std()
-        vol_3 = regime_3.std()
+        log_returns = self.df["LogReturn"].dropna()
+        bounds = [0, *self.tau_modes, len(log_returns)]
+        labels = regime_labels(len(self.tau_modes))
+        self.regimes = [
+            RegimeVolatility(label, start, stop, log_returns)
+            for label, start, stop in zip(labels, bounds[:-1], bounds[1:])
+        ]
 
         print("\n📊 Volatility by regime (standard deviation of log returns):")
-        print(f"Regime 1 (before τ₁): {vol_1:.4f}")
-        print(f"Regime 2 (between τ₁ and τ₂): {vol_2:.4f}")
-        print(f"Regime 2 (after τ₂): {vol_3:.4f}")
+        for i, regime in enumerate(self.regimes, start=1):
+            print(f"Regime {i} ({regime.label}): {regime.volatility:.4f}")
 
         # Optional: Save to CSV
         vol_df = pd.DataFrame(
             {
-                "Regime": ["Before τ₁", "Between τ₁–τ₂", "After τ₂"],
-                "Volatility": [vol_1, vol_2, vol_3],
+                "Regime": [regime.label for regime in self.regimes],
+                "Volatility": [regime.volatility for regime in self.regimes],
+                "Start": [log_returns.index[r.start] for r in self.regimes],
             }
         )
         output_path = os.path.join(self.processed_dir, "volatility_by_regime.csv")
         vol_df.to_csv(output_path, index=False)
         print(f"\n💾 Volatility summary saved to {self.safe_relpath(output_path)}")
 
+        # Regime-labelled log returns as a memory-mappable columnar store
+        regime = np.empty(len(log_returns), dtype=np.int8)
+        for i, volatility in enumerate(self.regimes):
+            regime[volatility.start : volatility.stop] = i
+        store_dir = os.path.join(self.processed_dir, "regime_log_returns.columns")
+        write_columnar_store(
+            pd.DataFrame(
+                {
+                    "Date": log_returns.index,
+                    "LogReturn": log_returns.to_numpy(),
+                    "Regime": regime,
+                }
+            ),
+            store_dir,
+        )
+        print(f"💾 Regime log returns saved to {self.safe_relpath(store_dir)}")
+
     def save_summary_and_trace(self):
         """
         Saves the InferenceData trace as a NetCDF file.
         """
         # Saves the InferenceData trace as a NetCDF file.
-        file_path = os.path.join(self.processed_dir, "model_trace.nc")
+        file_name = (
+            f"model_trace_{self.approximation}.nc"
+            if self.approximation
+            else "model_trace.nc"
+        )
+        file_path = os.path.join(self.processed_dir, file_name)
         az.to_netcdf(self.trace, file_path)
         print(f"\n💾 Trace saved to: {self.safe_relpath(file_path)}")
 
-    def run_model_and_infer(self):
+    def run_model_and_infer(
+        self,
+        marginalized=False,
+        exact=False,
+        backend="pymc",
+        approximate=None,
+        refresh=False,
+        warm_start=False,
+    ):
         print("🧪 Running full model pipeline...\n")
         self.change_point_detection_with_ruptures()
-        self.build_volatility_model_with_pymc()
-        self.run_volatility_inference()
+        if exact:
+            self.run_exact_inference()
+        elif approximate:
+            self.build_volatility_model_with_pymc(marginalized=True)
+            self.run_approximate_inference(approximate, refresh=refresh)
+        else:
+            self.build_volatility_model_with_pymc(marginalized)
+            if warm_start:
+                self.update_volatility_inference(refresh=refresh)
+            else:
+                self.run_volatility_inference(backend, refresh=refresh)
         self.quantify_volatility_impact()
         self.save_summary_and_trace()
+        if self.headless:
+            self.render_plots()
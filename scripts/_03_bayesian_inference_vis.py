@@ -7,6 +7,37 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from IPython.display import display
 
+from scripts._00_change_points import change_point_label, change_point_names
+from scripts._00_data_io import compact_frame, frame_memory_mb, load_csv_frame
+from scripts._00_plotting import FigureJob, draw_figure, render_figures
+from scripts._00_trace_cache import TraceCache
+
+
+def style_axes(axes_array):
+    # Apply grid and x-axis rotation to all subplots
+    for ax in axes_array.flatten():
+        ax.grid(True)
+        for label in ax.get_xticklabels():
+            label.set_rotation(45)
+            label.set_horizontalalignment("right")
+
+
+def draw_trace(trace):
+    az.style.use("arviz-white")
+    style_axes(az.plot_trace(trace))
+
+
+def draw_posterior(trace):
+    az.style.use("arviz-white")
+    style_axes(az.plot_posterior(trace))
+
+
+def draw_energy(trace):
+    # Energy plot for sampler diagnostics
+    az.style.use("arviz-white")
+    az.plot_energy(trace)
+    plt.grid()
+
 
 class ChangePointAnalysis:
     """
@@ -16,24 +47,46 @@ class ChangePointAnalysis:
     and matching the estimated change point to relevant events.
     """
 
-    def __init__(self, log_price_path, trace, events_path, processed_dir, plot_dir):
+    def __init__(
+        self,
+        log_price_path,
+        trace,
+        events_path,
+        processed_dir,
+        plot_dir,
+        headless=False,
+        compact=False,
+        cache_dir=None,
+    ):
         """
         Initialises the BrentOilDiagnostics class.
 
         Args:
             log_price_path (str): Path to the CSV file containing enriched oil prices.
             events_path (str): Path to the CSV file containing historical events.
-            trace (InferenceData): Posterior samples from PyMC.
+            trace (InferenceData): Posterior samples from PyMC. When None, the
+                                    trace fitted last to the same log returns
+                                    is loaded from the trace cache.
             processed_dir (str): Directory to save processed data.
             plot_dir (str): Directory to save generated plots.
-
+            headless (bool, optional): Queue figures for `render_plots` instead
+                                        of showing them. Defaults to False.
+            compact (bool, optional): Load only 'Price' and 'LogReturn', as
+                                        float32. Defaults to False.
+            cache_dir (str, optional): Directory of the trace cache shared
+                                        with RegimeMixtureModel. Defaults to
+                                        'trace_cache' in `processed_dir`.
         """
         self.log_price_path = log_price_path
         self.events_path = events_path
         self.processed_dir = processed_dir
         self.plot_dir = plot_dir
+        self.headless = headless
+        self.compact = compact
+        self.figure_jobs = []
         self.trace = trace
         self.change_date = None
+        self.memory_usage = {}
 
         # Create output directories if they do not exist
         if not os.path.exists(self.plot_dir):
@@ -42,6 +95,8 @@ class ChangePointAnalysis:
             os.makedirs(self.processed_dir)
 
         self.load_data()
+        if self.trace is None:
+            self.load_cached_trace(cache_dir)
         print("ChangePointAnalysis Class initalised ...\n")
 
     def safe_relpath(self, path, start=None):
@@ -67,62 +122,119 @@ class ChangePointAnalysis:
         Loads the Brent Oil price data from the specified CSV file.
 
         The 'Date' column is converted to datetime objects and set as the index.
+        The memory-mapped columnar copy written by the EDA stage is used when it
+        is current, so no text has to be parsed.
         """
 
-        self.df = pd.read_csv(self.log_price_path)
-        self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
-        self.df.set_index("Date", inplace=True)
+        if self.compact:
+            self.df = compact_frame(
+                load_csv_frame(
+                    self.log_price_path,
+                    columns=["Price", "LogReturn"],
+                    cache_dir=self.processed_dir,
+                )
+            )
+        else:
+            self.df = load_csv_frame(self.log_price_path, cache_dir=self.processed_dir)
+        self.record_memory("load_data")
         logging.info(f"DataFrame loaded from {self.safe_relpath(self.log_price_path)}")
         # Return the DataFrame (optional, but good practice)
         return self.df
 
-    def interpret_results(self):
+    def load_cached_trace(self, cache_dir=None):
         """
-        Interpret results Save posterior summary statistics with visuals.
+        Loads the trace RegimeMixtureModel fitted last to these log returns.
+
+        Both stages must load the data alike (the same `compact` setting) for
+        their log returns to match.
+
+        Args:
+            cache_dir (str, optional): Directory of the trace cache. Defaults
+                                        to 'trace_cache' in `processed_dir`.
+
+        Returns:
+            InferenceData: The trace.
         """
-        az.style.use("arviz-white")
+        cache = TraceCache(cache_dir or os.path.join(self.processed_dir, "trace_cache"))
+        data = self.df["LogReturn"].dropna().to_numpy(dtype=float)
+        self.trace = cache.latest(data)
+        if self.trace is None:
+            raise FileNotFoundError(
+                f"No cached trace fitted to {self.log_price_path}; "
+                "run RegimeMixtureModel first or pass the trace"
+            )
+        logging.info("Trace loaded from the trace cache")
+        return self.trace
 
-        # Trace plot
-        axes_array = az.plot_trace(self.trace)
+    def record_memory(self, stage):
+        """
+        Records the memory held by the DataFrame after a processing stage.
 
-        # Apply grid and x-axis rotation to all subplots
-        for ax in axes_array.flatten():
-            ax.grid(True)
-            for label in ax.get_xticklabels():
-                label.set_rotation(45)
-                label.set_horizontalalignment("right")
+        Args:
+            stage (str): Name of the stage, the key in `self.memory_usage`.
 
-        trace_path = os.path.join(self.plot_dir, "trace_plot.png")
-        plt.savefig(trace_path)
-        print(f"💾 Trace plot saved to {self.safe_relpath(trace_path)}")
-        plt.show()
-        plt.close()
+        Returns:
+            float: Memory in MiB.
+        """
+        self.memory_usage[stage] = frame_memory_mb(self.df)
+        return self.memory_usage[stage]
 
-        # Posterior Plot
-        axes_array = az.plot_posterior(self.trace)
+    def plot_figure(self, file_name, title, draw, data, **params):
+        """
+        Draws a figure, saves it to the plot directory and shows it.
+
+        In headless mode the figure is only queued for `render_plots`.
 
-        # Apply grid and x-axis rotation to all subplots
-        for ax in axes_array.flatten():
-            ax.grid(True)
-            for label in ax.get_xticklabels():
-                label.set_rotation(45)
-                label.set_horizontalalignment("right")
+        Args:
+            file_name (str): PNG file name inside the plot directory.
+            title (str): Figure name used in the log message.
+            draw (callable): Module-level function drawing `data` with pyplot.
+            data: Data the figure is drawn from.
+            **params: Extra keyword arguments for `draw`.
+        """
+        job = FigureJob(os.path.join(self.plot_dir, file_name), draw, data, params)
+        if self.headless:
+            self.figure_jobs.append(job)
+            return
 
-        posterior_path = os.path.join(self.plot_dir, "posterior_plot.png")
-        plt.savefig(posterior_path)
-        print(f"💾 Posterior plot saved to {self.safe_relpath(posterior_path)}")
+        draw_figure(job)
+        print(f"💾 {title} saved to {self.safe_relpath(job.path)}")
         plt.show()
         plt.close()
 
-        # Energy plot for sampler diagnostics
-        az.plot_energy(self.trace)
-        plt.grid()
+    def render_plots(self, max_workers=None):
+        """
+        Renders the queued figures off-screen in a worker pool, skipping those
+        whose PNG was drawn from the same trace.
 
-        energy_path = os.path.join(self.plot_dir, "energy_plot.png")
-        plt.savefig(energy_path)
-        print(f"💾 Energy plot saved to {self.safe_relpath(energy_path)}")
-        plt.show()
-        plt.close()
+        Args:
+            max_workers (int, optional): Worker processes. Defaults to the number
+                                            of CPUs.
+
+        Returns:
+            dict: Path of each figure to 'rendered' or 'skipped'.
+        """
+        status = render_figures(self.figure_jobs, max_workers)
+        self.figure_jobs = []
+        for path, result in status.items():
+            logging.info(f"Plot {result}: {self.safe_relpath(path)}")
+        return status
+
+    def interpret_results(self):
+        """
+        Interpret results Save posterior summary statistics with visuals.
+
+        The energy plot needs the sampler statistics of an MCMC trace; it is
+        skipped for exact and approximate fits, which only hold draws.
+        """
+        self.plot_figure("trace_plot.png", "Trace plot", draw_trace, self.trace)
+        self.plot_figure(
+            "posterior_plot.png", "Posterior plot", draw_posterior, self.trace
+        )
+        if "sample_stats" not in self.trace.groups():
+            print("⚠️ No sampler statistics in the trace; skipping the energy plot.")
+            return
+        self.plot_figure("energy_plot.png", "Energy plot", draw_energy, self.trace)
 
     def load_event_data(self):
         """
@@ -135,17 +247,21 @@ class ChangePointAnalysis:
 
     def match_change_point_to_event(self, window_days=60, price_window=30):
         """
-        Matches each estimated change point (τ₁, τ₂, τ₃) to nearby events.
+        Matches each estimated change point (τ₁, τ₂, ...) to nearby events.
         Adds volatility and price impact summaries. Saves all to a single CSV.
+
+        Every 'tau_k' variable of the posterior is matched, so traces with any
+        number of regimes, e.g. from `run_exact_inference`, are handled.
         """
 
         if not hasattr(self, "events"):
             print("⚠️ Event data not loaded. Call load_event_data() first.")
             return
 
+        posterior = self.trace.posterior
         tau_means = {
-            "τ₁": int(self.trace.posterior["tau_1"].mean().values),
-            "τ₂": int(self.trace.posterior["tau_2"].mean().values),
+            change_point_label(name): int(posterior[name].mean().values)
+            for name in change_point_names(posterior)
         }
 
         change_dates = {label: self.df.index[idx] for label, idx in tau_means.items()}
@@ -156,6 +272,8 @@ class ChangePointAnalysis:
             print(f"  {label}: {date.date()}")
 
         all_matched_events = []
+        log_returns = self.df["LogReturn"].dropna()
+        prices = self.df["Price"].dropna()
 
         print("\n🔎 Matching Events Within ±{} Days:".format(window_days))
         for label, date in change_dates.items():
@@ -169,14 +287,12 @@ class ChangePointAnalysis:
             change_idx = tau_means[label]
 
             # Volatility before and after
-            log_returns = self.df["LogReturn"].dropna()
             vol_before = round(
                 log_returns.iloc[max(0, change_idx - 60) : change_idx].std(), 4
             )
             vol_after = round(log_returns.iloc[change_idx : change_idx + 60].std(), 4)
 
             # Price change around τ
-            prices = self.df["Price"].dropna()
             price_before = round(
                 prices.iloc[max(0, change_idx - price_window) : change_idx].mean(), 4
             )
@@ -220,3 +336,5 @@ class ChangePointAnalysis:
         self.interpret_results()
         self.load_event_data()
         self.match_change_point_to_event()
+        if self.headless:
+            self.render_plots()
@@ -0,0 +1,82 @@
+# test_00_change_points.py
+
+import itertools
+import os
+import sys
+
+import numpy as np
+from scipy.special import logsumexp
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._00_change_points import ExactChangePoints
+
+
+def brute_force(model, data):
+    # Log joint of every segmentation into three segments of at least one point
+    n = len(data)
+    segmentations = list(itertools.combinations(range(1, n), 2))
+    log_joint = np.array(
+        [
+            sum(
+                model._log_marginal(np.array([s]), np.array([e]))[0, 0]
+                for s, e in zip((0, t1, t2), (t1, t2, n))
+            )
+            for t1, t2 in segmentations
+        ]
+    )
+    return segmentations, log_joint
+
+
+# Test the evidence, marginals and MAP match enumerating every segmentation
+def test_exact_change_points_match_brute_force():
+    rng = np.random.default_rng(0)
+    data = np.concatenate([rng.normal(0, 0.01, 15), rng.normal(0, 0.05, 15)])
+    model = ExactChangePoints(n_segments=3).fit(data)
+    segmentations, log_joint = brute_force(model, data)
+
+    np.testing.assert_allclose(model.log_evidence, logsumexp(log_joint), rtol=1e-12)
+    posterior = np.exp(log_joint - logsumexp(log_joint))
+    for k, (positions, probs) in enumerate(model.change_point_probabilities()):
+        expected = [
+            posterior[[seg[k] == c for seg in segmentations]].sum() for c in positions
+        ]
+        np.testing.assert_allclose(probs, expected, atol=1e-12)
+    assert tuple(model.map_change_points()) == segmentations[np.argmax(log_joint)]
+
+
+# Test posterior draws follow the marginals and keep the change points in order
+def test_exact_change_points_sample_matches_marginals():
+    rng = np.random.default_rng(1)
+    data = np.concatenate(
+        [rng.normal(0, 0.01, 30), rng.normal(0, 0.04, 20), rng.normal(0, 0.02, 30)]
+    )
+    model = ExactChangePoints(n_segments=3).fit(data)
+    samples = model.sample(draws=20000, seed=0)
+
+    assert (samples["tau_1"] < samples["tau_2"]).all()
+    assert (samples["sigma_2"].mean() > samples["sigma_1"].mean()).all()
+    for k, (positions, probs) in enumerate(model.change_point_probabilities(), 1):
+        counts = np.array([(samples[f"tau_{k}"] == c).mean() for c in positions])
+        assert np.abs(counts - probs).max() < 0.02
+
+
+# Test a coarse grid within bounds only proposes allowed positions
+def test_exact_change_points_step_and_bounds():
+    rng = np.random.default_rng(2)
+    data = np.concatenate(
+        [rng.normal(0, 0.01, 600), rng.normal(0, 0.05, 400), rng.normal(0, 0.02, 500)]
+    )
+    bounds = [(100, 900), (800, 1400)]
+    model = ExactChangePoints(n_segments=3, step=10, bounds=bounds).fit(data)
+
+    for (lower, upper), (positions, probs) in zip(
+        bounds, model.change_point_probabilities()
+    ):
+        assert positions.min() >= lower and positions.max() <= upper
+        assert (positions % 10 == 0).all()
+        np.testing.assert_allclose(probs.sum(), 1.0)
+    assert model.map_change_points() == [600, 1000]
+    samples = model.sample(draws=100, seed=0)
+    assert np.isin(samples["tau_1"], model.candidates[0]).all()
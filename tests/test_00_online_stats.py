@@ -0,0 +1,59 @@
+# test_00_online_stats.py
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._00_online_stats import (
+    BayesianOnlineChangePoint,
+    RollingWindowStats,
+    rolling_mean_std,
+)
+
+
+# Test the running window matches pandas rolling statistics
+def test_rolling_window_stats_matches_pandas():
+    rng = np.random.default_rng(0)
+    values = 80 + np.cumsum(rng.normal(0, 1, 500))
+    values[100] = np.nan
+
+    means, stds = RollingWindowStats(30).extend(values)
+    rolling = pd.Series(values).rolling(30)
+
+    np.testing.assert_allclose(means, rolling.mean(), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(stds, rolling.std(), rtol=1e-10, equal_nan=True)
+
+
+# Test every window from the shared prefix sums matches pandas rolling statistics
+def test_rolling_mean_std_matches_pandas():
+    rng = np.random.default_rng(2)
+    values = 80 + np.cumsum(rng.normal(0, 1, 1000))
+    values[[10, 500]] = np.nan
+    windows = [5, 20, 60]
+
+    # A small block forces windows across prefix sum restarts
+    means, stds = rolling_mean_std(values, windows, block=64)
+
+    assert means.shape == stds.shape == (1000, 3)
+    for j, window in enumerate(windows):
+        rolling = pd.Series(values).rolling(window)
+        np.testing.assert_allclose(means[:, j], rolling.mean(), equal_nan=True)
+        np.testing.assert_allclose(stds[:, j], rolling.std(), equal_nan=True)
+
+
+# Test the change point probability spikes after a volatility shift
+def test_online_change_point_detects_variance_shift():
+    rng = np.random.default_rng(1)
+    returns = np.concatenate([rng.normal(0, 0.01, 300), rng.normal(0, 0.06, 100)])
+
+    detector = BayesianOnlineChangePoint()
+    probabilities = [detector.update(x)["change_probability"] for x in returns]
+
+    assert max(probabilities[50:295]) < 0.5
+    assert max(probabilities[300:310]) > 0.5
+    assert detector.summary()["run_length"] < 110
@@ -0,0 +1,48 @@
+# test_00_plotting.py
+
+import os
+import sys
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._00_plotting import FigureJob, figure_digest, render_figures
+
+
+# Test a style change in the drawing function changes the digest
+def test_figure_digest_covers_drawing_constants():
+    data = np.arange(5.0)
+
+    def draw(data):
+        plt.plot(data, color="red")
+
+    red = FigureJob("a.png", draw, data, {})
+
+    def draw(data):  # noqa: F811
+        plt.plot(data, color="blue")
+
+    blue = FigureJob("a.png", draw, data, {})
+
+    # Same name and bytecode; only the colour constant differs
+    assert red.draw.__qualname__ == blue.draw.__qualname__
+    assert red.draw.__code__.co_code == blue.draw.__code__.co_code
+    assert figure_digest(red) != figure_digest(blue)
+
+
+# Test a single stale figure is drawn off-screen and skipped once current
+def test_render_figures_skips_current_pngs(tmp_path):
+    backends = []
+
+    def draw(data):
+        backends.append(matplotlib.get_backend().lower())
+        plt.plot(data)
+
+    job = FigureJob(str(tmp_path / "prices.png"), draw, np.arange(5.0), {})
+
+    assert render_figures([job], max_workers=1) == {job.path: "rendered"}
+    assert backends == ["agg"]
+    assert render_figures([job], max_workers=1) == {job.path: "skipped"}
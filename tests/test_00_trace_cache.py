@@ -0,0 +1,49 @@
+# test_00_trace_cache.py
+
+import os
+import sys
+
+import arviz as az
+import numpy as np
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._00_trace_cache import TraceCache
+
+
+def make_trace(seed):
+    rng = np.random.default_rng(seed)
+    return az.from_dict(posterior={"tau_1": rng.integers(0, 100, (2, 50))})
+
+
+# Test the key changes with the data and the spec but not the spec's key order
+def test_trace_cache_key_covers_data_and_spec(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    data = np.linspace(-0.05, 0.05, 100)
+    spec = {"tau_bounds": [[10, 50], [50, 100]], "settings": {"draws": 2000}}
+    key = cache.key(data, spec)
+
+    assert key == cache.key(data.tolist(), dict(reversed(spec.items())))
+    assert key != cache.key(data + 1e-12, spec)
+    assert key != cache.key(data, dict(spec, settings={"draws": 1000}))
+
+
+# Test stored traces load by key and as the latest fit to their data
+def test_trace_cache_store_load_and_latest(tmp_path):
+    cache = TraceCache(str(tmp_path / "cache"))
+    data = np.arange(10.0)
+    first, second = make_trace(0), make_trace(1)
+    key_1 = cache.key(data, {"draws": 1})
+    key_2 = cache.key(data, {"draws": 2})
+
+    assert cache.load(key_1) is None and cache.latest(data) is None
+    cache.store(key_1, first, data)
+    cache.store(key_2, second, data)
+
+    loaded = cache.load(key_1).posterior["tau_1"].to_numpy()
+    np.testing.assert_array_equal(loaded, first.posterior["tau_1"].to_numpy())
+    latest = cache.latest(data).posterior["tau_1"].to_numpy()
+    np.testing.assert_array_equal(latest, second.posterior["tau_1"].to_numpy())
+    assert cache.latest(data + 1) is None
+    assert not [name for name in os.listdir(cache.cache_dir) if ".tmp" in name]
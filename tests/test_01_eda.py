@@ -14,16 +14,18 @@ import pytest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import your EDA class
-from scripts._01_eda import BrentOilDiagnostics
+import scripts._00_data_io as data_io
+import scripts._01_eda as eda_module
+from scripts._00_data_io import load_columnar_frame, load_csv_frame
+from scripts._01_eda import BrentOilDiagnostics, PanelDiagnostics, stationarity_cache
 
 matplotlib.use("Agg")  # Use Anti-Grain Geometry backend (no GUI required)
 warnings.filterwarnings("ignore", message=".*FigureCanvasAgg is non-interactive.*")
 
 
 @pytest.fixture
-def dummy_data():
+def dummy_data(tmp_path):
 
-    os.makedirs(os.path.join("data", "temp"), exist_ok=True)
     np.random.seed(42)  # for reproducibility
 
     df = pd.DataFrame(
@@ -33,7 +35,7 @@ def dummy_data():
         }
     )
 
-    file_path = os.path.join("data", "temp", "temp.csv")
+    file_path = str(tmp_path / "temp.csv")
     df.to_csv(file_path, index=False)
     return file_path
 
@@ -132,3 +134,262 @@ def test_get_processed_data_saves_file(dummy_data):
     eda.get_processed_data()
     output_file = os.path.join(eda.processed_dir, "BrentOilPrices_Log.csv")
     assert os.path.exists(output_file)
+
+
+# Test get processed data writes a memory-mapped columnar copy
+def test_get_processed_data_writes_columnar_store(dummy_data):
+    eda = BrentOilDiagnostics(dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp())
+    eda.compute_log_returns()
+    eda.get_processed_data()
+    csv_path = os.path.join(eda.processed_dir, "BrentOilPrices_Log.csv")
+
+    df = load_columnar_frame(csv_path, index_col="Date")
+    assert isinstance(df.index, pd.DatetimeIndex)
+    # Columns are read-only views of the mapped files
+    assert not df["Price"].to_numpy().flags.writeable
+    np.testing.assert_allclose(df["LogReturn"], eda.df["LogReturn"])
+
+    # A rewritten CSV makes the store stale
+    pd.read_csv(csv_path).iloc[:10].to_csv(csv_path, index=False)
+    assert load_columnar_frame(csv_path) is None
+
+
+# Test get processed data exports Parquet by year and Feather without a summary
+def test_get_processed_data_exports_columnar_formats(dummy_data, capsys):
+    eda = BrentOilDiagnostics(dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp())
+    eda.compute_log_returns()
+    paths = eda.get_processed_data(
+        formats=("parquet", "feather"), partition_by_year=True, summary=False
+    )
+
+    assert "Describe" not in capsys.readouterr().out
+    assert not os.path.exists(os.path.join(eda.processed_dir, "BrentOilPrices_Log.csv"))
+    assert os.listdir(paths["parquet"]) == ["Year=1987"]
+    parquet = pd.read_parquet(paths["parquet"])
+    assert parquet["Date"].dtype.kind == "M"
+    np.testing.assert_allclose(parquet["LogReturn"], eda.df["LogReturn"])
+
+    feather = pd.read_feather(
+        os.path.join(paths["feather"], "Year=1987", "part-0.feather")
+    )
+    pd.testing.assert_frame_equal(feather, eda.df.reset_index())
+
+
+# Test load data handles the mixed date layouts of the raw file and caches them
+def test_load_data_mixed_formats_cached():
+    raw_dir = tempfile.mkdtemp()
+    csv_path = os.path.join(raw_dir, "BrentOilPrices.csv")
+    pd.DataFrame(
+        {
+            "Date": ["20-May-87", "21-May-87", "Apr 22, 2020", "Apr 23, 2020"],
+            "Price": [18.63, 18.45, 13.77, 15.06],
+        }
+    ).to_csv(csv_path, index=False)
+
+    eda = BrentOilDiagnostics(csv_path, tempfile.mkdtemp(), tempfile.mkdtemp())
+    expected = pd.to_datetime(["1987-05-20", "1987-05-21", "2020-04-22", "2020-04-23"])
+    assert eda.df.index.equals(pd.DatetimeIndex(expected, name="Date"))
+    assert eda.df["Price"].dtype == np.float64
+
+    # The store goes to the processed directory, never next to the raw file
+    assert os.listdir(raw_dir) == ["BrentOilPrices.csv"]
+    assert os.path.isdir(os.path.join(eda.processed_dir, "BrentOilPrices.columns"))
+
+    # A touched but unchanged file is served from the columnar store
+    os.utime(csv_path)
+    stored = load_columnar_frame(
+        csv_path, index_col="Date", cache_dir=eda.processed_dir
+    )
+    assert stored is not None
+    assert load_csv_frame(csv_path, chunksize=1, cache=False).equals(eda.load_data())
+
+
+# Test load_csv_frame falls back to the parsed CSV when no store can be written
+def test_load_csv_frame_without_writable_store(dummy_data, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(data_io, "write_columnar_store", fail)
+    df = load_csv_frame(dummy_data, cache_dir=os.path.dirname(dummy_data))
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.shape == (200, 1)
+    assert load_columnar_frame(dummy_data) is None
+
+
+# Test appending rows matches recomputing the full history
+def test_append_matches_batch(dummy_data):
+    batch = BrentOilDiagnostics(
+        dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp(), rolling_window=10
+    )
+    batch.compute_rolling_stats()
+    batch.compute_log_returns()
+
+    eda = BrentOilDiagnostics(
+        dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp(), rolling_window=10
+    )
+    full = eda.df.copy()
+    eda.df = full.iloc[:150]
+    eda.compute_rolling_stats()
+    eda.compute_log_returns()
+    eda.append(full["Price"].iloc[150:190])
+    eda.append(full.iloc[190:].reset_index())
+
+    pd.testing.assert_frame_equal(eda.df, batch.df, check_freq=False, rtol=1e-10)
+    with pytest.raises(ValueError):
+        eda.append(full.iloc[-1:])
+
+
+# Test compact mode holds float32 columns in about half the memory
+def test_compact_mode_halves_memory(dummy_data):
+    full = BrentOilDiagnostics(dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp())
+    compact = BrentOilDiagnostics(
+        dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp(), compact=True
+    )
+    new_rows = full.df["Price"].iloc[150:]
+    for eda in (full, compact):
+        eda.df = eda.df.iloc[:150]
+        eda.compute_rolling_stats()
+        eda.compute_log_returns()
+        eda.append(new_rows)
+
+    assert set(compact.df.dtypes) == {np.dtype("float32")}
+    pd.testing.assert_frame_equal(
+        compact.df,
+        full.df,
+        check_dtype=False,
+        check_freq=False,
+        rtol=1e-5,
+        atol=1e-6,
+    )
+    assert list(compact.memory_usage) == [
+        "load_data",
+        "compute_rolling_stats",
+        "compute_log_returns",
+        "append",
+    ]
+    # The datetime64 index is not halved
+    assert compact.memory_usage["append"] < 0.65 * full.memory_usage["append"]
+
+
+# Test several rolling windows are computed side by side
+def test_compute_rolling_stats_multiple_windows(dummy_data):
+    eda = BrentOilDiagnostics(
+        dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp(), rolling_window=[10, 30]
+    )
+    means, stds = eda.compute_rolling_stats()
+    assert means.shape == (200, 2)
+
+    rolling = eda.df["Price"].rolling(30)
+    np.testing.assert_allclose(eda.df["RollingMean_30"], rolling.mean())
+    np.testing.assert_allclose(eda.df["RollingStd_30"], rolling.std())
+    np.testing.assert_allclose(eda.df["RollingStd"], eda.df["Price"].rolling(10).std())
+
+
+# Test rolling stationarity tests run in a process pool and are cached
+def test_run_stationarity_batch(dummy_data):
+    eda = BrentOilDiagnostics(dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp())
+    eda.compute_log_returns()
+    stationarity_cache.clear()
+
+    results = eda.run_stationarity_batch(window=100, step=50, max_workers=2)
+    assert list(results.columns) == [
+        "Series",
+        "Start",
+        "End",
+        "Test",
+        "Statistic",
+        "PValue",
+        "Lags",
+    ]
+    # Price has windows starting at 0, 50 and 100; LogReturn loses one row
+    assert len(results) == (3 + 2) * 2
+    assert results["PValue"].between(0, 1).all()
+
+    cached = len(stationarity_cache)
+    pd.testing.assert_frame_equal(
+        eda.run_stationarity_batch(window=100, step=50, max_workers=1), results
+    )
+    assert len(stationarity_cache) == cached
+
+
+# Test the stationarity cache evicts the least recently used results
+def test_stationarity_cache_is_bounded(dummy_data, monkeypatch):
+    eda = BrentOilDiagnostics(dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp())
+    eda.compute_log_returns()
+    stationarity_cache.clear()
+    monkeypatch.setattr(eda_module, "STATIONARITY_CACHE_SIZE", 4)
+
+    results = eda.run_stationarity_batch(window=100, step=50, max_workers=1)
+    assert len(results) == (3 + 2) * 2
+    assert results["PValue"].notna().all()
+    assert len(stationarity_cache) == 4
+    # The results of the last windows are the ones kept
+    last = list(stationarity_cache)[-1]
+    assert results.iloc[-1]["Statistic"] == stationarity_cache[last][0]
+
+
+# Test headless rendering skips figures whose inputs have not changed
+def test_render_plots_skips_unchanged(dummy_data):
+    plot_dir = tempfile.mkdtemp()
+    eda = BrentOilDiagnostics(dummy_data, plot_dir, tempfile.mkdtemp(), headless=True)
+    eda.compute_rolling_stats()
+    eda.compute_log_returns()
+
+    def queue_plots():
+        eda.plot_raw_prices()
+        eda.plot_rolling_stats()
+        eda.plot_log_returns()
+
+    queue_plots()
+    status = eda.render_plots(max_workers=2)
+    assert len(status) == 4
+    assert set(status.values()) == {"rendered"}
+    assert len(os.listdir(plot_dir)) == 4
+
+    queue_plots()
+    assert set(eda.render_plots().values()) == {"skipped"}
+
+    # Only the figure drawn from changed data is rendered again
+    eda.df["LogReturn"] *= 2
+    queue_plots()
+    status = eda.render_plots()
+    rendered = [os.path.basename(p) for p, s in status.items() if s == "rendered"]
+    assert rendered == ["log_returns_of_brent_prices.png"]
+
+
+# Test panel mode matches the single-asset diagnostics for every asset
+def test_panel_diagnostics_matches_single_asset(dummy_data):
+    single = BrentOilDiagnostics(
+        dummy_data, tempfile.mkdtemp(), tempfile.mkdtemp(), rolling_window=[10, 30]
+    )
+    single.compute_rolling_stats()
+    single.compute_log_returns()
+
+    prices = pd.DataFrame(
+        {"Brent": single.df["Price"], "WTI": single.df["Price"] * 0.9}
+    )
+    prices.iloc[50, 1] = np.nan
+    long = prices.reset_index().melt(
+        id_vars="Date", var_name="Asset", value_name="Price"
+    )
+    panel = PanelDiagnostics(long.dropna(), tempfile.mkdtemp(), rolling_window=[10, 30])
+    assert panel.assets == ["Brent", "WTI"]
+    frame = panel.run_diagnostics()
+
+    brent = frame[frame["Asset"] == "Brent"].set_index("Date")
+    columns = ["Price", "LogReturn", "RollingMean", "RollingStd", "RollingStd_30"]
+    pd.testing.assert_frame_equal(
+        brent[columns], single.df[columns], check_freq=False, check_names=False
+    )
+    wti = frame[frame["Asset"] == "WTI"]
+    assert len(wti) == 199
+    # Warm-up rows plus the windows holding the missing date (which is dropped)
+    assert wti["RollingMean"].isna().sum() == 9 + 9
+
+    results = panel.run_stationarity_batch(max_workers=1)
+    assert len(results) == 2 * 2 * 2
+    assert list(results.columns[:2]) == ["Asset", "Series"]
+
+    paths = panel.get_processed_data()
+    stored = load_columnar_frame(paths["csv"])
+    assert len(stored) == len(frame)
@@ -0,0 +1,371 @@
+# test_02_bayesian_model.py
+
+import os
+import sys
+
+import arviz as az
+import numpy as np
+import pandas as pd
+import pymc as pm
+import pytest
+import xarray as xr
+from scipy.special import logsumexp
+from scipy.stats import norm
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts._02_bayesian_model import (
+    RegimeMixtureModel,
+    RegimeVolatility,
+    VolatilityModelCache,
+    build_marginalized_volatility_model,
+    build_volatility_model,
+    change_point_logits,
+    fit_approximate_volatility_model,
+    fit_settings,
+    is_mcmc_trace,
+    jittered_starts,
+    laplace_approximation,
+    prefix_moments,
+    sample_change_points,
+    sample_volatility_model,
+    sample_volatility_windows,
+    volatility_start,
+    warm_start_step,
+)
+
+
+# Test the factorised marginal matches summing the switch likelihood over pairs
+def test_change_point_logits_match_brute_force():
+    rng = np.random.default_rng(0)
+    data = rng.normal(0.001, 0.02, 40)
+    mu, sigmas = 0.002, (0.01, 0.03, 0.02)
+    tau_bounds = ((5, 15), (15, 40))
+    idx = np.arange(len(data))
+
+    pairs = []
+    for tau_1 in range(5, 16):
+        for tau_2 in range(15, 41):
+            sigma = np.where(
+                idx < tau_1, sigmas[0], np.where(idx < tau_2, sigmas[1], sigmas[2])
+            )
+            pairs.append(norm.logpdf(data, mu, sigma).sum())
+
+    logits_1, logits_2, total = change_point_logits(
+        prefix_moments(data), mu, sigmas, tau_bounds
+    )
+    marginal = logsumexp(logits_1) + logsumexp(logits_2) + total[0]
+    np.testing.assert_allclose(marginal, logsumexp(pairs), rtol=1e-10)
+
+
+# Test the marginalised model has finite gradients where the change points are sharp
+def test_marginalized_model_gradient_is_finite():
+    rng = np.random.default_rng(2)
+    data = np.concatenate([rng.normal(0, 0.01, 1500), rng.normal(0, 0.03, 1500)])
+    model = build_marginalized_volatility_model(data, ((500, 2000), (2000, 3000)))
+
+    point = model.initial_point()
+    point["sigma_1_log__"] = np.log(0.01)
+    assert np.isfinite(model.compile_logp()(point))
+    assert np.isfinite(model.compile_dlogp()(point)).all()
+
+
+# Test change points recovered from posterior draws locate the volatility shifts
+def test_sample_change_points_recovers_shifts():
+    rng = np.random.default_rng(1)
+    data = np.concatenate(
+        [rng.normal(0, 0.01, 300), rng.normal(0, 0.05, 200), rng.normal(0, 0.02, 300)]
+    )
+    draws = {
+        "mu_log_return": rng.normal(0, 1e-4, (2, 50)),
+        "sigma_1": rng.normal(0.01, 5e-4, (2, 50)),
+        "sigma_2": rng.normal(0.05, 2e-3, (2, 50)),
+        "sigma_3": rng.normal(0.02, 1e-3, (2, 50)),
+    }
+    posterior = xr.Dataset({k: (("chain", "draw"), v) for k, v in draws.items()})
+    tau_bounds = ((100, 400), (400, 800))
+
+    tau_1, tau_2, probs_1, probs_2 = sample_change_points(
+        data, posterior, tau_bounds, seed=0, chunk=16
+    )
+
+    assert tau_1.shape == tau_2.shape == (2, 50)
+    assert len(probs_1) == 301 and len(probs_2) == 401
+    np.testing.assert_allclose([probs_1.sum(), probs_2.sum()], 1.0)
+    assert abs(np.median(tau_1) - 300) <= 5
+    assert abs(np.median(tau_2) - 500) <= 5
+    assert abs(100 + np.argmax(probs_1) - 300) <= 5
+
+
+# Test backends other than PyMC's own refuse models with discrete change points
+def test_sample_volatility_model_validates_backend():
+    with pm.Model() as model:
+        pm.DiscreteUniform("tau_1", lower=0, upper=10)
+
+    with pytest.raises(ValueError, match="marginalized=True"):
+        sample_volatility_model(model, backend="nutpie")
+    with pytest.raises(ValueError, match="Unknown sampler backend"):
+        sample_volatility_model(model, backend="stan")
+
+
+# Test the Laplace approximation recovers a conjugate normal posterior
+def test_laplace_approximation_matches_conjugate_posterior():
+    data = np.random.default_rng(3).normal(1.5, 1.0, 200)
+    with pm.Model() as model:
+        mu = pm.Normal("mu", 0, 10)
+        pm.Normal("obs", mu, 1.0, observed=data)
+
+    mode, scales = laplace_approximation(model)
+    precision = len(data) + 1 / 100
+    np.testing.assert_allclose(mode["mu"], data.sum() / precision, rtol=1e-5)
+    np.testing.assert_allclose(scales["mu"], precision**-0.5, rtol=1e-3)
+
+
+# Test ADVI started from the Laplace approximation finds the regime volatilities
+def test_fit_approximate_volatility_model_recovers_volatilities():
+    rng = np.random.default_rng(4)
+    data = np.concatenate(
+        [rng.normal(0, 0.01, 300), rng.normal(0, 0.05, 200), rng.normal(0, 0.02, 300)]
+    )
+    tau_bounds = ((100, 400), (400, 800))
+    model = build_marginalized_volatility_model(data, tau_bounds)
+
+    trace = fit_approximate_volatility_model(
+        model, volatility_start(data, tau_bounds), n=500, draws=1000
+    )
+    posterior = trace.posterior
+    assert dict(posterior.sizes) == {"chain": 4, "draw": 250}
+    assert posterior.attrs["inference"] == "advi"
+    for name, sigma in (("sigma_1", 0.01), ("sigma_2", 0.05), ("sigma_3", 0.02)):
+        assert abs(float(posterior[name].mean()) - sigma) < 0.2 * sigma
+
+
+# Test fit settings fill in defaults and leave out arguments that do not matter
+def test_fit_settings_fill_defaults():
+    explicit = fit_settings(
+        sample_volatility_model, None, "pymc", draws=2000, cores=1, progressbar=False
+    )
+    implicit = fit_settings(sample_volatility_model, None, tune=1000, cores=4)
+
+    assert explicit == implicit
+    assert explicit["function"] == "sample_volatility_model"
+    assert "model" not in explicit and "cores" not in explicit
+    assert "progressbar" not in explicit
+
+
+# Test warm starts begin at the last draws with the previous scales and step size
+def test_warm_start_step_continues_previous_posterior():
+    rng = np.random.default_rng(5)
+    data = np.concatenate([rng.normal(0, 0.01, 60), rng.normal(0, 0.03, 40)])
+    with pm.Model() as model:
+        tau = pm.DiscreteUniform("tau", lower=10, upper=90)
+        sigma = pm.HalfNormal("sigma", 0.1, shape=2)
+        scale = pm.math.switch(np.arange(len(data)) < tau, sigma[0], sigma[1])
+        pm.Normal("obs", 0, scale, observed=data)
+    previous = az.from_dict(
+        posterior={
+            "tau": rng.integers(55, 65, (2, 200)),
+            "sigma": np.exp(rng.normal(np.log([0.01, 0.03]), 0.1, (2, 200, 2))),
+        },
+        sample_stats={"step_size": np.full((2, 200), 0.4)},
+    )
+
+    step, initvals = warm_start_step(model, previous, chains=3)
+
+    assert len(initvals) == 3
+    assert initvals[2]["tau"] == previous.posterior["tau"].to_numpy()[0, -1]
+    np.testing.assert_array_equal(
+        initvals[1]["sigma"], previous.posterior["sigma"].to_numpy()[1, -1]
+    )
+    np.testing.assert_allclose(step.potential._var, 0.01, rtol=0.2)
+    np.testing.assert_allclose(step.step_size, 0.4)
+
+    trace = pm.sample(
+        20,
+        tune=20,
+        chains=2,
+        cores=1,
+        step=step,
+        initvals=initvals[:2],
+        model=model,
+        random_seed=0,
+        progressbar=False,
+    )
+    assert trace.posterior["tau"].shape == (2, 20)
+
+
+# Test an update samples from scratch first, then continues the saved trace
+def test_update_volatility_inference_warm_starts_from_saved_trace(
+    tmp_path, monkeypatch, capsys
+):
+    # Weekly prices, so the series spans the default change point bounds
+    rng = np.random.default_rng(10)
+    log_returns = rng.normal(0, np.repeat([0.01, 0.03, 0.015], 250))
+    log_returns[0] = np.nan
+    pd.DataFrame(
+        {
+            "Date": pd.date_range("2008-01-01", periods=750, freq="W"),
+            "Price": 50 * np.exp(np.nancumsum(log_returns)),
+            "LogReturn": log_returns,
+        }
+    ).to_csv(tmp_path / "prices.csv", index=False)
+
+    runs = []
+    sample = pm.sample
+
+    def record(*args, **kwargs):
+        runs.append(kwargs)
+        return sample(*args, **kwargs)
+
+    monkeypatch.setattr(pm, "sample", record)
+    settings = {"chains": 2, "cores": 1, "progressbar": False}
+
+    def model():
+        fitted = RegimeMixtureModel(
+            str(tmp_path / "prices.csv"), str(tmp_path), str(tmp_path), True
+        )
+        fitted.build_volatility_model_with_pymc(marginalized=True)
+        return fitted
+
+    first = model()
+    first.update_volatility_inference(**settings)
+    assert "sampling from scratch" in capsys.readouterr().out
+    assert "step" not in runs[-1] and runs[-1]["tune"] == 1000
+    first.save_summary_and_trace()
+
+    # A new run loads 'model_trace.nc' and continues with a short tuning phase
+    second = model()
+    second.update_volatility_inference(draws=50, tune=20, **settings)
+    assert "Warm-starting" in capsys.readouterr().out
+    assert (runs[-1]["draws"], runs[-1]["tune"]) == (50, 20)
+    assert isinstance(runs[-1]["step"], pm.NUTS)
+    np.testing.assert_array_equal(
+        runs[-1]["initvals"][1]["sigma_2"],
+        first.trace.posterior["sigma_2"].to_numpy()[1, -1],
+    )
+    assert second.trace.posterior.sizes["draw"] == 50
+
+
+# Test swapping data into the compiled model matches a model built for that data
+def test_volatility_model_cache_swaps_data():
+    rng = np.random.default_rng(6)
+    first = rng.normal(0, 0.02, 300)
+    second = np.concatenate([rng.normal(0, 0.01, 250), rng.normal(0, 0.04, 250)])
+    builders = {
+        True: build_marginalized_volatility_model,
+        False: build_volatility_model,
+    }
+    models = VolatilityModelCache()
+
+    first_bounds = ((50, 150), (150, 300))
+    for marginalized, build in builders.items():
+        compiled = models.get(first, first_bounds, marginalized)
+        logp = compiled.model.compile_logp()
+        bounds = ((100, 300), (300, 500))
+        assert models.get(second, bounds, marginalized) is compiled
+
+        fresh = build(second, bounds)
+        point = fresh.initial_point()
+        np.testing.assert_allclose(logp(point), fresh.compile_logp()(point))
+
+    # Other caches compile their own models
+    assert VolatilityModelCache().get(first, first_bounds, True) is not models.get(
+        first, first_bounds, True
+    )
+
+
+# Test the marginalised model rejects change point ranges that are not adjacent
+@pytest.mark.parametrize(
+    "bounds",
+    [((50, 100), (150, 300)), ((50, 200), (150, 300)), ((50, 150), (150, 400))],
+)
+def test_marginalized_model_rejects_non_adjacent_bounds(bounds):
+    data = np.random.default_rng(8).normal(0, 0.02, 300)
+    posterior = xr.Dataset(
+        {
+            name: (("chain", "draw"), np.full((1, 2), value))
+            for name, value in [
+                ("mu_log_return", 0.0),
+                ("sigma_1", 0.02),
+                ("sigma_2", 0.02),
+                ("sigma_3", 0.02),
+            ]
+        }
+    )
+
+    with pytest.raises(ValueError, match="adjacent"):
+        build_marginalized_volatility_model(data, bounds)
+    with pytest.raises(ValueError, match="adjacent"):
+        VolatilityModelCache().get(data, bounds, marginalized=True)
+    with pytest.raises(ValueError, match="adjacent"):
+        sample_volatility_windows([data], bounds, draws=10, tune=10, chains=1)
+    with pytest.raises(ValueError, match="adjacent"):
+        sample_change_points(data, posterior, bounds)
+
+
+# Test chains start at distinct points scattered around the common start
+def test_jittered_starts_spread_chains():
+    start = {"mu_log_return": 0.0, "sigma_1": 0.01, "sigma_2": 0.03}
+    starts = jittered_starts(start, chains=3, seed=0)
+
+    assert len(starts) == 3
+    assert len({point["sigma_1"] for point in starts}) == 3
+    for point in starts:
+        assert 0.01 / np.e <= point["sigma_1"] <= 0.01 * np.e
+        assert abs(point["mu_log_return"]) <= 0.01
+
+
+# Test every window of a sliding-window run is sampled with the same step method
+def test_sample_volatility_windows_reuses_step():
+    rng = np.random.default_rng(7)
+    data = np.concatenate([rng.normal(0, 0.01, 300), rng.normal(0, 0.04, 300)])
+    windows = [data[:400], data[100:600]]
+    models = VolatilityModelCache()
+
+    step = models.get(data, ((100, 300), (300, 600)), True).step
+    traces = sample_volatility_windows(
+        windows,
+        lambda rows: ((rows // 4, rows // 2), (rows // 2, rows)),
+        models=models,
+        draws=100,
+        tune=100,
+        chains=2,
+        cores=1,
+        progressbar=False,
+    )
+
+    assert models.get(data, ((1, 2), (2, 3)), True).step is step
+    assert [trace.constant_data["prefix_moments"].shape[1] for trace in traces] == [
+        401,
+        501,
+    ]
+    assert float(traces[0].posterior["sigma_1"].mean()) < 0.015
+    assert float(traces[1].posterior["sigma_3"].mean()) > 0.03
+    # Change points are recovered as after a single fit
+    assert traces[0].posterior["tau_1"].shape == (2, 100)
+    assert abs(float(traces[1].posterior["tau_1"].median()) - 200) <= 10
+
+
+# Test regime results reference the log returns and derive their volatility
+def test_regime_volatility_is_a_slotted_view():
+    log_returns = pd.Series(np.random.default_rng(8).normal(0, 0.02, 100))
+    regime = RegimeVolatility("Before τ₁", 20, 60, log_returns)
+
+    assert not hasattr(regime, "__dict__")
+    assert np.shares_memory(regime.returns.to_numpy(), log_returns.to_numpy())
+    assert regime.volatility == pytest.approx(log_returns.iloc[20:60].std())
+
+
+# Test only sampled traces are accepted as the reference of an approximation
+def test_is_mcmc_trace_rejects_exact_and_approximate_fits():
+    draws = {"sigma_1": np.full((2, 10), 0.01)}
+    stats = {"diverging": np.zeros((2, 10), dtype=bool)}
+    sampled = az.from_dict(posterior=draws, sample_stats=stats)
+    exact = az.from_dict(posterior=draws)
+    advi = az.from_dict(posterior=draws, sample_stats=stats)
+    advi.posterior.attrs["inference"] = "advi"
+
+    assert is_mcmc_trace(sampled)
+    assert not is_mcmc_trace(exact)
+    assert not is_mcmc_trace(advi)
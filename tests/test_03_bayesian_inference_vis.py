@@ -0,0 +1,137 @@
+# test_03_bayesian_inference_vis.py
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pymc as pm
+import pytest
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import build_regime_volatility
+from scripts._02_bayesian_model import RegimeMixtureModel
+from scripts._03_bayesian_inference_vis import ChangePointAnalysis
+
+
+def write_brent_inputs(tmp_path, freq="B"):
+    # Four volatility regimes of 300 periods and an event every 20 periods
+    rng = np.random.default_rng(9)
+    dates = pd.date_range("2008-01-01", periods=1200, freq=freq)
+    sigma = np.repeat([0.01, 0.03, 0.015, 0.04], 300)
+    log_returns = rng.normal(0, sigma)
+    log_returns[0] = np.nan
+    price_path = tmp_path / "prices.csv"
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Price": 50 * np.exp(np.nancumsum(log_returns)),
+            "LogReturn": log_returns,
+        }
+    ).to_csv(price_path, index=False)
+    events_path = tmp_path / "events.csv"
+    pd.DataFrame({"Date": dates[::20].strftime("%Y-%m-%d")}).to_csv(
+        events_path, index=False
+    )
+    return price_path, events_path
+
+
+# Test change points of an exact fit with K != 3 regimes flow into the next stage
+@pytest.mark.parametrize("n_segments", [2, 4])
+def test_exact_change_points_of_any_count_are_matched(tmp_path, n_segments):
+    price_path, events_path = write_brent_inputs(tmp_path)
+    model = RegimeMixtureModel(str(price_path), str(tmp_path), str(tmp_path), True)
+    model.run_exact_inference(n_segments=n_segments, draws=400)
+    model.quantify_volatility_impact()
+
+    analysis = ChangePointAnalysis(
+        str(price_path), model.trace, str(events_path), str(tmp_path), str(tmp_path)
+    )
+    analysis.load_event_data()
+    analysis.match_change_point_to_event()
+
+    labels = ["τ₁", "τ₂", "τ₃"][: n_segments - 1]
+    matched = pd.read_csv(tmp_path / "matched_events.csv")
+    assert sorted(matched["MatchedTo"].unique()) == labels
+    assert list(analysis.change_date) == labels
+
+    body, _ = build_regime_volatility(str(tmp_path / "volatility_by_regime.csv"))
+    regimes = [row["Regime"] for row in json.loads(body)]
+    assert len(regimes) == n_segments
+    assert regimes[0].startswith("Before 20") and regimes[-1].startswith("After 20")
+
+
+# Test the analysis runs on an exact trace, which has no sampler statistics
+def test_run_analysis_skips_energy_plot_without_sample_stats(tmp_path):
+    price_path, events_path = write_brent_inputs(tmp_path)
+    model = RegimeMixtureModel(str(price_path), str(tmp_path), str(tmp_path), True)
+    model.run_exact_inference(n_segments=2, draws=400)
+    assert "sample_stats" not in model.trace.groups()
+
+    analysis = ChangePointAnalysis(
+        str(price_path),
+        model.trace,
+        str(events_path),
+        str(tmp_path),
+        str(tmp_path),
+        headless=True,
+    )
+    analysis.run_analysis()
+
+    assert (tmp_path / "trace_plot.png").exists()
+    assert (tmp_path / "posterior_plot.png").exists()
+    assert not (tmp_path / "energy_plot.png").exists()
+    assert (tmp_path / "matched_events.csv").exists()
+
+
+# Test the analysis runs on an ADVI fit of the marginalised model
+def test_run_analysis_on_approximate_fit(tmp_path):
+    # Weekly prices, so the series spans the default change point bounds
+    price_path, events_path = write_brent_inputs(tmp_path, freq="W")
+    model = RegimeMixtureModel(str(price_path), str(tmp_path), str(tmp_path), True)
+    model.build_volatility_model_with_pymc(marginalized=True)
+    model.run_approximate_inference(n=500, draws=400)
+    assert "sample_stats" not in model.trace.groups()
+    assert model.trace.posterior.attrs["inference"] == "advi"
+
+    analysis = ChangePointAnalysis(
+        str(price_path),
+        model.trace,
+        str(events_path),
+        str(tmp_path),
+        str(tmp_path),
+        headless=True,
+    )
+    analysis.run_analysis()
+
+    assert (tmp_path / "posterior_plot.png").exists()
+    assert not (tmp_path / "energy_plot.png").exists()
+    assert list(analysis.change_date) == ["τ₁", "τ₂"]
+
+
+# Test repeated fits come from the trace cache and the analysis loads the newest
+def test_trace_cache_serves_refits_and_newest_fit(tmp_path, monkeypatch):
+    price_path, events_path = write_brent_inputs(tmp_path, freq="W")
+    model = RegimeMixtureModel(str(price_path), str(tmp_path), str(tmp_path), True)
+    model.build_volatility_model_with_pymc(marginalized=True)
+    settings = {"draws": 100, "tune": 300, "chains": 2, "cores": 1}
+    sampled = model.run_volatility_inference(progressbar=False, **settings)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sampled despite a cached trace")
+
+    monkeypatch.setattr(pm, "sample", fail)
+    cached = model.run_volatility_inference(progressbar=False, **settings)
+    assert cached.posterior["sigma_1"].equals(sampled.posterior["sigma_1"])
+
+    def analysis():
+        return ChangePointAnalysis(
+            str(price_path), None, str(events_path), str(tmp_path), str(tmp_path)
+        )
+
+    assert "sample_stats" in analysis().trace.groups()
+    model.run_exact_inference(draws=400)
+    assert analysis().trace.posterior.attrs["inference"] == "exact"
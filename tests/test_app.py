@@ -0,0 +1,354 @@
+# test_app.py
+
+import gzip
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Append project root for test imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import (
+    PriceStream,
+    app,
+    artifact_cache,
+    content_hashes,
+    load_price_frame,
+    minmax_downsample,
+    request_metrics,
+)
+from scripts._00_data_io import columnar_store_path, write_columnar_store
+
+
+@pytest.fixture
+def client():
+    processed_dir = tempfile.mkdtemp()
+    raw_dir = tempfile.mkdtemp()
+    np.random.seed(42)  # for reproducibility
+
+    df = pd.DataFrame(
+        {
+            "Date": pd.date_range("2010-01-01", periods=50, freq="D"),
+            "Price": np.random.uniform(18, 100, size=50),
+        }
+    )
+    df["RollingMean"] = df["Price"].rolling(5).mean()
+    df["RollingStd"] = df["Price"].rolling(5).std()
+    df["LogReturn"] = np.log(df["Price"]).diff()
+    df.to_csv(os.path.join(processed_dir, "BrentOilPrices_Log.csv"), index=False)
+
+    pd.DataFrame(
+        {
+            "Date": ["2011-02-01", "2012-03-01", "2013-04-01"],
+            "Event Type": ["Conflict", "Conflict", "OPEC"],
+        }
+    ).to_csv(os.path.join(raw_dir, "Events.csv"), index=False)
+
+    app.config.update(TESTING=True, PROCESSED_DIR=processed_dir, RAW_DIR=raw_dir)
+    artifact_cache.clear()
+    content_hashes.clear()
+    request_metrics.reset()
+    with app.test_client() as client:
+        yield client
+
+
+# Test price data is served from the cache after the first request
+def test_price_data_cached(client):
+    first = client.get("/price-data")
+    second = client.get("/price-data")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert first.get_json() == second.get_json()
+    # Rows with rolling NaNs are dropped
+    assert len(first.get_json()) == 46
+
+    stats = client.get("/cache-stats").get_json()
+    # Parsed frame and encoded payload are each cached
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+# Test the price frame keeps the mapped store columns and formats emitted rows
+def test_price_frame_maps_columnar_store(client):
+    expected = client.get("/price-data?columns=Price,Year").get_json()
+    path = os.path.join(app.config["PROCESSED_DIR"], "BrentOilPrices_Log.csv")
+    frame = pd.read_csv(path, parse_dates=["Date"])
+    write_columnar_store(frame, columnar_store_path(path), path)
+    artifact_cache.clear()
+
+    with app.test_request_context():
+        df, dates = load_price_frame(path)
+    assert list(df.columns) == ["Price", "RollingMean", "RollingStd", "LogReturn"]
+    assert len(df) == len(dates) == 46
+    # A read-only view of the mapped file, not a copy
+    assert not df["Price"].to_numpy().flags.writeable
+    assert client.get("/price-data?columns=Price,Year").get_json() == expected
+
+
+# Test a rewritten artifact invalidates its cache entry
+def test_price_data_reloaded_when_rewritten(client):
+    client.get("/price-data")
+    path = os.path.join(app.config["PROCESSED_DIR"], "BrentOilPrices_Log.csv")
+    df = pd.read_csv(path).iloc[:-10]
+    time.sleep(0.01)
+    df.to_csv(path, index=False)
+
+    response = client.get("/price-data")
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.get_json()) == 36
+
+
+# Test event overlay percentages
+def test_event_overlay(client):
+    data = client.get("/event-overlay").get_json()
+    shares = {row["type"]: row["percentage"] for row in data}
+    assert shares == {"Conflict": 66.67, "OPEC": 33.33}
+
+
+# Test date range, column projection and pagination
+def test_price_data_range_and_pagination(client):
+    response = client.get(
+        "/price-data?start=2010-01-10&end=2010-01-19&columns=Price&limit=4"
+    )
+    data = response.get_json()
+    assert response.status_code == 200
+    assert [row["Date"] for row in data] == [
+        "10/01/2010",
+        "11/01/2010",
+        "12/01/2010",
+        "13/01/2010",
+    ]
+    assert set(data[0]) == {"Date", "Price"}
+    assert response.headers["X-Total-Count"] == "10"
+    assert response.headers["X-Next-Cursor"] == "4"
+
+    last = client.get(
+        "/price-data?start=2010-01-10&end=2010-01-19&columns=Price&limit=4&cursor=8"
+    )
+    assert len(last.get_json()) == 2
+    assert "X-Next-Cursor" not in last.headers
+
+
+# Test invalid query arguments are rejected
+def test_price_data_invalid_arguments(client):
+    assert client.get("/price-data?start=not-a-date").status_code == 400
+    assert client.get("/price-data?columns=Volume").status_code == 400
+    assert client.get("/price-data?limit=0").status_code == 400
+
+
+# Test downsampling keeps spikes and respects the point budget
+def test_price_data_downsampling_keeps_spikes(client):
+    path = os.path.join(app.config["PROCESSED_DIR"], "BrentOilPrices_Log.csv")
+    df = pd.DataFrame(
+        {
+            "Date": pd.date_range("2000-01-01", periods=5000, freq="D"),
+            "Price": np.linspace(20, 80, 5000),
+        }
+    )
+    df["RollingMean"] = df["Price"]
+    df["RollingStd"] = 1.0
+    df["LogReturn"] = 0.0
+    df.loc[3210, "LogReturn"] = -0.5
+    df.to_csv(path, index=False)
+
+    data = client.get(
+        "/price-data?columns=LogReturn,RollingStd&max_points=100"
+    ).get_json()
+    assert len(data) <= 100
+    assert min(row["LogReturn"] for row in data) == -0.5
+    assert data[0]["Date"] == "01/01/2000"
+    assert data[-1]["Date"] == df["Date"].iloc[-1].strftime("%d/%m/%Y")
+
+
+# Test the point budget holds when several columns are downsampled together
+def test_minmax_downsample_budget_shared_by_columns():
+    values = np.random.default_rng(0).normal(size=(1000, 3))
+    for max_points in (2, 5, 8, 9, 100):
+        rows = minmax_downsample(values, max_points)
+        assert 2 <= len(rows) <= max_points
+        assert rows[0] == 0 and rows[-1] == 999
+
+
+# Test compressed bodies and conditional requests
+def test_price_data_gzip_and_etag(client):
+    plain = client.get("/price-data")
+    zipped = client.get("/price-data", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+
+    not_modified = client.get(
+        "/price-data",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+    # A tag of another encoding does not validate this one
+    stale = client.get(
+        "/price-data",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]},
+    )
+    assert stale.status_code == 200
+    assert stale.headers["Content-Encoding"] == "gzip"
+
+    # Ranges of the same artifact get their own tags
+    ranged = client.get("/price-data?start=2010-01-10")
+    assert ranged.headers["ETag"] != plain.headers["ETag"]
+
+
+# Test binary columnar formats
+def test_price_data_binary_formats(client):
+    records = client.get("/price-data?start=2010-01-10&columns=Price").get_json()
+
+    response = client.get("/price-data?start=2010-01-10&columns=Price&format=npz")
+    assert response.mimetype == "application/x-npz"
+    arrays = np.load(io.BytesIO(response.data))
+    assert arrays["Date"].dtype == np.dtype("datetime64[ms]")
+    np.testing.assert_allclose(arrays["Price"], [row["Price"] for row in records])
+
+    pa = pytest.importorskip("pyarrow")
+    response = client.get(
+        "/price-data?start=2010-01-10&columns=Price",
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.column_names == ["Date", "Price"]
+    assert table.num_rows == len(records)
+
+
+# Test unknown formats are rejected
+def test_price_data_unknown_format(client):
+    assert client.get("/price-data?format=xml").status_code == 400
+
+
+# Test the dashboard bundle reuses the per-route payloads
+def test_dashboard_bundle(client):
+    price = client.get("/price-data").get_json()
+    bundle = client.get("/dashboard").get_json()
+    assert bundle["price_data"] == price
+    assert {row["type"] for row in bundle["event_types"]} == {"Conflict", "OPEC"}
+    # Artifacts not produced yet are reported as null
+    assert bundle["posterior_summary"] is None
+
+    assert "log_returns" not in bundle
+
+    # Log returns are downsampled too, keeping the rows of matched events
+    pd.DataFrame({"Date": ["2010-01-20"], "Event Name": ["Spike"]}).to_csv(
+        os.path.join(app.config["PROCESSED_DIR"], "matched_events.csv"), index=False
+    )
+    response = client.get("/dashboard?max_points=10")
+    downsampled = response.get_json()
+    assert len(downsampled["price_data"]) <= 10
+    log_returns = downsampled["log_returns"]
+    assert len(log_returns) <= 10 + 1
+    assert "20/01/2010" in {row["Date"] for row in log_returns}
+    full = {row["Date"]: row["LogReturn"] for row in price}
+    assert all(full[row["Date"]] == row["LogReturn"] for row in log_returns)
+    assert max(abs(row["LogReturn"]) for row in log_returns) == max(
+        abs(value) for value in full.values()
+    )
+    sections = [rows for rows in downsampled.values() if rows is not None]
+    assert int(response.headers["X-Row-Count"]) == sum(map(len, sections))
+
+
+# Test per-route metrics are exposed in the Prometheus format
+def test_metrics_endpoint(client):
+    client.get("/price-data")
+    client.get("/price-data")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert 'api_requests_total{route="/price-data",status="200"} 2' in text
+    assert 'api_rows_served_total{route="/price-data"} 92' in text
+    assert 'api_cache_requests_total{route="/price-data",result="hit"} 1' in text
+    assert 'api_request_duration_seconds_count{route="/price-data"} 2' in text
+    for name in ("read", "transform", "serialize"):
+        assert f'route="/price-data",phase="{name}",le="+Inf"' in text
+
+
+# Test the price stream publishes appended rows incrementally
+def test_price_stream_publishes_appended_rows(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("Date,Price\n20-May-87,18.63\n21-May-87,18.45\n22-May-87,18.55\n")
+    hub = PriceStream(str(path), rolling_window=3)
+    subscriber = hub.subscribe()
+    assert subscriber.get_nowait()[1] == "snapshot"
+
+    with open(path, "a") as f:
+        f.write("26-May-87,18.6\n27-May-87,18.6")  # last row is incomplete
+    assert hub.poll() == 1
+
+    event_id, kind, record = subscriber.get_nowait()
+    assert kind == "price"
+    assert record["Date"] == "26/05/1987"
+    expected = pd.Series([18.45, 18.55, 18.6])
+    assert record["RollingMean"] == pytest.approx(expected.mean())
+    assert record["RollingStd"] == pytest.approx(expected.std())
+    assert record["LogReturn"] == pytest.approx(np.log(18.6 / 18.55))
+    assert 0 <= record["ChangeProbability"] <= 1
+
+    # Reconnecting clients get the events they missed
+    replay = hub.subscribe(last_event_id=str(event_id - 1))
+    assert replay.get_nowait()[0] == event_id
+
+
+# Test appended rows with quoted dates holding commas are published
+def test_price_stream_parses_quoted_dates(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text('Date,Price\n20-May-87,18.63\n"Apr 21, 2020",19.33\n')
+    hub = PriceStream(str(path), rolling_window=2)
+    subscriber = hub.subscribe()
+    assert subscriber.get_nowait()[2]["Date"] == "21/04/2020"
+
+    with open(path, "a") as f:
+        f.write('"Apr 22, 2020",13.77\n')
+    assert hub.poll() == 1
+
+    record = subscriber.get_nowait()[2]
+    assert record["Date"] == "22/04/2020"
+    assert record["Price"] == 13.77
+    assert record["LogReturn"] == pytest.approx(np.log(13.77 / 19.33))
+
+
+# Test the poller stops without subscribers and restarts on the next one
+def test_price_stream_poller_stops_when_idle(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text("Date,Price\n20-May-87,18.63\n")
+    hub = PriceStream(str(path), rolling_window=3, poll_seconds=0.01)
+
+    subscriber = hub.subscribe()
+    first = hub.thread
+    assert first.is_alive()
+    hub.unsubscribe(subscriber)
+    first.join(timeout=5)
+    assert not first.is_alive() and hub.thread is None
+
+    subscriber = hub.subscribe()
+    second = hub.thread
+    assert second is not first and second.is_alive()
+    hub.unsubscribe(subscriber)
+    second.join(timeout=5)
+
+
+# Test the stream endpoint opens with a snapshot event
+def test_stream_endpoint_sends_snapshot(client):
+    path = os.path.join(app.config["RAW_DIR"], "BrentOilPrices.csv")
+    pd.DataFrame({"Date": ["20-May-87", "21-May-87"], "Price": [18.63, 18.45]}).to_csv(
+        path, index=False
+    )
+    app.config.update(STREAM_POLL_SECONDS=60)
+    response = client.get("/stream", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunks = response.response
+    assert next(chunks).startswith(b"retry:")
+    snapshot = next(chunks).decode()
+    response.close()
+    assert "event: snapshot" in snapshot
+    assert '"Price": 18.45' in snapshot